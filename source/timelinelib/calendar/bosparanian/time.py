@@ -22,10 +22,13 @@ from timelinelib.calendar.gregorian.time import GregorianTime
 
 class BosparanianTime(GregorianTime):
 
+    __slots__ = ()
+
     @property
     def DeltaClass(self):
         return BosparanianDelta
 
 
 class BosparanianDelta(GregorianDelta):
-    pass
+
+    __slots__ = ()
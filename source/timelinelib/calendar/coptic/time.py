@@ -22,7 +22,9 @@ from timelinelib.calendar.gregorian.time import GregorianDelta
 SECONDS_IN_DAY = 24 * 60 * 60
 
 class CopticTime(GregorianTime):
-    
+
+    __slots__ = ()
+
     MIN_JULIAN_DAY = -124
     
     @property
@@ -31,4 +33,5 @@ class CopticTime(GregorianTime):
 
 
 class CopticDelta(GregorianDelta):
-    pass
+
+    __slots__ = ()
@@ -30,6 +30,9 @@ class StripWeek(Strip):
         Strip.__init__(self)
         self.appearance = appearance
 
+    def get_cache_key(self):
+        return (self.__class__, self.appearance.get_week_start())
+
     def label(self, time, major=False):
         if major:
             first_weekday = self.start(time)
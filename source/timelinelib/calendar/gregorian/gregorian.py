@@ -59,9 +59,12 @@ class GregorianDateTime:
     @classmethod
     def from_time(cls, time):
         """ """
-        (year, month, day) = julian_day_to_gregorian_ymd(time.julian_day)
-        (hour, minute, second) = time.get_time_of_day()
-        return cls(year, month, day, hour, minute, second)
+        # Dates from julian_day_to_gregorian_ymd are always valid, so the
+        # validation in __init__ is skipped.
+        new = cls.__new__(cls)
+        (new.year, new.month, new.day) = julian_day_to_gregorian_ymd(time.julian_day)
+        (new.hour, new.minute, new.second) = time.get_time_of_day()
+        return new
 
     @property
     def week_number(self):
@@ -24,9 +24,16 @@ to the class.
 """
 
 
+from functools import lru_cache
+
 from timelinelib.calendar.gregorian.time import GregorianTime
 
 
+# The same days are converted over and over again when strips, labels and
+# exported times are generated.
+CACHE_SIZE = 16384
+
+
 def julian_day_to_gregorian_ymd(julian_day):
     """
     This algorithm is described here:
@@ -109,6 +116,11 @@ def julian_day_to_gregorian_ymd(julian_day):
     if julian_day < GregorianTime.MIN_JULIAN_DAY:
         raise ValueError("julian_day_to_gregorian_ymd only works for julian days >= %d, but was %d" % (
             GregorianTime.MIN_JULIAN_DAY, julian_day))
+    return _julian_day_to_gregorian_ymd(julian_day)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _julian_day_to_gregorian_ymd(julian_day):
     a = julian_day + 32044
     b = ((4 * a) + 3) // 146097
     c = a - ((b * 146097) // 4)
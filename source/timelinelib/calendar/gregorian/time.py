@@ -26,6 +26,8 @@ SECONDS_IN_DAY = 24 * 60 * 60
 
 class GregorianTime(GenericTimeMixin):
 
+    __slots__ = ("julian_day", "seconds", "_key")
+
     MIN_JULIAN_DAY = 0
 
     @property
@@ -50,15 +52,18 @@ class GregorianTime(GenericTimeMixin):
             raise ValueError("seconds must be >= 0 and <= 24*60*60")
         self.julian_day = julian_day
         self.seconds = seconds
+        # Ordered like (julian_day, seconds) since seconds < SECONDS_IN_DAY
+        self._key = julian_day * SECONDS_IN_DAY + seconds
 
     def __eq__(self, time):
-        return (isinstance(time, self.__class__) and
-                self.julian_day == time.julian_day and
-                self.seconds == time.seconds)
+        return isinstance(time, self.__class__) and self._key == time._key
 
     def __ne__(self, time):
         return not (self == time)
 
+    def __hash__(self):
+        return hash(self._key)
+
     def __add__(self, delta):
         if isinstance(delta, self.DeltaClass):
             seconds = self.seconds + delta.seconds
@@ -87,13 +92,16 @@ class GregorianTime(GenericTimeMixin):
             return self.DeltaClass(days_diff * SECONDS_IN_DAY + seconds_diff)
 
     def __gt__(self, dt):
-        return (self.julian_day, self.seconds) > (dt.julian_day, dt.seconds)
+        return self._key > dt._key
 
     def __ge__(self, dt):
-        return self == dt or self > dt
+        return self._key >= dt._key
 
     def __lt__(self, dt):
-        return (self.julian_day, self.seconds) < (dt.julian_day, dt.seconds)
+        return self._key < dt._key
+
+    def __le__(self, dt):
+        return self._key <= dt._key
 
     def __repr__(self):
         return "{0}({1!r}, {2!r})".format(
@@ -106,6 +114,9 @@ class GregorianTime(GenericTimeMixin):
         from timelinelib.calendar.gregorian.gregorian import GregorianDateTime
         return GregorianDateTime.from_time(self)
     
+    def to_number(self):
+        return self._key
+
     def get_time_of_day(self):
         hours = self.seconds // 3600
         minutes = (self.seconds // 60) % 60
@@ -123,6 +134,8 @@ class GregorianTime(GenericTimeMixin):
 
 class GregorianDelta(ComparableValue, GenericDeltaMixin):
 
+    __slots__ = ()
+
     @classmethod
     def from_seconds(cls, seconds):
         return cls(seconds)
@@ -44,6 +44,9 @@ from timelinelib.calendar.gregorian.timetype.strips import StripCentury
 from timelinelib.calendar.gregorian.timetype.yearformatter import format_year, BC
 
 
+TIME_STRING_RE = re.compile(r"^(-?\d+)-(\d+)-(\d+) (\d+):(\d+):(\d+)$")
+
+
 class GregorianTimeType(TimeType):
 
     DURATION_TYPE_HOURS = _('Hours')
@@ -62,14 +65,9 @@ class GregorianTimeType(TimeType):
         return "%d-%02d-%02d %02d:%02d:%02d" % GregorianDateTime.from_time(time).to_tuple()
 
     def parse_time(self, time_string):
-        match = re.search(r"^(-?\d+)-(\d+)-(\d+) (\d+):(\d+):(\d+)$", time_string)
+        match = TIME_STRING_RE.search(time_string)
         if match:
-            year = int(match.group(1))
-            month = int(match.group(2))
-            day = int(match.group(3))
-            hour = int(match.group(4))
-            minute = int(match.group(5))
-            second = int(match.group(6))
+            (year, month, day, hour, minute, second) = map(int, match.groups())
             try:
                 return GregorianDateTime(year, month, day, hour, minute, second).to_time()
             except ValueError:
@@ -23,6 +23,8 @@ from timelinelib.calendar.time import GenericTimeMixin
 
 class NumTime(ComparableValue, GenericTimeMixin):
 
+    __slots__ = ()
+
     @property
     def DeltaClass(self):
         return NumDelta
@@ -30,6 +32,9 @@ class NumTime(ComparableValue, GenericTimeMixin):
     def __repr__(self):
         return "{0}<{1!r}>".format(self.__class__.__name__, self.value)
 
+    def to_number(self):
+        return self.value
+
     def __add__(self, other):
         if isinstance(other, self.DeltaClass):
             # Time + Delta
@@ -50,6 +55,8 @@ class NumTime(ComparableValue, GenericTimeMixin):
 
 class NumDelta(ComparableValue, GenericDeltaMixin):
 
+    __slots__ = ()
+
     def __repr__(self):
         return "{0}<{1!r}>".format(self.__class__.__name__, self.value)
 
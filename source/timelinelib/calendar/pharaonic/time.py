@@ -23,7 +23,9 @@ SECONDS_IN_DAY = 24 * 60 * 60
 
 
 class PharaonicTime(GregorianTime):
-    
+
+    __slots__ = ()
+
     MIN_JULIAN_DAY = -47
     
     @property
@@ -32,4 +34,5 @@ class PharaonicTime(GregorianTime):
 
 
 class PharaonicDelta(GregorianDelta):
-    pass
+
+    __slots__ = ()
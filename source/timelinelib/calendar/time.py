@@ -18,6 +18,8 @@
 
 class ComparableValue:
 
+    __slots__ = ("_value",)
+
     def __init__(self, value):
         self._value = value
 
@@ -37,6 +39,9 @@ class ComparableValue:
         else:
             return NotImplemented
 
+    def __hash__(self):
+        return hash(self._value)
+
     def __lt__(self, other):
         if isinstance(other, self.__class__):
             return self.value < other.value
@@ -64,15 +69,26 @@ class ComparableValue:
 
 class GenericTimeMixin:
 
+    __slots__ = ()
+
     def __radd__(self, other):
         return self + other
     
     def to_str(self):
         return repr(self)
 
+    def to_number(self):
+        """
+        Return the time as a number so that the difference between two
+        numbers is the delta between the two times.
+        """
+        raise NotImplementedError("to_number not implemented.")
+
 
 class GenericDeltaMixin:
 
+    __slots__ = ()
+
     def __rmul__(self, other):
         return self * other
 
@@ -26,6 +26,7 @@ class Appearance(Observable):
 
     def __init__(self):
         Observable.__init__(self)
+        self._version = 0
         self._build_property("legend_visible", True)
         self._build_property("balloons_visible", True)
         self._build_property("hide_events_done", False)
@@ -59,6 +60,10 @@ class Appearance(Observable):
         self._build_property("time_scale_pos", 1)
         self._build_property("use_bold_nowline", False)
 
+    def get_version(self):
+        """Return a number that changes every time a property is changed."""
+        return self._version
+
     def _build_property(self, name, initial_value):
 
         def getter():
@@ -68,6 +73,7 @@ class Appearance(Observable):
             old_value = getter()
             if new_value != old_value:
                 setattr(self, "_%s" % name, new_value)
+                self._version += 1
                 self._notify()
 
         setattr(self, "get_%s" % name, getter)
@@ -64,6 +64,13 @@ class ItemBase:
             self.id = self.db.next_id()
         return self.id
 
+    def prepare_save(self):
+        """
+        Update the immutable value with everything that is only stored when
+        the item is saved, such as the ids of related items.
+        """
+        pass
+
 
 def create_noop_property(klass, name, value):
     def getter(self):
@@ -50,11 +50,14 @@ class Category(ItemBase):
         return self
 
     def save(self):
-        self._update_parent_id()
+        self.prepare_save()
         with self._db.transaction("Save category") as t:
             t.save_category(self._immutable_value, self.ensure_id())
         return self
 
+    def prepare_save(self):
+        self._update_parent_id()
+
     def _update_parent_id(self):
         if self.parent is None:
             self._immutable_value = self._immutable_value.update(
@@ -45,12 +45,15 @@ class Container(Event):
         self._subevents = value
 
     def save(self):
-        self._update_category_id()
-        self._update_category_ids()
+        self.prepare_save()
         with self._db.transaction("Save container") as t:
             t.save_container(self._immutable_value, self.ensure_id())
         return self
 
+    def prepare_save(self):
+        self._update_category_id()
+        self._update_category_ids()
+
     def delete(self):
         with self._db.transaction("Delete container") as t:
             t.delete_container(self.id)
@@ -90,6 +93,8 @@ class Container(Event):
         return (isinstance(other, Container) and
                 super(Container, self).__eq__(other))
 
+    __hash__ = Event.__hash__
+
     def is_container(self):
         return True
 
@@ -102,6 +107,9 @@ class Container(Event):
     def unregister_subevent(self, subevent):
         self.strategy.unregister_subevent(subevent)
 
+    def is_updating(self):
+        return self._is_in_update
+
     def update_container(self, subevent):
         if self._is_in_update:
             return
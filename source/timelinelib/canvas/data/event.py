@@ -47,13 +47,16 @@ class Event(ItemBase, TimelineItem):
         return duplicate
 
     def save(self):
+        self.prepare_save()
+        with self._db.transaction("Save event") as t:
+            t.save_event(self._immutable_value, self.ensure_id())
+        return self
+
+    def prepare_save(self):
         self._update_category_id()
         self._update_category_ids()
         self._update_container_id()
         self._update_sort_order()
-        with self._db.transaction("Save event") as t:
-            t.save_event(self._immutable_value, self.ensure_id())
-        return self
 
     def reload(self):
         return self._db.find_event_with_id(self.id)
@@ -125,6 +128,16 @@ class Event(ItemBase, TimelineItem):
     def __ne__(self, other):
         return not (self == other)
 
+    def __hash__(self):
+        # Equal events have the same id, so hashing the id is enough and
+        # much cheaper than hashing all the fields that __eq__ compares.
+        # Unsaved events fall back to identity so that they don't all end
+        # up in the same bucket. The id changes on save and delete, so
+        # don't keep events in sets or as dict keys across those.
+        if self.get_id() is None:
+            return object.__hash__(self)
+        return hash(self.get_id())
+
     def __lt__(self, other):
         raise NotImplementedError("I don't believe this is in use.")
 
@@ -247,12 +260,20 @@ class Event(ItemBase, TimelineItem):
     def get_icon(self):
         return self._immutable_value.icon
 
-    def set_icon(self, icon):
-        self._immutable_value = self._immutable_value.update(icon=icon)
+    def set_icon(self, icon, icon_text=None):
+        # The text of the icon is kept until the icon is replaced
+        if icon is not self.get_icon() or icon_text is not None:
+            self._immutable_value = self._immutable_value.update(
+                icon=icon,
+                icon_text=icon_text
+            )
         return self
 
     icon = property(get_icon, set_icon)
 
+    def get_icon_text(self):
+        return self._immutable_value.icon_text
+
     def has_edge_icons(self):
         return self.get_fuzzy() or self.get_locked()
 
@@ -403,8 +424,17 @@ class Event(ItemBase, TimelineItem):
         return data
 
     def set_whole_data(self, data):
+        """
+        Set all data fields.
+
+        The data can also contain the icon string of the icon as
+        "icon_text".
+        """
         for event_id in DATA_FIELDS:
             self.set_data(event_id, data.get(event_id, None))
+        icon_text = data.get("icon_text")
+        if icon_text is not None and self.get_icon() is not None:
+            self.set_icon(self.get_icon(), icon_text)
 
     data = property(get_whole_data, set_whole_data)
 
@@ -16,10 +16,13 @@
 # along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
 
 
+from timelinelib.canvas.data.periodindex import PeriodIndex
+from timelinelib.canvas.data.sortorderindex import SortOrderIndex
 from timelinelib.canvas.drawing.drawers import get_progress_color
 from timelinelib.general.immutable import Field
 from timelinelib.general.immutable import ImmutableDict
 from timelinelib.general.immutable import ImmutableRecord
+from timelinelib.general.persistentmap import PersistentMap
 
 
 class ImmutableEvent(ImmutableRecord):
@@ -34,6 +37,7 @@ class ImmutableEvent(ImmutableRecord):
     description = Field(None)
     labels = Field(None)
     icon = Field(None)
+    icon_text = Field(None)
     hyperlink = Field(None)
     alert = Field(None)
     progress = Field(None)
@@ -91,31 +95,190 @@ class ImmutableDB(ImmutableRecord):
     def save_event(self, event, id_):
         self._ensure_non_none_category_exists(event.category_id)
         self._ensure_non_none_container_exists(event.container_id)
-        return self.update(
+        old_event = self.events.get(id_)
+        new_db = self.update(
             events=self.events.update({
                 id_: event,
             })
         )
+        if self._has_index("_period_index"):
+            period_index = self._period_index
+            if old_event is not None:
+                period_index = period_index.remove(id_, old_event.time_period)
+            new_db._period_index = period_index.add(id_, event.time_period)
+        if self._has_index("_container_index"):
+            container_index = self._container_index
+            if old_event is None or old_event.container_id != event.container_id:
+                container_index = _remove_from_container_index(container_index, id_, old_event)
+                container_index = _add_to_container_index(container_index, id_, event)
+            new_db._container_index = container_index
+        self._update_sort_order_index(new_db, old_event, event)
+        return new_db
 
     def delete_event(self, id_):
         self._ensure_event_exists(id_)
-        return self.update(
+        old_event = self.events.get(id_)
+        new_db = self.update(
             events=self.events.remove(id_)
         )
+        if self._has_index("_period_index"):
+            new_db._period_index = self._period_index.remove(
+                id_,
+                old_event.time_period
+            )
+        if self._has_index("_container_index"):
+            new_db._container_index = _remove_from_container_index(
+                self._container_index,
+                id_,
+                old_event
+            )
+        self._update_sort_order_index(new_db, old_event, None)
+        return new_db
+
+    def load(self, categories=None, containers=None, events=None, milestones=None, eras=None):
+        """
+        Return a new db with all the given records added.
+
+        The records are given as dicts that map ids to records. References
+        between records are validated once for all of them, which is much
+        faster than saving the records one by one, since that creates a new
+        db for every record.
+        """
+        categories = categories or {}
+        containers = containers or {}
+        events = events or {}
+        milestones = milestones or {}
+        eras = eras or {}
+        new_db = self.update(
+            categories=self.categories.update(categories),
+            containers=self.containers.update(containers),
+            events=self.events.update(events),
+            milestones=self.milestones.update(milestones),
+            eras=self.eras.update(eras)
+        )
+        new_db._ensure_loaded_records_valid(categories, containers, events, milestones)
+        return new_db
+
+    def unload(self, categories=(), containers=(), events=(), milestones=(), eras=()):
+        """
+        Return a new db without the records with the given ids.
+
+        This is the opposite of load. Records that refer to the removed ones
+        are not changed, so they must be removed or loaded again as well.
+        """
+        def remove(records, ids):
+            for id_ in ids:
+                records = records.remove(id_)
+            return records
+        return self.update(
+            categories=remove(self.categories, categories),
+            containers=remove(self.containers, containers),
+            events=remove(self.events, events),
+            milestones=remove(self.milestones, milestones),
+            eras=remove(self.eras, eras)
+        )
+
+    def _ensure_loaded_records_valid(self, categories, containers, events, milestones):
+        if categories:
+            self._ensure_category_names_are_unique()
+        for (id_, category) in categories.items():
+            self._ensure_non_none_category_exists(category.parent_id)
+            self._ensure_no_category_circular(id_, category.parent_id)
+        for records in (containers, events, milestones):
+            for record in records.values():
+                self._ensure_non_none_category_exists(record.category_id)
+        for event in events.values():
+            self._ensure_non_none_container_exists(event.container_id)
+
+    def get_event_ids_in_period(self, time_period):
+        """
+        Return ids of all events that are not outside the given time period.
+
+        The period index is built the first time it is needed. After that it
+        is updated incrementally by save_event and delete_event so that new
+        versions of the database don't have to rebuild it.
+        """
+        if not self._has_index("_period_index"):
+            self._period_index = PeriodIndex(
+                (id_, event.time_period) for (id_, event) in self.events
+            )
+        return self._period_index.get_ids_overlapping(time_period)
+
+    def get_subevent_ids(self, container_id):
+        """
+        Return ids of all events in the given container.
+
+        The index is built and updated in the same way as the period index.
+        """
+        if not self._has_index("_container_index"):
+            subevent_ids = {}
+            for (id_, event) in self.events:
+                if event.container_id is not None:
+                    subevent_ids.setdefault(event.container_id, []).append(id_)
+            self._container_index = PersistentMap(
+                (container_id, tuple(ids))
+                for (container_id, ids) in subevent_ids.items()
+            )
+        return self._container_index.get(container_id, ())
+
+    def get_max_sort_order(self):
+        """
+        Return the largest sort order of all events and milestones, or -1 if
+        there are none.
+
+        The index is built and updated in the same way as the period index.
+        """
+        if not self._has_index("_sort_order_index"):
+            self._sort_order_index = SortOrderIndex(
+                record.sort_order
+                for records in (self.events, self.milestones)
+                for (id_, record) in records
+            )
+        return self._sort_order_index.get_max(-1)
+
+    def update(self, *args, **kwargs):
+        new_db = ImmutableRecord.update(self, *args, **kwargs)
+        if new_db.events is self.events:
+            self._keep_indexes(new_db, names=("_period_index", "_container_index"))
+            if new_db.milestones is self.milestones:
+                self._keep_indexes(new_db, names=("_sort_order_index",))
+        return new_db
+
+    def _has_index(self, name):
+        return name in self.__dict__
+
+    def _keep_indexes(self, new_db, names=("_period_index", "_container_index", "_sort_order_index")):
+        for name in names:
+            if self._has_index(name):
+                setattr(new_db, name, getattr(self, name))
+        return new_db
+
+    def _update_sort_order_index(self, new_db, old_record, new_record):
+        if self._has_index("_sort_order_index"):
+            sort_order_index = self._sort_order_index
+            if old_record is not None:
+                sort_order_index = sort_order_index.remove(old_record.sort_order)
+            if new_record is not None:
+                sort_order_index = sort_order_index.add(new_record.sort_order)
+            new_db._sort_order_index = sort_order_index
 
     def save_milestone(self, milestone, id_):
         self._ensure_non_none_category_exists(milestone.category_id)
-        return self.update(
+        new_db = self.update(
             milestones=self.milestones.update({
                 id_: milestone
             })
         )
+        self._update_sort_order_index(new_db, self.milestones.get(id_), milestone)
+        return new_db
 
     def delete_milestone(self, id_):
         self._ensure_milestone_exists(id_)
-        return self.update(
+        new_db = self.update(
             milestones=self.milestones.remove(id_)
         )
+        self._update_sort_order_index(new_db, self.milestones.get(id_), None)
+        return new_db
 
     def save_era(self, era, id_):
         return self.update(
@@ -153,12 +316,12 @@ class ImmutableDB(ImmutableRecord):
                 return thing.update(category_id=new_parent_id)
             else:
                 return thing
-        return self.update(
+        return self._keep_indexes(self.update(
             categories=self.categories.remove(delete_id).map(update_parent_id),
             events=self.events.map(update_category_id),
             milestones=self.milestones.map(update_category_id),
             containers=self.containers.map(update_category_id)
-        )
+        ))
 
     def save_container(self, container, id_):
         self._ensure_non_none_category_exists(container.category_id)
@@ -174,10 +337,16 @@ class ImmutableDB(ImmutableRecord):
                 return event.update(container_id=None)
             else:
                 return event
-        return self.update(
+        new_db = self._keep_indexes(self.update(
             containers=self.containers.remove(delete_id),
             events=self.events.map(update_container_id),
-        )
+        ), names=["_period_index", "_sort_order_index"])
+        if self._has_index("_container_index"):
+            container_index = self._container_index
+            if delete_id in container_index:
+                container_index = container_index.delete(delete_id)
+            new_db._container_index = container_index
+        return new_db
 
     def _ensure_event_exists(self, id_):
         if id_ not in self.events:
@@ -204,6 +373,15 @@ class ImmutableDB(ImmutableRecord):
                     "Category name {0!r} is not unique".format(save_name)
                 )
 
+    def _ensure_category_names_are_unique(self):
+        names = set()
+        for id_, category in self.categories:
+            if category.name in names:
+                raise InvalidOperationError(
+                    "Category name {0!r} is not unique".format(category.name)
+                )
+            names.add(category.name)
+
     def _ensure_non_none_category_exists(self, id_):
         if id_ is not None:
             self._ensure_category_exists(id_)
@@ -234,5 +412,29 @@ class ImmutableDB(ImmutableRecord):
             )
 
 
+def _add_to_container_index(container_index, id_, event):
+    if event.container_id is None:
+        return container_index
+    return container_index.set(
+        event.container_id,
+        container_index.get(event.container_id, ()) + (id_,)
+    )
+
+
+def _remove_from_container_index(container_index, id_, event):
+    if event is None or event.container_id is None:
+        return container_index
+    ids = tuple(
+        subevent_id
+        for subevent_id
+        in container_index.get(event.container_id, ())
+        if subevent_id != id_
+    )
+    if ids:
+        return container_index.set(event.container_id, ids)
+    else:
+        return container_index.delete(event.container_id)
+
+
 class InvalidOperationError(Exception):
     pass
@@ -18,6 +18,7 @@
 
 import collections
 import contextlib
+import itertools
 
 from timelinelib.calendar.gregorian.timetype import GregorianTimeType
 from timelinelib.canvas.data.exceptions import TimelineIOError
@@ -34,6 +35,7 @@ from timelinelib.canvas.data.transactions import Transactions
 from timelinelib.general.observer import Observable
 from timelinelib.canvas.data.memorydb.eventsorter import EventSorter
 from timelinelib.canvas.data.memorydb.query import Query
+from timelinelib.canvas.data.memorydb.wrappercache import WrapperCache
 from timelinelib.wxgui.utils import display_error_message
 
 # A category was added, edited, or deleted
@@ -44,11 +46,14 @@ STATE_CHANGE_ANY = 2
 
 class MemoryDB(Observable):
 
-    def __init__(self):
+    def __init__(self, immutable_db=None):
         Observable.__init__(self)
         self._id_counter = 0
-        self._transactions = Transactions(ImmutableDB())
+        if immutable_db is None:
+            immutable_db = ImmutableDB()
+        self._transactions = Transactions(immutable_db)
         self._transactions.listen_for_any(self._transaction_committed)
+        self._wrapper_cache = WrapperCache(self._transactions.value)
         self.path = ""
         self.displayed_period = None
         self._hidden_category_ids = []
@@ -56,6 +61,8 @@ class MemoryDB(Observable):
         self.saved_now = self.time_type.now()
         self.readonly = False
         self._save_callback = None
+        self._close_callback = None
+        self._background_writer = None
         self._should_lock = False
         self._current_query = None
 
@@ -103,15 +110,77 @@ class MemoryDB(Observable):
         self._id_counter += 1
         return self._id_counter
 
+    def reserve_ids(self, max_id):
+        """Make sure that next_id only returns ids larger than max_id."""
+        self._id_counter = max(self._id_counter, max_id)
+
     def transaction(self, name):
         return self._transactions.new(name)
 
     def clear_transactions(self):
         self._transactions.clear()
 
+    def load_saved_changes(self, delete, put):
+        """
+        Apply changes that are already in the storage of the db.
+
+        delete and put are given to ImmutableDB.unload and ImmutableDB.load.
+        The changes are made in one transaction that can be undone, but the
+        save callback is not called since there is nothing to save.
+        """
+        if not delete and not put:
+            return
+        save_callback = self._save_callback
+        self._save_callback = None
+        try:
+            with self.transaction("Synchronize with file") as t:
+                t.unload(**delete)
+                t.load(**put)
+        finally:
+            self._save_callback = save_callback
+
+    def store_icon_texts(self, icon_string):
+        """
+        Encode the icons of the events that have no icon text with
+        icon_string and store the texts in the db.
+
+        Icons set in the GUI already have their text. This encodes icons that
+        were set without one, once, so that saving does not encode them
+        again. It does not create a version that can be undone.
+        """
+        immutable_db = _with_icon_texts(self._transactions.value, icon_string)
+        if immutable_db is not self._transactions.value:
+            self._transactions.replace_value(immutable_db)
+            self._wrapper_cache.set_immutable_db(immutable_db)
+
     def transactions_status(self):
         return self._transactions.status
 
+    def get_immutable_db(self):
+        """
+        Return the current ImmutableDB.
+
+        It never changes, so it can be compared with one returned earlier to
+        find out what has changed in between.
+        """
+        return self._transactions.value
+
+    def create_snapshot(self):
+        """
+        Return a read-only copy of the db as it is now.
+
+        The copy shares all records with this db, so it is cheap to create. It
+        can be read on another thread while this db changes.
+        """
+        snapshot = MemoryDB(self._transactions.value)
+        snapshot.path = self.path
+        snapshot.set_time_type(self.time_type)
+        snapshot.saved_now = self.saved_now
+        snapshot.displayed_period = self.displayed_period
+        snapshot._hidden_category_ids = list(self._hidden_category_ids)
+        snapshot.readonly = True
+        return snapshot
+
     def display_in_canvas(self, canvas):
         canvas.SetTimeline(self)
 
@@ -127,6 +196,31 @@ class MemoryDB(Observable):
     def register_save_callback(self, callback):
         self._save_callback = callback
 
+    def register_close_callback(self, callback):
+        self._close_callback = callback
+
+    def register_background_writer(self, writer):
+        self._background_writer = writer
+
+    def when_saved(self, fn):
+        """
+        Call fn when all changes have been saved.
+
+        If the changes are written in the background, fn is called later.
+        """
+        if self._background_writer is None:
+            fn()
+        else:
+            self._background_writer.when_written(fn)
+
+    def wait_until_saved(self):
+        if self._background_writer is not None:
+            self._background_writer.flush()
+
+    def close(self):
+        if self._close_callback is not None:
+            self._close_callback()
+
     def get_time_type(self):
         return self.time_type
 
@@ -154,28 +248,30 @@ class MemoryDB(Observable):
         return matches
 
     def get_events(self, time_period):
-        return self._get_events(lambda immutable_event:
-                                immutable_event.time_period.inside_period(time_period)
-                                )
+        return self._get_events(
+            lambda immutable_milestone:
+            immutable_milestone.time_period.inside_period(time_period),
+            self._transactions.value.get_event_ids_in_period(time_period)
+        )
 
     def get_all_events(self):
-        return self._get_events(lambda immutable_event: True)
+        return self._get_events(
+            lambda immutable_milestone: True,
+            [id_ for id_, immutable_event in self._transactions.value.events]
+        )
 
     @property
     def all_milestones(self):
         return self._get_milestones(lambda immutable_event: True)
 
     def get_max_sort_order(self):
-        return max([-1] +
-                   [immutable_value["sort_order"] for id_, immutable_value in self._transactions.value.milestones] +
-                   [immutable_value["sort_order"] for id_, immutable_value in self._transactions.value.events])
+        return self._transactions.value.get_max_sort_order()
 
-    def _get_events(self, criteria_fn):
+    def _get_events(self, milestone_criteria_fn, event_ids):
         with self._query() as query:
-            milestones = self._get_milestones(criteria_fn)
+            milestones = self._get_milestones(milestone_criteria_fn)
             containers = self.get_containers()
-            events = [query.get_event(id_) for id_, immutable_event in self._transactions.value.events
-                      if criteria_fn(immutable_event)]
+            events = [query.get_event(id_) for id_ in event_ids]
             return milestones + sorted(containers + events, key=lambda event: event.sort_order)
 
     def _get_milestones(self, criteria_fn):
@@ -220,6 +316,41 @@ class MemoryDB(Observable):
         except Exception as e:
             raise TimelineIOError("Saving event failed: %s" % e)
 
+    def bulk_load(self, categories=(), events=(), milestones=(), eras=(), containers=()):
+        """
+        Save many new or changed items in one transaction.
+
+        All items get ids first, so they can refer to each other in any
+        order. Then the immutable values of all items are added to the db in
+        one go and listeners are notified once. Subevents must be given in
+        events together with their containers.
+        """
+        items = {
+            "categories": list(categories),
+            "containers": list(containers),
+            "events": list(events),
+            "milestones": list(milestones),
+            "eras": list(eras),
+        }
+        try:
+            for item in itertools.chain(*items.values()):
+                item.db = self
+                item.ensure_id()
+            next_sort_order = self.get_max_sort_order() + 1
+            for item in items["events"] + items["milestones"]:
+                if item.sort_order is None:
+                    item.sort_order = next_sort_order
+                    next_sort_order += 1
+            for item in itertools.chain(*items.values()):
+                item.prepare_save()
+            with self.transaction("Load items") as t:
+                t.load(**{
+                    name: {item.id: item._immutable_value for item in items_of_kind}
+                    for (name, items_of_kind) in items.items()
+                })
+        except Exception as e:
+            raise TimelineIOError("Loading items failed: %s" % e)
+
     def save_event(self, event):
         self._save_item(event)
 
@@ -420,6 +551,7 @@ class MemoryDB(Observable):
                 return query.get_milestone(event_id)
 
     def _transaction_committed(self):
+        self._wrapper_cache.set_immutable_db(self._transactions.value)
         self._save()
         self._notify(STATE_CHANGE_ANY)
 
@@ -442,11 +574,14 @@ class MemoryDB(Observable):
         self.displayed_period = period
 
     def get_hidden_categories(self):
+        # Categories that are removed by synchronizing stay in the hidden ids,
+        # so that they are hidden again if synchronizing is undone
         with self._query() as query:
             return [
                 query.get_category(id_)
                 for id_
                 in self._hidden_category_ids
+                if id_ in self._transactions.value.categories
             ]
 
     def set_hidden_categories(self, hidden_categories):
@@ -530,7 +665,11 @@ class MemoryDB(Observable):
     def _query(self):
         need_to_create_query = self._current_query is None
         if need_to_create_query:
-            self._current_query = Query(self, self._transactions.value)
+            self._current_query = Query(
+                self,
+                self._transactions.value,
+                self._wrapper_cache
+            )
         try:
             yield self._current_query
         finally:
@@ -568,3 +707,14 @@ class MemoryDB(Observable):
         except Exception as e:
             raise TimelineIOError(f"Deleting {type(item).__name__} failed: {e}")
 
+
+def _with_icon_texts(immutable_db, icon_string):
+    events = {
+        id_: event.update(icon_text=icon_string(event.icon))
+        for (id_, event) in immutable_db.events
+        if event.icon is not None and event.icon_text is None
+    }
+    if events:
+        return immutable_db.update(events=immutable_db.events.update(events))
+    else:
+        return immutable_db
@@ -26,10 +26,14 @@ from timelinelib.canvas.data import Subevent
 
 class Query:
 
-    def __init__(self, db, immutable_db):
+    def __init__(self, db, immutable_db, wrapper_cache=None):
         self._db = db
         self._immutable_db = immutable_db
         self._wrappers = {}
+        if wrapper_cache is not None and wrapper_cache.immutable_db is immutable_db:
+            self._wrapper_cache = wrapper_cache
+        else:
+            self._wrapper_cache = None
 
     def container_exists(self, id_):
         return id_ in self._immutable_db.containers
@@ -42,38 +46,110 @@ class Query:
 
     def get_category(self, id_):
         if id_ not in self._wrappers:
-            self._wrappers[id_] = self._create_category_wrapper(id_)
+            wrapper = self._get_cached_wrapper(id_, self._immutable_db.categories)
+            if wrapper is None or wrapper.parent is not self._get_maybe_category(
+                    self._immutable_db.categories.get(id_).parent_id):
+                wrapper = self._create_category_wrapper(id_)
+                self._put_in_cache(id_, wrapper)
+            self._wrappers[id_] = wrapper
         return self._wrappers[id_]
 
     def get_container(self, id_):
         if id_ not in self._wrappers:
-            self._wrappers[id_] = self._create_container_wrapper(id_)
-            self._load_subevents(self._wrappers[id_])
+            wrapper = self._get_cached_wrapper(id_, self._immutable_db.containers)
+            if wrapper is not None and self._is_cached_container_valid(wrapper):
+                self._wrappers[id_] = wrapper
+                for subevent in wrapper.subevents:
+                    self._wrappers[subevent.id] = subevent
+            else:
+                self._wrappers[id_] = self._create_container_wrapper(id_)
+                self._load_subevents(self._wrappers[id_])
+                self._put_in_cache(id_, self._wrappers[id_])
         return self._wrappers[id_]
 
     def get_event(self, id_):
         if id_ not in self._wrappers:
-            self._wrappers[id_] = self._create_event_wrapper(id_)
             immutable_event = self._immutable_db.events.get(id_)
             if immutable_event.container_id is not None:
                 # Loading the container will load and populate all subevents
                 self.get_container(immutable_event.container_id)
+            else:
+                wrapper = self._get_cached_wrapper(id_, self._immutable_db.events)
+                if wrapper is None or wrapper.container is not None or not self._has_current_categories(wrapper):
+                    wrapper = self._create_event_wrapper(id_)
+                    self._put_in_cache(id_, wrapper)
+                self._wrappers[id_] = wrapper
         return self._wrappers[id_]
 
     def get_milestone(self, id_):
         if id_ not in self._wrappers:
-            self._wrappers[id_] = self._create_milestone_wrapper(id_)
+            wrapper = self._get_cached_wrapper(id_, self._immutable_db.milestones)
+            if wrapper is None or not self._has_current_categories(wrapper):
+                wrapper = self._create_milestone_wrapper(id_)
+                self._put_in_cache(id_, wrapper)
+            self._wrappers[id_] = wrapper
         return self._wrappers[id_]
 
     def get_era(self, id_):
         if id_ not in self._wrappers:
-            self._wrappers[id_] = self._create_era_wrapper(id_)
+            wrapper = self._get_cached_wrapper(id_, self._immutable_db.eras)
+            if wrapper is None:
+                wrapper = self._create_era_wrapper(id_)
+                self._put_in_cache(id_, wrapper)
+            self._wrappers[id_] = wrapper
         return self._wrappers[id_]
 
     def _load_subevents(self, container):
-        for subevent_id, immutable_event in self._immutable_db.events:
-            if immutable_event.container_id == container.id:
-                self.get_event(subevent_id).container = container
+        for subevent_id in self._immutable_db.get_subevent_ids(container.id):
+            self._wrappers[subevent_id] = self._create_event_wrapper(subevent_id)
+            self._wrappers[subevent_id].container = container
+
+    def _get_cached_wrapper(self, id_, immutable_values):
+        """
+        Return the cached wrapper for id_ if it still wraps the current
+        immutable value, otherwise None.
+
+        The wrapper has changed if someone has modified it without saving it
+        or if it has been deleted.
+        """
+        if self._wrapper_cache is None:
+            return None
+        wrapper = self._wrapper_cache.get(id_)
+        if (wrapper is None or
+                wrapper.id != id_ or
+                not _wraps(wrapper, immutable_values.get(id_))):
+            return None
+        return wrapper
+
+    def _is_cached_container_valid(self, container):
+        subevent_ids = self._immutable_db.get_subevent_ids(container.id)
+        if not self._has_current_categories(container):
+            return False
+        if len(subevent_ids) != len(container.subevents):
+            return False
+        if set(subevent_ids) != set(subevent.id for subevent in container.subevents):
+            return False
+        for subevent in container.subevents:
+            if (subevent.container is not container or
+                    not _wraps(subevent, self._immutable_db.events.get(subevent.id)) or
+                    not self._has_current_categories(subevent)):
+                return False
+        return True
+
+    def _has_current_categories(self, wrapper):
+        immutable_value = wrapper._immutable_value
+        category = self._get_maybe_category(immutable_value.category_id)
+        if wrapper.category is not category:
+            return False
+        for other_category in wrapper.get_categories():
+            if (other_category.id not in immutable_value.category_ids or
+                    other_category is not self.get_category(other_category.id)):
+                return False
+        return True
+
+    def _put_in_cache(self, id_, wrapper):
+        if self._wrapper_cache is not None:
+            self._wrapper_cache.put(id_, wrapper)
 
     def _create_category_wrapper(self, id_):
         immutable_category = self._immutable_db.categories.get(id_)
@@ -144,3 +220,12 @@ class Query:
             return None
         else:
             return self.get_category(category_id)
+
+
+def _wraps(wrapper, immutable_value):
+    # Some wrappers (like Subevent) update their value when they are created,
+    # so fall back to comparing values when they are not the same object.
+    return (
+        wrapper._immutable_value is immutable_value or
+        wrapper._immutable_value == immutable_value
+    )
@@ -0,0 +1,76 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+class WrapperCache:
+
+    """
+    Wrappers that can be reused between queries.
+
+    The cache belongs to one version of the immutable db. When another version
+    becomes current, the wrappers of all ids that changed are dropped. A
+    container is also dropped when one of its subevents changed, since it
+    holds the subevent wrappers.
+
+    Wrappers are mutable, so a query must still check that a wrapper from the
+    cache has not been modified before it returns it.
+    """
+
+    def __init__(self, immutable_db):
+        self._immutable_db = immutable_db
+        self._wrappers = {}
+
+    @property
+    def immutable_db(self):
+        return self._immutable_db
+
+    def __len__(self):
+        return len(self._wrappers)
+
+    def get(self, id_):
+        return self._wrappers.get(id_)
+
+    def put(self, id_, wrapper):
+        self._wrappers[id_] = wrapper
+
+    def set_immutable_db(self, immutable_db):
+        if immutable_db is self._immutable_db:
+            return
+        if self._wrappers:
+            self._drop_changed(immutable_db)
+        self._immutable_db = immutable_db
+
+    def _drop_changed(self, immutable_db):
+        for id_ in _get_changed_ids(self._immutable_db, immutable_db):
+            self._wrappers.pop(id_, None)
+
+
+def _get_changed_ids(old_db, new_db):
+    for name in ["categories", "containers", "milestones", "eras"]:
+        for id_ in _get_changed_keys(getattr(old_db, name), getattr(new_db, name)):
+            yield id_
+    for id_ in _get_changed_keys(old_db.events, new_db.events):
+        yield id_
+        for immutable_event in [old_db.events.get(id_), new_db.events.get(id_)]:
+            if immutable_event is not None and immutable_event.container_id is not None:
+                yield immutable_event.container_id
+
+
+def _get_changed_keys(old_map, new_map):
+    if old_map is new_map:
+        return []
+    return old_map.changed_keys(new_map)
@@ -33,13 +33,16 @@ class Milestone(Event):
         Event.__init__(self, db=db, id_=id_, immutable_value=immutable_value)
 
     def save(self):
-        self._update_category_id()
-        self._update_category_ids()
-        self._update_sort_order()
+        self.prepare_save()
         with self._db.transaction("Save milestone") as t:
             t.save_milestone(self._immutable_value, self.ensure_id())
         return self
 
+    def prepare_save(self):
+        self._update_category_id()
+        self._update_category_ids()
+        self._update_sort_order()
+
     def delete(self):
         with self._db.transaction("Delete milestone") as t:
             t.delete_milestone(self.id)
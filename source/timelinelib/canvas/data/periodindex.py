@@ -0,0 +1,159 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from bisect import bisect_left
+from bisect import bisect_right
+
+
+CHUNK_SIZE = 64
+
+
+class PeriodIndex:
+
+    """
+    An immutable index of (id, time period) pairs that can find the ids of
+    all periods overlapping a given period.
+
+    The entries are sorted on start time and split into chunks. For every
+    chunk the first start time and the latest end time are kept, so that a
+    query can skip whole chunks. Adding or removing an entry copies only the
+    affected chunk and the list of chunks. All other chunks are shared with
+    the original index.
+    """
+
+    def __init__(self, items=()):
+        entries = sorted(
+            [
+                (period.start_time, period.end_time, id_)
+                for (id_, period) in items
+                if period is not None
+            ],
+            key=lambda entry: entry[0]
+        )
+        self._chunks = tuple(
+            _Chunk(tuple(entries[index:index + CHUNK_SIZE]))
+            for index in range(0, len(entries), CHUNK_SIZE)
+        )
+        self._first_starts = tuple(chunk.starts[0] for chunk in self._chunks)
+        self._count = len(entries)
+
+    @classmethod
+    def _create(cls, chunks, count):
+        new = cls.__new__(cls)
+        new._chunks = chunks
+        new._first_starts = tuple(chunk.starts[0] for chunk in chunks)
+        new._count = count
+        return new
+
+    def __len__(self):
+        return self._count
+
+    def get_ids_overlapping(self, time_period):
+        """
+        Return the ids of all periods that are not outside time_period.
+
+        This is the same as TimePeriod.inside_period: periods that only touch
+        the borders of time_period are included.
+        """
+        start = time_period.start_time
+        end = time_period.end_time
+        ids = []
+        last_chunk = bisect_right(self._first_starts, end)
+        for chunk in self._chunks[:last_chunk]:
+            if chunk.max_end < start:
+                continue
+            for (entry_start, entry_end, id_) in chunk.entries:
+                if end < entry_start:
+                    break
+                if not entry_end < start:
+                    ids.append(id_)
+        return ids
+
+    def get_ids_starting_at_or_before(self, time):
+        ids = []
+        last_chunk = bisect_right(self._first_starts, time)
+        for chunk in self._chunks[:last_chunk]:
+            position = bisect_right(chunk.starts, time)
+            ids.extend(entry[2] for entry in chunk.entries[:position])
+        return ids
+
+    def get_ids_starting_at_or_after(self, time):
+        ids = []
+        first_chunk = max(bisect_left(self._first_starts, time) - 1, 0)
+        for chunk in self._chunks[first_chunk:]:
+            position = bisect_left(chunk.starts, time)
+            ids.extend(entry[2] for entry in chunk.entries[position:])
+        return ids
+
+    def add(self, id_, time_period):
+        if time_period is None:
+            return self
+        entry = (time_period.start_time, time_period.end_time, id_)
+        if not self._chunks:
+            return self._create((_Chunk((entry,)),), 1)
+        chunk_index = max(bisect_right(self._first_starts, entry[0]) - 1, 0)
+        chunk = self._chunks[chunk_index]
+        position = bisect_right(chunk.starts, entry[0])
+        entries = chunk.entries[:position] + (entry,) + chunk.entries[position:]
+        if len(entries) > 2 * CHUNK_SIZE:
+            new_chunks = (_Chunk(entries[:CHUNK_SIZE]), _Chunk(entries[CHUNK_SIZE:]))
+        else:
+            new_chunks = (_Chunk(entries),)
+        return self._create(
+            self._chunks[:chunk_index] + new_chunks + self._chunks[chunk_index + 1:],
+            self._count + 1
+        )
+
+    def remove(self, id_, time_period):
+        if time_period is None:
+            return self
+        start = time_period.start_time
+        chunk_index = max(bisect_left(self._first_starts, start) - 1, 0)
+        while chunk_index < len(self._chunks):
+            chunk = self._chunks[chunk_index]
+            if start < chunk.starts[0]:
+                break
+            position = bisect_left(chunk.starts, start)
+            while position < len(chunk.entries) and chunk.starts[position] == start:
+                if chunk.entries[position][2] == id_:
+                    return self._remove_entry(chunk_index, position)
+                position += 1
+            chunk_index += 1
+        raise ValueError("Period with id {0!r} is not in index".format(id_))
+
+    def _remove_entry(self, chunk_index, position):
+        entries = self._chunks[chunk_index].entries
+        entries = entries[:position] + entries[position + 1:]
+        if entries:
+            new_chunks = (_Chunk(entries),)
+        else:
+            new_chunks = ()
+        return self._create(
+            self._chunks[:chunk_index] + new_chunks + self._chunks[chunk_index + 1:],
+            self._count - 1
+        )
+
+
+class _Chunk:
+
+    __slots__ = ("entries", "starts", "max_end")
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.starts = tuple(entry[0] for entry in entries)
+        self.max_end = max(entry[1] for entry in entries)
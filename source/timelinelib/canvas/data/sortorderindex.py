@@ -0,0 +1,101 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from bisect import bisect_left
+from bisect import bisect_right
+
+
+CHUNK_SIZE = 256
+
+
+class SortOrderIndex:
+
+    """
+    An immutable sorted collection of sort orders where the same sort order
+    can occur many times.
+
+    The sort orders are split into sorted chunks in the same way as in
+    PeriodIndex, so adding or removing a sort order copies only the affected
+    chunk and the list of chunks.
+    """
+
+    def __init__(self, sort_orders=()):
+        values = sorted(
+            sort_order
+            for sort_order in sort_orders
+            if sort_order is not None
+        )
+        self._chunks = tuple(
+            tuple(values[index:index + CHUNK_SIZE])
+            for index in range(0, len(values), CHUNK_SIZE)
+        )
+        self._lasts = tuple(chunk[-1] for chunk in self._chunks)
+        self._count = len(values)
+
+    @classmethod
+    def _create(cls, chunks, count):
+        new = cls.__new__(cls)
+        new._chunks = chunks
+        new._lasts = tuple(chunk[-1] for chunk in chunks)
+        new._count = count
+        return new
+
+    def __len__(self):
+        return self._count
+
+    def get_max(self, default=None):
+        if self._chunks:
+            return self._lasts[-1]
+        return default
+
+    def add(self, sort_order):
+        if sort_order is None:
+            return self
+        if not self._chunks:
+            return self._create(((sort_order,),), 1)
+        chunk_index = min(bisect_left(self._lasts, sort_order), len(self._chunks) - 1)
+        chunk = self._chunks[chunk_index]
+        position = bisect_right(chunk, sort_order)
+        values = chunk[:position] + (sort_order,) + chunk[position:]
+        if len(values) > 2 * CHUNK_SIZE:
+            new_chunks = (values[:CHUNK_SIZE], values[CHUNK_SIZE:])
+        else:
+            new_chunks = (values,)
+        return self._create(
+            self._chunks[:chunk_index] + new_chunks + self._chunks[chunk_index + 1:],
+            self._count + 1
+        )
+
+    def remove(self, sort_order):
+        if sort_order is None:
+            return self
+        chunk_index = bisect_left(self._lasts, sort_order)
+        if chunk_index < len(self._chunks):
+            chunk = self._chunks[chunk_index]
+            position = bisect_left(chunk, sort_order)
+            if chunk[position] == sort_order:
+                values = chunk[:position] + chunk[position + 1:]
+                if values:
+                    new_chunks = (values,)
+                else:
+                    new_chunks = ()
+                return self._create(
+                    self._chunks[:chunk_index] + new_chunks + self._chunks[chunk_index + 1:],
+                    self._count - 1
+                )
+        raise ValueError("Sort order {0!r} is not in index".format(sort_order))
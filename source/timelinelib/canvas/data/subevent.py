@@ -23,6 +23,10 @@ from timelinelib.features.experimental.experimentalfeatures import EXTENDED_CONT
 
 class Subevent(Event):
 
+    # Lists of subevents that are kept sorted on sort order use this to see
+    # if they must be sorted again
+    sort_order_change_count = 0
+
     def __init__(self, db=None, id_=None, immutable_value=ImmutableEvent()):
         Event.__init__(self, db=db, id_=id_, immutable_value=immutable_value)
         if not EXTENDED_CONTAINER_STRATEGY.enabled():
@@ -45,6 +49,8 @@ class Subevent(Event):
     def __ne__(self, other):
         return not (self == other)
 
+    __hash__ = Event.__hash__
+
     def __repr__(self):
         return "Subevent<id=%r, text=%r, ...>" % (
             self.get_id(), self.get_text())
@@ -67,3 +73,10 @@ class Subevent(Event):
         return self
 
     time_period = property(get_time_period, set_time_period)
+
+    def set_sort_order(self, sort_order):
+        if sort_order != self.get_sort_order():
+            Subevent.sort_order_change_count += 1
+        return Event.set_sort_order(self, sort_order)
+
+    sort_order = property(Event.get_sort_order, set_sort_order)
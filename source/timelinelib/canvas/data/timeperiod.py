@@ -25,6 +25,8 @@ class TimePeriod:
     currently displayed time period in the GUI.
     """
 
+    __slots__ = ("_start_time", "_end_time")
+
     def __init__(self, start_time, end_time):
         self._start_time, self._end_time = self._update(start_time, end_time)
 
@@ -48,6 +50,9 @@ class TimePeriod:
     def __ne__(self, other):
         return not (self == other)
 
+    def __hash__(self):
+        return hash((self._start_time, self._end_time))
+
     def __repr__(self):
         return "TimePeriod<%s, %s>" % (self.start_time, self.end_time)
 
@@ -45,6 +45,19 @@ class Transactions(Observable):
             list(self._history)
         )
 
+    def replace_value(self, value):
+        """
+        Replace the current value without creating a new version in the
+        history.
+
+        Only use this for changes that should not be possible to undo.
+        """
+        if self._current_transaction is not None:
+            self._current_transaction.value = value
+        else:
+            name, _ = self._history[self._current_index]
+            self._history[self._current_index] = (name, value)
+
     def clear(self):
         self.ensure_not_in_transaction()
         self._history = [self._history[self._current_index]]
@@ -28,9 +28,13 @@ from timelinelib.canvas.drawing.drawers.legenddrawer import LegendDrawer
 from timelinelib.canvas.drawing.drawers.minorstrip import MinorStripDrawer
 from timelinelib.canvas.drawing.drawers.nowline import NowLine
 from timelinelib.canvas.drawing.interface import Drawer
+from timelinelib.canvas.drawing.rectindex import RectIndex
 from timelinelib.canvas.drawing.scene import TimelineScene
+from timelinelib.canvas.drawing.stripcache import StripCache
+from timelinelib.canvas.drawing.textsizecache import TextSizeCache
 from timelinelib.config.paths import ICONS_DIR
 from timelinelib.features.experimental.experimentalfeatures import EXTENDED_CONTAINER_HEIGHT
+from timelinelib.features.experimental.experimentalfeatures import STABLE_EVENT_ROWS
 from timelinelib.utils import unique_based_on_eq
 from timelinelib.wxgui.components.font import Font
 from wx import BRUSHSTYLE_TRANSPARENT
@@ -53,6 +57,8 @@ class DefaultDrawingAlgorithm(Drawer):
 
     def __init__(self):
         self._event_text_font = Font(8)
+        self._text_size_cache = TextSizeCache()
+        self._strip_cache = StripCache()
         self._create_pens()
         self._create_brushes()
         self._fixed_ys = {}
@@ -61,10 +67,14 @@ class DefaultDrawingAlgorithm(Drawer):
         self._do_draw_divider_line = False
         self._event_box_drawer = None
         self._background_drawer = None
+        self.scene = None
+        self._hit_test_indexes = {}
+        self._background_layer = None
 
     def set_event_font(self, new_font):
         from timelinelib.wxgui.components.font import deserialize_font
         self._event_text_font = deserialize_font(new_font)
+        self._text_size_cache.set_font(new_font)
 
     def set_event_box_drawer(self, event_box_drawer):
         self._event_box_drawer = event_box_drawer
@@ -75,13 +85,18 @@ class DefaultDrawingAlgorithm(Drawer):
     def increment_font_size(self, step=2):
         self._event_text_font.increment(step)
         self._adjust_outer_padding_to_font_size()
-        return self._event_text_font.serialize()
+        return self._event_font_changed()
 
     def decrement_font_size(self, step=2):
         if self._event_text_font.GetPointSize() > step:
             self._event_text_font.decrement(step)
             self._adjust_outer_padding_to_font_size()
-            return self._event_text_font.serialize()
+            return self._event_font_changed()
+
+    def _event_font_changed(self):
+        serialized_font = self._event_text_font.serialize()
+        self._text_size_cache.set_font(serialized_font)
+        return serialized_font
 
     def _adjust_outer_padding_to_font_size(self):
         if self._event_text_font.GetPointSize() < 8:
@@ -110,7 +125,13 @@ class DefaultDrawingAlgorithm(Drawer):
         period_width_in_pixels = self.scene.width_of_period(time_period)
         return period_width_in_pixels > PERIOD_THRESHOLD
 
+    def get_text_size_cache(self):
+        return self._text_size_cache
+
     def _get_text_extent(self, text):
+        return self._text_size_cache.get_text_size(text, self._measure_text_extent)
+
+    def _measure_text_extent(self, text):
         self.dc.SetFont(self._event_text_font)
         tw, th = self.dc.GetTextExtent(text)
         return tw, th
@@ -141,23 +162,32 @@ class DefaultDrawingAlgorithm(Drawer):
         self.appearance = appearance
         self.dc = dc
         self.time_type = timeline.get_time_type()
-        self.scene = self._create_scene(dc.GetSize(), timeline, view_properties, self._get_text_extent)
+        self.scene = self._create_scene(dc.GetSize(), timeline, view_properties, self._get_text_extent,
+                                        self._get_previous_scene())
         if view_properties.use_fixed_event_vertical_pos():
             self._calc_fixed_event_rect_y(dc.GetSize(), timeline, view_properties, self._get_text_extent)
         else:
             self._fixed_ys = {}
         self._perform_drawing(timeline, view_properties)
+        self._hit_test_indexes = {}
         del self.dc  # Program crashes if we don't delete the dc reference.
 
-    def _create_scene(self, size, db, view_properties, get_text_extent_fn):
+    def _create_scene(self, size, db, view_properties, get_text_extent_fn, previous_scene=None):
         scene = TimelineScene(size, db, view_properties, get_text_extent_fn, self.appearance)
         scene.set_outer_padding(self.outer_padding)
         scene.set_inner_padding(INNER_PADDING)
         scene.set_period_threshold(PERIOD_THRESHOLD)
         scene.set_data_indicator_size(DATA_INDICATOR_SIZE)
-        scene.create()
+        scene.set_strip_cache(self._strip_cache)
+        scene.create(previous_scene=previous_scene)
         return scene
 
+    def _get_previous_scene(self):
+        if STABLE_EVENT_ROWS.enabled():
+            return self.scene
+        else:
+            return None
+
     def _calc_fixed_event_rect_y(self, size, db, view_properties, get_text_extent_fn):
         periods = view_properties.periods
         view_properties.set_displayed_period(TimePeriod(periods[0].start_time, periods[-1].end_time), False)
@@ -167,15 +197,16 @@ class DefaultDrawingAlgorithm(Drawer):
             self._fixed_ys[evt.id] = rect.GetY()
 
     def _perform_drawing(self, timeline, view_properties):
-        self._background_drawer.draw(
-            self, self.dc, self.scene, timeline, self.colorize_weekends, self.weekend_color, self.bg_color)
+        if view_properties.period_selection and not self.fast_draw:
+            self._draw_background_layer(timeline, view_properties)
+        else:
+            self._draw_cached_background_layer(timeline, view_properties)
         if self.fast_draw:
             self._perform_fast_drawing(view_properties)
         else:
             self._perform_normal_drawing(view_properties)
 
     def _perform_fast_drawing(self, view_properties):
-        self._draw_bg()
         self._draw_events(view_properties)
         self._draw_selection_rect(view_properties)
 
@@ -186,12 +217,61 @@ class DefaultDrawingAlgorithm(Drawer):
             self.dc.DrawRectangle(*view_properties._selection_rect)
 
     def _perform_normal_drawing(self, view_properties):
-        self._draw_period_selection(view_properties)
-        self._draw_bg()
+        self._draw_now_line()
         self._draw_events(view_properties)
         self._draw_legend(view_properties, self._extract_categories())
         self._draw_ballons(view_properties)
 
+    def _draw_cached_background_layer(self, timeline, view_properties):
+        """
+        The background layer only changes when the displayed period, the size,
+        the appearance or the eras change. It is drawn into a bitmap that is
+        reused for redraws where only events, selection or hover changed.
+        """
+        (width, height) = self.dc.GetSize()
+        if width <= 0 or height <= 0:
+            self._draw_background_layer(timeline, view_properties)
+            return
+        key = self._get_background_layer_key(timeline, view_properties)
+        if self._background_layer is None or self._background_layer[0] != key:
+            bitmap = wx.Bitmap(width, height)
+            memdc = wx.MemoryDC()
+            memdc.SelectObject(bitmap)
+            dc = self.dc
+            self.dc = memdc
+            try:
+                self._draw_background_layer(timeline, view_properties)
+            finally:
+                self.dc = dc
+                memdc.SelectObject(wx.NullBitmap)
+            self._background_layer = (key, bitmap)
+        self.dc.DrawBitmap(self._background_layer[1], 0, 0)
+
+    def _get_background_layer_key(self, timeline, view_properties):
+        return (
+            self.fast_draw,
+            tuple(self.dc.GetSize()),
+            view_properties.displayed_period,
+            self.scene.divider_y,
+            self.time_type,
+            self.appearance,
+            self.appearance.get_version(),
+            self._background_drawer,
+            [
+                (era.get_name(), era.get_time_period(), era.get_color())
+                for era in timeline.get_all_periods()
+            ],
+        )
+
+    def _draw_background_layer(self, timeline, view_properties):
+        self._background_drawer.draw(
+            self, self.dc, self.scene, timeline, self.colorize_weekends, self.weekend_color, self.bg_color)
+        if not self.fast_draw:
+            self._draw_period_selection(view_properties)
+            self._draw_major_strips()
+        self._draw_minor_strips()
+        self._draw_divider_line()
+
     def snap(self, time, snap_region=10):
         if self._distance_to_left_border(time) < snap_region:
             return self._get_time_at_left_border(time)
@@ -227,21 +307,21 @@ class DefaultDrawingAlgorithm(Drawer):
 
     def event_at(self, x, y, alt_down=False):
         container_event = None
-        for (event, rect) in self.scene.event_data:
+        for event in self._get_hit_test_index("events", self._create_event_hit_index).get_values_at(x, y):
             if event.is_container():
-                rect = self._adjust_container_rect_for_hittest(rect)
-            if rect.Contains(wx.Point(x, y)):
-                if event.is_container():
-                    if alt_down:
-                        return event
-                    container_event = event
-                else:
+                if alt_down:
                     return event
+                container_event = event
+            else:
+                return event
         return container_event
 
     def get_events_in_rect(self, rect):
-        wx_rect = wx.Rect(*rect)
-        return [event for (event, rect) in self.scene.event_data if rect.Intersects(wx_rect)]
+        return [
+            event
+            for (event, _)
+            in self._get_hit_test_index("rects", self._create_event_rect_index).get_values_in_rect(wx.Rect(*rect))
+        ]
 
     def _adjust_container_rect_for_hittest(self, rect):
         if EXTENDED_CONTAINER_HEIGHT.enabled():
@@ -252,31 +332,59 @@ class DefaultDrawingAlgorithm(Drawer):
     def event_with_rect_at(self, x, y, alt_down=False):
         container_event = None
         container_rect = None
-        for (event, rect) in self.scene.event_data:
-            if rect.Contains(wx.Point(x, y)):
-                if event.is_container():
-                    if alt_down:
-                        return event, rect
-                    container_event = event
-                    container_rect = rect
-                else:
+        for (event, rect) in self._get_hit_test_index("rects", self._create_event_rect_index).get_values_at(x, y):
+            if event.is_container():
+                if alt_down:
                     return event, rect
+                container_event = event
+                container_rect = rect
+            else:
+                return event, rect
         if container_event is None:
             return None
         return container_event, container_rect
 
     def event_rect(self, evt):
-        for (event, rect) in self.scene.event_data:
-            if evt == event:
+        for (event, rect) in self._get_hit_test_index("ids", self._create_event_id_index).get(evt.id, ()):
+            if evt.id is not None or evt == event:
                 return rect
         return None
 
     def balloon_at(self, x, y):
-        event = None
-        for (event_in_list, rect) in self.balloon_data:
-            if rect.Contains(wx.Point(x, y)):
-                event = event_in_list
-        return event
+        events = self._get_hit_test_index("balloons", self._create_balloon_index).get_values_at(x, y)
+        if events:
+            return events[-1]
+        return None
+
+    def _get_hit_test_index(self, name, create_fn):
+        """
+        The indexes are created the first time they are needed after the
+        timeline has been drawn, since drawing moves the event rects.
+        """
+        if name not in self._hit_test_indexes:
+            self._hit_test_indexes[name] = create_fn()
+        return self._hit_test_indexes[name]
+
+    def _create_event_hit_index(self):
+        return RectIndex(
+            (event, self._adjust_container_rect_for_hittest(rect) if event.is_container() else rect)
+            for (event, rect) in self.scene.event_data
+        )
+
+    def _create_event_rect_index(self):
+        return RectIndex(
+            ((event, rect), rect)
+            for (event, rect) in self.scene.event_data
+        )
+
+    def _create_event_id_index(self):
+        rects_by_id = {}
+        for (event, rect) in self.scene.event_data:
+            rects_by_id.setdefault(event.id, []).append((event, rect))
+        return rects_by_id
+
+    def _create_balloon_index(self):
+        return RectIndex(self.balloon_data)
 
     def get_time(self, x):
         return self.scene.get_time(x)
@@ -297,26 +405,10 @@ class DefaultDrawingAlgorithm(Drawer):
         self.dc.SetPen(wx.TRANSPARENT_PEN)
         self.dc.DrawRectangle(start_x, 0, end_x - start_x + 1, self.scene.height)
 
-    def _draw_bg(self):
-        if self.fast_draw:
-            self._draw_fast_bg()
-        else:
-            self._draw_normal_bg()
-
-    def _draw_fast_bg(self):
-        self._draw_minor_strips()
-        self._draw_divider_line()
-
-    def _draw_normal_bg(self):
-        self._draw_major_strips()
-        self._draw_minor_strips()
-        self._draw_divider_line()
-        self._draw_now_line()
-
     def _draw_minor_strips(self):
         drawer = MinorStripDrawer(self)
         for strip_period in self.scene.minor_strip_data:
-            label = self.scene.minor_strip.label(strip_period.start_time)
+            label = self.scene.get_minor_strip_label(strip_period.start_time)
             drawer.draw(label, strip_period.start_time, strip_period.end_time)
 
     def _draw_major_strips(self):
@@ -330,7 +422,7 @@ class DefaultDrawingAlgorithm(Drawer):
     def _calculate_use_major_strip_vertical_label(self):
         if len(self.scene.major_strip_data) > 0:
             strip_period = self.scene.major_strip_data[0]
-            label = self.scene.major_strip.label(strip_period.start_time, True)
+            label = self.scene.get_major_strip_label(strip_period.start_time)
             strip_width = self.scene.width_of_period(strip_period)
             tw, _ = self.dc.GetTextExtent(label)
             self.use_major_strip_vertical_label = strip_width < (tw + 5)
@@ -342,7 +434,7 @@ class DefaultDrawingAlgorithm(Drawer):
         self.dc.DrawLine(x, 0, x, self.scene.height)
 
     def _draw_major_strip_label(self, time_period):
-        label = self.scene.major_strip.label(time_period.start_time, True)
+        label = self.scene.get_major_strip_label(time_period.start_time)
         if self.use_major_strip_vertical_label:
             self._draw_major_strip_vertical_label(time_period, label)
         else:
@@ -122,3 +122,10 @@ class Strip:
 
     def is_day(self):
         return False
+
+    def get_cache_key(self):
+        """
+        Return a hashable key that is equal for strips that return the same
+        start times, increments and labels.
+        """
+        return (self.__class__, tuple(sorted(vars(self).items())))
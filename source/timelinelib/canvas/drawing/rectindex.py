@@ -0,0 +1,96 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import wx
+
+
+CELL_SIZE = 64
+MAX_CELLS_PER_RECT = 64
+
+
+class RectIndex:
+
+    """
+    A grid over (value, rect) pairs that finds the rects containing a point
+    or intersecting a rect without looking at all of them.
+
+    Every rect is added to all grid cells that it covers. Rects that are
+    wider than MAX_CELLS_PER_RECT cells, like period events when zoomed in,
+    are only added to the rows of cells that they cover. Queries only look at
+    the rects in the cells and rows that the point or rect is in, and return
+    the values in the order they were given.
+    """
+
+    def __init__(self, items):
+        self._items = list(items)
+        self._cells = {}
+        self._rows = {}
+        self._large = []
+        for (index, (_, rect)) in enumerate(self._items):
+            (first_column, last_column) = _cell_range(rect.X, rect.Width)
+            (first_row, last_row) = _cell_range(rect.Y, rect.Height)
+            if last_row - first_row >= MAX_CELLS_PER_RECT:
+                self._large.append(index)
+            elif last_column - first_column >= MAX_CELLS_PER_RECT:
+                for row in range(first_row, last_row + 1):
+                    self._rows.setdefault(row, []).append(index)
+            else:
+                for row in range(first_row, last_row + 1):
+                    for column in range(first_column, last_column + 1):
+                        self._cells.setdefault((column, row), []).append(index)
+
+    def get_values_at(self, x, y):
+        """Return the values of all rects that contain the point (x, y)."""
+        column = x // CELL_SIZE
+        row = y // CELL_SIZE
+        indices = set(self._large)
+        indices.update(self._rows.get(row, ()))
+        indices.update(self._cells.get((column, row), ()))
+        point = wx.Point(x, y)
+        return [
+            self._items[index][0]
+            for index in sorted(indices)
+            if self._items[index][1].Contains(point)
+        ]
+
+    def get_values_in_rect(self, rect):
+        """Return the values of all rects that intersect rect."""
+        (first_column, last_column) = _cell_range(rect.X, rect.Width)
+        (first_row, last_row) = _cell_range(rect.Y, rect.Height)
+        cell_count = (last_column - first_column + 1) * (last_row - first_row + 1)
+        if cell_count > len(self._items):
+            indices = range(len(self._items))
+        else:
+            indices = set(self._large)
+            for row in range(first_row, last_row + 1):
+                indices.update(self._rows.get(row, ()))
+                for column in range(first_column, last_column + 1):
+                    indices.update(self._cells.get((column, row), ()))
+            indices = sorted(indices)
+        return [
+            self._items[index][0]
+            for index in indices
+            if self._items[index][1].Intersects(rect)
+        ]
+
+
+def _cell_range(start, length):
+    end = start + length - 1
+    if end < start:
+        (start, end) = (end, start)
+    return (start // CELL_SIZE, end // CELL_SIZE)
@@ -18,13 +18,19 @@
 
 import wx
 
+from timelinelib.canvas.drawing.skyline import Skyline
+from timelinelib.canvas.drawing.stripcache import StripCache
 from timelinelib.canvas.drawing.utils import Metrics
-from timelinelib.canvas.data import TimePeriod
 
 
 FORWARD = 1
 BACKWARD = -1
 
+# Compare every event with all events placed before it
+PAIRWISE_LAYOUT = "pairwise"
+# Find overlapping events with skylines over the x axis
+SWEEP_LINE_LAYOUT = "sweep-line"
+
 
 class TimelineScene:
 
@@ -44,10 +50,18 @@ class TimelineScene:
         self.width, self.height = size
         self.divider_y = self._metrics.half_height
         self.event_data = []
+        self._event_data_by_id = {}
+        self._event_data_by_id_source = None
+        self._event_data_by_id_count = 0
         self.major_strip = None
         self.minor_strip = None
         self.major_strip_data = []
         self.minor_strip_data = []
+        self._layout = SWEEP_LINE_LAYOUT
+        self._previous_ys = {}
+        self._placed_ys = {}
+        self._event_xs = {}
+        self._strip_cache = StripCache()
 
     @property
     def view_properties(self):
@@ -78,14 +92,40 @@ class TimelineScene:
     def set_data_indicator_size(self, data_indicator_size):
         self._data_indicator_size = data_indicator_size
 
-    def create(self):
+    def set_strip_cache(self, strip_cache):
+        self._strip_cache = strip_cache
+
+    def create(self, layout=SWEEP_LINE_LAYOUT, previous_scene=None):
         """
         Creating a scene means that pixel sizes and positions are calculated
         for events and strips.
+
+        Both layouts give the same positions. The pairwise layout is
+        O(n^2) and the sweep-line layout is O(n log n).
+
+        If a previous scene of the same timeline and size is given, the
+        sweep-line layout keeps the y positions from that scene for events
+        that still fit there. This keeps rows stable when scrolling and
+        zooming. It does not make the layout faster: all visible events are
+        still measured and placed.
         """
+        self._layout = layout
+        self._previous_ys = self._get_reusable_ys(previous_scene)
         self.event_data = self._calc_event_sizes_and_positions()
         self.minor_strip_data, self.major_strip_data = self._calc_strips_sizes_and_positions()
 
+    def _get_reusable_ys(self, previous_scene):
+        if (previous_scene is None or
+                self._layout != SWEEP_LINE_LAYOUT or
+                previous_scene._db is not self._db or
+                (previous_scene.width, previous_scene.height) != (self.width, self.height) or
+                previous_scene.divider_y != self.divider_y or
+                previous_scene._outer_padding != self._outer_padding or
+                previous_scene._inner_padding != self._inner_padding or
+                previous_scene._baseline_padding != self._baseline_padding):
+            return {}
+        return previous_scene._placed_ys
+
     def x_pos_for_time(self, time):
         return self._metrics.calc_x(time)
 
@@ -127,9 +167,37 @@ class TimelineScene:
             rect.Inflate(self._outer_padding, self._outer_padding)
 
     def _get_event_rect(self, event):
-        for (evt, rect) in self.event_data:
-            if evt == event:
-                return rect
+        entry = self._get_event_data_entry(event)
+        if entry is None:
+            return None
+        return entry[1]
+
+    def _get_event_data_entry(self, event):
+        if event.id is None:
+            for (evt, rect) in self.event_data:
+                if evt == event:
+                    return (evt, rect)
+            return None
+        return self._get_event_data_by_id().get(event.id)
+
+    def _get_event_data_by_id(self):
+        """
+        Return a dict from event id to the first (event, rect) pair in
+        event_data with that id.
+
+        Pairs appended to event_data since the last call are added to the
+        dict, and the dict is rebuilt if event_data has been replaced.
+        """
+        if (self._event_data_by_id_source is not self.event_data or
+                self._event_data_by_id_count > len(self.event_data)):
+            self._event_data_by_id = {}
+            self._event_data_by_id_source = self.event_data
+            self._event_data_by_id_count = 0
+        for (event, rect) in self.event_data[self._event_data_by_id_count:]:
+            if event.id is not None:
+                self._event_data_by_id.setdefault(event.id, (event, rect))
+        self._event_data_by_id_count = len(self.event_data)
+        return self._event_data_by_id
 
     def _event_rect_drawn_as_period(self, event_rect):
         return event_rect.Y >= self.divider_y
@@ -200,22 +268,46 @@ class TimelineScene:
         dependent on the position of the container. So the container metrics
         must be calculated first.
         """
+        subevents_by_container = {}
+        for event in events:
+            if event.is_subevent():
+                subevents_by_container.setdefault(id(event.container), []).append(event)
         result = []
         for event in events:
             if event.is_container():
                 result.append(event)
-                subevents = [e for e in events if e.is_subevent() and e.container is event]
-                result.extend(subevents)
+                result.extend(subevents_by_container.get(id(event), []))
             elif not event.is_subevent():
                 result.append(event)
         return result
 
     def _calc_event_rects(self, events):
-        self.event_data = self._calc_non_overlapping_event_rects(events)
+        for event in events:
+            self._update_ends_today(event)
+        self._event_xs = self._calc_event_xs(events)
+        try:
+            self.event_data = self._calc_non_overlapping_event_rects(events)
+        finally:
+            self._event_xs = {}
         self._deflate_rects(self.event_data)
         return self.event_data
 
+    def _calc_event_xs(self, events):
+        """
+        Calculate the x positions of the start and end of all events in one
+        pass over two parallel lists of time numbers.
+        """
+        periods = [event.get_time_period() for event in events]
+        start_xs = self._metrics.calc_x_array([period.start_time.to_number() for period in periods])
+        end_xs = self._metrics.calc_x_array([period.end_time.to_number() for period in periods])
+        return {
+            id(event): (start_x, end_x)
+            for (event, start_x, end_x) in zip(events, start_xs, end_xs)
+        }
+
     def _calc_non_overlapping_event_rects(self, events):
+        if self._layout == SWEEP_LINE_LAYOUT:
+            return self._calc_non_overlapping_event_rects_with_skylines(events)
         self.event_data = []
         for event in events:
             rect = self._create_ideal_rect_for_event(event)
@@ -227,10 +319,12 @@ class TimelineScene:
         for (_, rect) in event_data:
             rect.Deflate(self._outer_padding, self._outer_padding)
 
-    def _create_ideal_rect_for_event(self, event):
+    def _update_ends_today(self, event):
         self._reset_ends_today_when_start_date_is_in_future(event)
         if event.ends_today:
             event.set_end_time(self._db.now)
+
+    def _create_ideal_rect_for_event(self, event):
         if self._display_as_period(event):
             return self._calc_ideal_rect_for_period_event(event)
         else:
@@ -244,7 +338,19 @@ class TimelineScene:
         return event.get_time_period().start_time > self._db.now
 
     def _display_as_period(self, event):
-        return self._metrics.calc_width(event.get_time_period()) > self._period_threshold
+        return self._calc_event_width(event) > self._period_threshold
+
+    def _calc_event_start_x(self, event):
+        xs = self._event_xs.get(id(event))
+        if xs is None:
+            return self._metrics.calc_x(event.get_time_period().start_time)
+        return xs[0]
+
+    def _calc_event_width(self, event):
+        xs = self._event_xs.get(id(event))
+        if xs is None:
+            return self._metrics.calc_width(event.get_time_period())
+        return xs[1] - xs[0] + 1
 
     def _calc_ideal_rect_for_period_event(self, event):
         rw, rh = self._calc_width_and_height_for_period_event(event)
@@ -254,14 +360,14 @@ class TimelineScene:
 
     def _calc_width_and_height_for_period_event(self, event):
         _, th = self._get_text_size(event.get_text())
-        ew = self._metrics.calc_width(event.get_time_period())
+        ew = self._calc_event_width(event)
         min_w = 5 * self._outer_padding
         rw = max(ew + 2 * self._outer_padding, min_w)
         rh = th + 2 * self._inner_padding + 2 * self._outer_padding
         return rw, rh
 
     def _calc_x_pos_for_period_event(self, event):
-        return self._metrics.calc_x(event.get_time_period().start_time) - self._outer_padding
+        return self._calc_event_start_x(event) - self._outer_padding
 
     def _calc_y_pos_for_period_event(self, event):
         if event.is_subevent():
@@ -273,9 +379,9 @@ class TimelineScene:
             return self._metrics.half_height + self._baseline_padding
 
     def _get_container_ry(self, subevent):
-        for (event, rect) in self.event_data:
-            if event == subevent.container:
-                return rect.y
+        rect = self._get_event_rect(subevent.container)
+        if rect is not None:
+            return rect.y
         return self._metrics.half_height + self._baseline_padding
 
     def _calc_ideal_rect_for_non_period_event(self, event):
@@ -287,7 +393,7 @@ class TimelineScene:
             ry = self._calc_y_pos_for_non_period_event(event, rh)
             if event.is_milestone():
                 rw = rh
-                rx = self._metrics.calc_x(event.get_time_period().start_time) - rw // 2
+                rx = self._calc_event_start_x(event) - rw // 2
                 return wx.Rect(rx, ry, rw, rh)
             return self._calc_ideal_wx_rect(rx, ry, rw, rh)
 
@@ -306,7 +412,7 @@ class TimelineScene:
 
     def _calc_x_pos_for_non_period_event(self, event, rw):
         if self._appearance.get_draw_period_events_to_right():
-            return self._metrics.calc_x(event.get_time_period().start_time) - self._outer_padding
+            return self._calc_event_start_x(event) - self._outer_padding
         else:
             return self._metrics.calc_x(event.mean_time()) - rw // 2
 
@@ -337,30 +443,28 @@ class TimelineScene:
         return wx.Rect(rx, ry, rw, rh)
 
     def _calc_strips_sizes_and_positions(self):
-        """Fill the two arrays `minor_strip_data` and `major_strip_data`."""
-
-        def fill(strip_list, strip):
-            """Fill the given list with the given strip."""
-            try:
-                current_start = strip.start(self._view_properties.displayed_period.start_time)
-                while current_start < self._view_properties.displayed_period.end_time:
-                    next_start = strip.increment(current_start)
-                    strip_list.append(TimePeriod(current_start, next_start))
-                    current_start = next_start
-            except:
-                # Exception occurs when major=century and when we are at the end of the calendar
-                pass
-        major_strip_data = []  # List of time_period
-        minor_strip_data = []  # List of time_period
+        """
+        Return the two lists `minor_strip_data` and `major_strip_data`.
+
+        The strip periods come from the strip cache, so that only the parts
+        not seen by a previous scene are generated.
+        """
         self.major_strip, self.minor_strip = self._db.get_time_type().choose_strip(self._metrics, self._appearance)
         if hasattr(self.major_strip, 'set_skip_s_in_decade_text'):
             self.major_strip.set_skip_s_in_decade_text(self._view_properties.get_skip_s_in_decade_text())
         if hasattr(self.minor_strip, 'set_skip_s_in_decade_text'):
             self.minor_strip.set_skip_s_in_decade_text(self._view_properties.get_skip_s_in_decade_text())
-        fill(major_strip_data, self.major_strip)
-        fill(minor_strip_data, self.minor_strip)
+        displayed_period = self._view_properties.displayed_period
+        major_strip_data = self._strip_cache.get_periods(self.major_strip, displayed_period)
+        minor_strip_data = self._strip_cache.get_periods(self.minor_strip, displayed_period)
         return minor_strip_data, major_strip_data
 
+    def get_minor_strip_label(self, time):
+        return self._strip_cache.get_label(self.minor_strip, time)
+
+    def get_major_strip_label(self, time):
+        return self._strip_cache.get_label(self.major_strip, time, True)
+
     def minor_strip_is_day(self):
         return self.minor_strip.is_day()
 
@@ -395,14 +499,14 @@ class TimelineScene:
             self._adjust_container_rect_height(subevent, event_rect)
 
     def _adjust_container_rect_height(self, subevent, event_rect):
-        for (evt, rect) in self.event_data:
-            if evt.is_container() and evt is subevent.container:
-                _, th = self._get_text_size(evt.get_text())
-                rh = th + 2 * (self._inner_padding + self._outer_padding)
-                h = event_rect.Y - rect.Y + rh
-                if rect.height < h:
-                    rect.Height = h
-                break
+        entry = self._get_event_data_entry(subevent.container)
+        if entry is not None and entry[0] is subevent.container:
+            (evt, rect) = entry
+            _, th = self._get_text_size(evt.get_text())
+            rh = th + 2 * (self._inner_padding + self._outer_padding)
+            h = event_rect.Y - rect.Y + rh
+            if rect.height < h:
+                rect.Height = h
 
     def _get_overlapping_subevent_rect_with_largest_y(self, subevent, event_rect):
         event_data = self._get_list_with_overlapping_subevents(subevent, event_rect)
@@ -455,3 +559,143 @@ class TimelineScene:
         REMOVE_X_PADDING = 2 + self._outer_padding * 2
         return (rect2.x + REMOVE_X_PADDING <= rect1.x + rect1.width and
                 rect1.x + REMOVE_X_PADDING <= rect2.x + rect2.width)
+
+    def _calc_non_overlapping_event_rects_with_skylines(self, events):
+        """
+        Place events exactly like the pairwise layout does, but look up
+        overlapping rects in skylines instead of comparing with all rects.
+
+        Rects below the divider are stored with their bottom y in one
+        skyline, and rects above it with their negated y in another, so that
+        the largest value gives the rect to place the new rect below or
+        above. Period subevents also go into a skyline per container.
+
+        Since only y positions change during placement, all ideal rects are
+        calculated first so that the skylines know all x intervals.
+
+        Events with a y position from a previous scene are placed first, and
+        they keep that position unless a rect placed before them is in the
+        way.
+        """
+        self.event_data = []
+        self._placed_ys = {}
+        placements = []
+        for event in self._place_events_with_previous_ys_first(events):
+            rect = self._create_ideal_rect_for_event(event)
+            placements.append((event, rect, self._display_as_period(event), self._skyline_interval(rect)))
+        intervals = [interval for (_, _, _, interval) in placements]
+        period_skyline = Skyline(intervals)
+        point_skyline = Skyline(intervals)
+        subevent_skylines = self._create_subevent_skylines(placements)
+        containers = {}
+        containers_at_previous_y = set()
+        for (index, (event, rect, display_as_period, interval)) in enumerate(placements):
+            previous_y = self._get_previous_y(event, display_as_period)
+            if event.is_milestone():
+                pass
+            elif event.is_subevent() and display_as_period:
+                container = containers.get(id(event.container))
+                if container is not None:
+                    rect.Y = container[1].Y
+                if id(event.container) not in containers_at_previous_y:
+                    previous_y = None
+                highest = subevent_skylines[id(event.container)].get_max(*interval)
+                if highest is not None:
+                    rect.Y = _larger(highest[2], previous_y)
+                elif previous_y is not None:
+                    rect.Y = previous_y
+                if container is not None and (highest is not None or previous_y is not None):
+                    self._grow_container_rect(container, rect, period_skyline)
+            elif display_as_period:
+                bottom = period_skyline.get_max(*interval)
+                if bottom is not None:
+                    rect.Y = _larger(bottom, previous_y)
+                elif previous_y is not None:
+                    rect.Y = previous_y
+            else:
+                negative_y = point_skyline.get_max(*interval)
+                if negative_y is not None:
+                    rect.Y = -_larger(negative_y, _negate(previous_y, rect.height)) - rect.height
+                elif previous_y is not None:
+                    rect.Y = previous_y
+            if rect.Y >= self.divider_y:
+                period_skyline.insert(interval[0], interval[1], rect.Y + rect.Height)
+                if event.is_subevent() and display_as_period:
+                    subevent_skylines[id(event.container)].insert(
+                        interval[0], interval[1], (rect.Y, -index, rect.Y + rect.height)
+                    )
+            else:
+                point_skyline.insert(interval[0], interval[1], -rect.Y)
+            if event.is_container():
+                containers[id(event)] = (event, rect, interval)
+                if previous_y is not None and rect.Y == previous_y:
+                    containers_at_previous_y.add(id(event))
+            self._placed_ys[event.id] = (display_as_period, rect.Y)
+            self.event_data.append((event, rect))
+        return self.event_data
+
+    def _place_events_with_previous_ys_first(self, events):
+        if not self._previous_ys:
+            return events
+        first = []
+        rest = []
+        containers_first = set()
+        for event in events:
+            if event.is_subevent():
+                has_previous_y = id(event.container) in containers_first
+            else:
+                has_previous_y = event.id in self._previous_ys
+            if has_previous_y:
+                first.append(event)
+                if event.is_container():
+                    containers_first.add(id(event))
+            else:
+                rest.append(event)
+        return first + rest
+
+    def _get_previous_y(self, event, display_as_period):
+        previous = self._previous_ys.get(event.id)
+        if previous is not None and previous[0] == display_as_period:
+            return previous[1]
+        return None
+
+    def _skyline_interval(self, rect):
+        # Doubled x coordinates so that _rects_overlap becomes an
+        # intersection test between intervals
+        remove_x_padding = 2 + self._outer_padding * 2
+        return (2 * rect.x + remove_x_padding, 2 * (rect.x + rect.width) - remove_x_padding)
+
+    @staticmethod
+    def _create_subevent_skylines(placements):
+        intervals = {}
+        for (event, _, display_as_period, interval) in placements:
+            if event.is_subevent() and display_as_period:
+                intervals.setdefault(id(event.container), []).append(interval)
+        return {
+            container_id: Skyline(container_intervals)
+            for (container_id, container_intervals)
+            in intervals.items()
+        }
+
+    def _grow_container_rect(self, container, subevent_rect, period_skyline):
+        event, rect, interval = container
+        _, th = self._get_text_size(event.get_text())
+        rh = th + 2 * (self._inner_padding + self._outer_padding)
+        h = subevent_rect.Y - rect.Y + rh
+        if rect.height < h:
+            rect.Height = h
+            if rect.Y >= self.divider_y:
+                period_skyline.insert(interval[0], interval[1], rect.Y + rect.Height)
+
+
+def _larger(value, other_value):
+    if other_value is None:
+        return value
+    return max(value, other_value)
+
+
+def _negate(y, height):
+    # The point skyline stores negated y values
+    if y is None:
+        return None
+    return -(y + height)
@@ -0,0 +1,123 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from bisect import bisect_left
+from bisect import bisect_right
+
+
+class Skyline:
+
+    """
+    Keep values for closed intervals on a line and find the largest value
+    stored for any interval that overlaps a given interval.
+
+    All intervals that will be inserted or queried must be given when the
+    skyline is created. Their end points are the coordinates of a segment
+    tree, so that both insert and get_max are O(log n).
+
+    An interval (lo, hi) with lo > hi is allowed. Two intervals overlap if
+    each one starts before the other one ends, so an inverted interval
+    overlaps only intervals that cover the gap between its end points.
+    Those intervals are rare, and they are handled by comparing them with
+    all stored intervals.
+
+    >>> skyline = Skyline([(0, 10), (5, 15), (20, 30)])
+    >>> skyline.insert(0, 10, 3)
+    >>> skyline.insert(5, 15, 7)
+    >>> skyline.get_max(20, 30) is None
+    True
+    >>> skyline.get_max(10, 12)
+    7
+    >>> skyline.get_max(0, 4)
+    3
+    """
+
+    def __init__(self, intervals):
+        self._coordinates = sorted(set(
+            coordinate
+            for (lo, hi) in intervals
+            if lo <= hi
+            for coordinate in (lo, hi)
+        ))
+        self._size = len(self._coordinates)
+        self._tags = [None] * (4 * self._size)
+        self._best = [None] * (4 * self._size)
+        self._entries = []
+        self._inverted_entries = []
+
+    def insert(self, lo, hi, value):
+        self._entries.append((lo, hi, value))
+        if lo > hi:
+            self._inverted_entries.append((lo, hi, value))
+        else:
+            self._insert(1, 0, self._size - 1, self._index_of(lo), self._index_of(hi), value)
+
+    def get_max(self, lo, hi):
+        if lo > hi:
+            return self._get_max_from_entries(self._entries, lo, hi)
+        result = self._get_max_from_entries(self._inverted_entries, lo, hi)
+        first = bisect_left(self._coordinates, lo)
+        last = bisect_right(self._coordinates, hi) - 1
+        if first <= last:
+            result = _larger(result, self._get_max(1, 0, self._size - 1, first, last))
+        return result
+
+    def _index_of(self, coordinate):
+        index = bisect_left(self._coordinates, coordinate)
+        if index == self._size or self._coordinates[index] != coordinate:
+            raise ValueError("Interval end point %r was not given to the skyline" % coordinate)
+        return index
+
+    def _insert(self, node, node_first, node_last, first, last, value):
+        self._best[node] = _larger(self._best[node], value)
+        if first <= node_first and node_last <= last:
+            self._tags[node] = _larger(self._tags[node], value)
+            return
+        middle = (node_first + node_last) // 2
+        if first <= middle:
+            self._insert(2 * node, node_first, middle, first, last, value)
+        if last > middle:
+            self._insert(2 * node + 1, middle + 1, node_last, first, last, value)
+
+    def _get_max(self, node, node_first, node_last, first, last):
+        if first <= node_first and node_last <= last:
+            return self._best[node]
+        # The tag applies to all of the node, and the query overlaps the node
+        result = self._tags[node]
+        middle = (node_first + node_last) // 2
+        if first <= middle:
+            result = _larger(result, self._get_max(2 * node, node_first, middle, first, last))
+        if last > middle:
+            result = _larger(result, self._get_max(2 * node + 1, middle + 1, node_last, first, last))
+        return result
+
+    @staticmethod
+    def _get_max_from_entries(entries, lo, hi):
+        result = None
+        for (entry_lo, entry_hi, value) in entries:
+            if entry_lo <= hi and lo <= entry_hi:
+                result = _larger(result, value)
+        return result
+
+
+def _larger(value1, value2):
+    if value1 is None:
+        return value2
+    if value2 is None:
+        return value1
+    return max(value1, value2)
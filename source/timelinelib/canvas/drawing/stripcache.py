@@ -0,0 +1,108 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from bisect import bisect_left
+
+from timelinelib.canvas.data import TimePeriod
+
+
+MAX_KEYS = 32
+MAX_BOUNDARIES = 5000
+MAX_LABELS = 5000
+
+
+class StripCache:
+
+    """
+    Remember strip boundaries and labels between scenes.
+
+    For every strip key a run of consecutive strip start times is kept.
+    When the displayed period is panned or zoomed, the run is extended at
+    either end instead of being generated from scratch.
+    """
+
+    def __init__(self):
+        self._boundaries = {}
+        self._labels = {}
+
+    def get_periods(self, strip, time_period):
+        """
+        Return the strip periods from the strip containing the start of
+        time_period to the strip containing its end.
+        """
+        key = strip.get_cache_key()
+        try:
+            first = strip.start(time_period.start_time)
+        except Exception:
+            # Happens when we are at the end of the calendar
+            return []
+        boundaries = self._get_boundaries(key, strip, first)
+        index = bisect_left(boundaries, first)
+        self._extend_right(boundaries, strip, time_period.end_time)
+        last = min(bisect_left(boundaries, time_period.end_time, index), len(boundaries) - 1)
+        return [
+            TimePeriod(boundaries[i], boundaries[i + 1])
+            for i in range(index, last)
+        ]
+
+    def get_label(self, strip, time, major=False):
+        key = strip.get_cache_key()
+        labels = self._labels.get(key)
+        if labels is None or len(labels) > MAX_LABELS:
+            if len(self._labels) >= MAX_KEYS:
+                self._labels.clear()
+            labels = self._labels[key] = {}
+        label_key = (time, major)
+        if label_key not in labels:
+            labels[label_key] = strip.label(time, major)
+        return labels[label_key]
+
+    def _get_boundaries(self, key, strip, first):
+        boundaries = self._boundaries.get(key)
+        if boundaries is not None and first < boundaries[0]:
+            boundaries = self._extend_left(boundaries, strip, first)
+        if (boundaries is None or
+                len(boundaries) > MAX_BOUNDARIES or
+                first > boundaries[-1] or
+                boundaries[bisect_left(boundaries, first)] != first):
+            if len(self._boundaries) >= MAX_KEYS:
+                self._boundaries.clear()
+            boundaries = [first]
+        self._boundaries[key] = boundaries
+        return boundaries
+
+    def _extend_left(self, boundaries, strip, first):
+        new_boundaries = [first]
+        try:
+            while new_boundaries[-1] < boundaries[0]:
+                if len(new_boundaries) > MAX_BOUNDARIES:
+                    return None
+                new_boundaries.append(strip.increment(new_boundaries[-1]))
+        except Exception:
+            return None
+        if new_boundaries[-1] != boundaries[0]:
+            return None
+        return new_boundaries[:-1] + boundaries
+
+    def _extend_right(self, boundaries, strip, end_time):
+        try:
+            while boundaries[-1] < end_time:
+                boundaries.append(strip.increment(boundaries[-1]))
+        except Exception:
+            # Happens when we are at the end of the calendar
+            pass
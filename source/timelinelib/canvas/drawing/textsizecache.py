@@ -0,0 +1,81 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from collections import OrderedDict
+
+
+MAX_SIZE = 10000
+
+
+class TextSizeCache:
+
+    """
+    A bounded cache of text sizes keyed on (font description, text).
+
+    Measuring text is one of the more expensive calls when a scene is
+    created, and the same texts are measured again every time the timeline
+    is redrawn. When the cache is full the least recently used size is
+    dropped.
+
+    >>> cache = TextSizeCache(max_size=2)
+    >>> cache.set_font("font-a")
+    >>> cache.get_text_size("hello", lambda text: (len(text), 10))
+    (5, 10)
+    >>> cache.get_text_size("hello", lambda text: None)
+    (5, 10)
+    >>> (cache.hits, cache.misses)
+    (1, 1)
+    """
+
+    def __init__(self, max_size=MAX_SIZE):
+        self._max_size = max_size
+        self._sizes = OrderedDict()
+        self._font_description = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def set_font(self, font_description):
+        """
+        Set the font used for texts measured from now on.
+
+        Sizes measured with other fonts can not be used again until the font
+        changes back, so they are dropped.
+        """
+        if font_description != self._font_description:
+            self._font_description = font_description
+            self.clear()
+
+    def clear(self):
+        self._sizes.clear()
+
+    def get_text_size(self, text, measure_fn):
+        key = (self._font_description, text)
+        size = self._sizes.get(key)
+        if size is None:
+            self.misses += 1
+            size = measure_fn(text)
+            self._sizes[key] = size
+            if len(self._sizes) > self._max_size:
+                self._sizes.popitem(last=False)
+        else:
+            self.hits += 1
+            self._sizes.move_to_end(key)
+        return size
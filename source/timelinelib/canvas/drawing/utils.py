@@ -18,6 +18,18 @@
 
 import wx
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Numbers smaller than this, and differences between them, are exact as
+# float64. Then calc_x_array gives the same result as calc_x.
+EXACT_NUMBER_LIMIT = 2 ** 52
+# Larger x positions are converted one by one to avoid int64 overflow.
+MAX_ARRAY_X = 2 ** 62
+
 
 class Metrics:
     """
@@ -48,6 +60,44 @@ class Metrics:
             if time > self.time_period.end_time:
                 return self.width + 1
 
+    def calc_x_array(self, numbers):
+        """
+        Return the x positions in pixels as integers for the given times.
+
+        The times are given as numbers from time.to_number(). If NumPy is
+        installed, all positions are calculated in one vectorized pass.
+        """
+        start = self.time_period.start_time.to_number()
+        delta = self.time_period.end_time.to_number() - start
+        if numpy is not None and len(numbers) > 0 and delta != 0:
+            xs = self._calc_x_array_with_numpy(numbers, start, delta)
+            if xs is not None:
+                return xs
+        return [self._calc_x_from_number(number, start, delta) for number in numbers]
+
+    def _calc_x_array_with_numpy(self, numbers, start, delta):
+        if abs(start) >= EXACT_NUMBER_LIMIT or abs(delta) >= EXACT_NUMBER_LIMIT:
+            return None
+        values = numpy.asarray(numbers)
+        if values.dtype.kind in "iu":
+            if numpy.abs(values).max() >= EXACT_NUMBER_LIMIT:
+                return None
+            values = values.astype(numpy.int64)
+        elif values.dtype.kind != "f":
+            return None
+        xs = numpy.rint(self.width * ((values - start) / delta))
+        if not numpy.isfinite(xs).all() or numpy.abs(xs).max() >= MAX_ARRAY_X:
+            return None
+        return xs.astype(numpy.int64).tolist()
+
+    def _calc_x_from_number(self, number, start, delta):
+        try:
+            return int(round(self.width * ((number - start) / delta)))
+        except OverflowError:
+            if number < start:
+                return -1
+            return self.width + 1
+
     def calc_exact_width(self, time_period):
         """Return the with in pixels as a float for the given time_period."""
         return (self.calc_exact_x(time_period.end_time) -
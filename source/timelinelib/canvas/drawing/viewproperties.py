@@ -17,6 +17,7 @@
 
 
 from timelinelib.general.observer import Observable
+from timelinelib.general.orderedset import OrderedSet
 
 
 class ViewProperties(Observable):
@@ -29,15 +30,15 @@ class ViewProperties(Observable):
 
     def __init__(self):
         Observable.__init__(self)
-        self.sticky_balloon_event_ids = []
+        self._sticky_balloon_event_ids = OrderedSet()
         self.hovered_event = None
-        self.selected_event_ids = []
-        self._hidden_category_ids = []
+        self._selected_event_ids = OrderedSet()
+        self._hidden_category_ids = set()
         self.period_selection = None
         self.divider_position = 0.5
         self.displayed_period = None
         self.hscroll_amount = 0
-        self.view_cats_individually = False
+        self._view_cats_individually = False
         self.fixed_event_vertical_pos = False
         self.fuzzy_icon = None
         self.locked_icon = None
@@ -53,6 +54,7 @@ class ViewProperties(Observable):
         self._labels = []
         self._match_all = False
         self._labels_filter_controller = None
+        self._event_filter = None
 
     def is_highlighted(self, event):
         return event.get_id() in self._event_highlight_counters
@@ -97,7 +99,19 @@ class ViewProperties(Observable):
 
     @hide_events_done.setter
     def hide_events_done(self, value):
-        self._hide_events_done = value
+        if self._hide_events_done != value:
+            self._hide_events_done = value
+            self._event_filter = None
+
+    @property
+    def view_cats_individually(self):
+        return self._view_cats_individually
+
+    @view_cats_individually.setter
+    def view_cats_individually(self, value):
+        if self._view_cats_individually != value:
+            self._view_cats_individually = value
+            self._event_filter = None
 
     def get_fuzzy_icon(self):
         return self.fuzzy_icon
@@ -136,10 +150,11 @@ class ViewProperties(Observable):
         return self.fixed_event_vertical_pos
 
     def clear_db_specific(self):
-        self.sticky_balloon_event_ids = []
+        self._sticky_balloon_event_ids = OrderedSet()
         self.hovered_event = None
-        self.selected_event_ids = []
-        self._hidden_category_ids = []
+        self._selected_event_ids = OrderedSet()
+        self._hidden_category_ids = set()
+        self._event_filter = None
         self.period_selection = None
         self.displayed_period = None
         self._event_highlight_counters = {}
@@ -160,6 +175,7 @@ class ViewProperties(Observable):
 
     def change_labels(self, filter_labels_controller):
         self._labels_filter_controller = filter_labels_controller
+        self._event_filter = None
         self._notify()
 
     def get_displayed_period(self):
@@ -167,31 +183,29 @@ class ViewProperties(Observable):
 
     def filter_events(self, events):
         self._all_events = events
-        return [event for event in events if self._is_event_visible(event)]
-
-    def _is_event_visible(self, event):
-        if self._labels_filter_controller:
-            if not self._labels_filter_controller.visible(event):
-                return False
-        if self._hide_events_done and event.get_progress() == 100:
-            return False
-        if event.is_subevent():
-            return (self.is_event_with_category_visible(event.get_category()) and
-                    self.is_event_with_category_visible(event.container.get_category()))
-        else:
-            return self.is_event_with_category_visible(event.get_category())
+        return self._get_event_filter().filter(events)
+
+    def _get_event_filter(self):
+        if self._event_filter is None:
+            self._event_filter = EventFilter(
+                frozenset(self._hidden_category_ids),
+                self._view_cats_individually,
+                self._hide_events_done,
+                self._labels_filter_controller
+            )
+        return self._event_filter
 
     def is_selected(self, event):
-        return event.get_id() in self.selected_event_ids
+        return event.get_id() in self._selected_event_ids
 
     def clear_selected(self):
-        if self.selected_event_ids:
-            self.selected_event_ids = []
+        if self._selected_event_ids.clear():
             self._notify()
 
     def select_all_events(self):
-        self.selected_event_ids = [event.get_id() for event in self._all_events
-                                   if not event.is_container()]
+        self._selected_event_ids = OrderedSet(
+            event.get_id() for event in self._all_events if not event.is_container()
+        )
         self._notify()
 
     def event_is_hovered(self, event):
@@ -199,33 +213,36 @@ class ViewProperties(Observable):
                 event.id == self.hovered_event.id)
 
     def event_has_sticky_balloon(self, event):
-        return event.id in self.sticky_balloon_event_ids
+        return event.id in self._sticky_balloon_event_ids
 
     def set_event_has_sticky_balloon(self, event, has_sticky=True):
-        if has_sticky is True and event.id not in self.sticky_balloon_event_ids:
-            self.sticky_balloon_event_ids.append(event.id)
-        elif has_sticky is False and event.id in self.sticky_balloon_event_ids:
-            self.sticky_balloon_event_ids.remove(event.id)
+        if has_sticky is True:
+            self._sticky_balloon_event_ids.add(event.id)
+        elif has_sticky is False:
+            self._sticky_balloon_event_ids.discard(event.id)
         self._notify()
 
     def set_selected(self, event, is_selected=True):
-        if is_selected is True and not event.get_id() in self.selected_event_ids:
-            self.selected_event_ids.append(event.get_id())
-            self._notify()
-        elif is_selected is False and event.get_id() in self.selected_event_ids:
-            self.selected_event_ids.remove(event.get_id())
-            self._notify()
+        self.set_events_selected([event], is_selected)
 
     def set_all_selected(self, events):
-        for event in events:
-            if not event.get_id() in self.selected_event_ids:
-                self.selected_event_ids.append(event.get_id())
-        self._notify()
+        self.set_events_selected(events)
+
+    def set_events_selected(self, events, is_selected=True):
+        event_ids = [event.get_id() for event in events]
+        if is_selected is True:
+            changed = self._selected_event_ids.update(event_ids)
+        elif is_selected is False:
+            changed = self._selected_event_ids.difference_update(event_ids)
+        else:
+            changed = False
+        if changed:
+            self._notify()
 
     def set_only_selected(self, event, is_selected):
         if is_selected:
-            if self.selected_event_ids != [event.get_id()]:
-                self.selected_event_ids = [event.get_id()]
+            if self._selected_event_ids.to_list() != [event.get_id()]:
+                self._selected_event_ids = OrderedSet([event.get_id()])
                 self._notify()
         else:
             self.clear_selected()
@@ -236,7 +253,15 @@ class ViewProperties(Observable):
             self._notify()
 
     def get_selected_event_ids(self):
-        return self.selected_event_ids[:]
+        return self._selected_event_ids.to_list()
+
+    def get_selected_event_count(self):
+        return len(self._selected_event_ids)
+
+    def get_first_selected_event_id(self):
+        for event_id in self._selected_event_ids:
+            return event_id
+        raise IndexError("No event is selected")
 
     def toggle_category_visibility(self, category):
         self.set_category_visible(category,
@@ -246,21 +271,7 @@ class ViewProperties(Observable):
         return category.get_id() not in self._hidden_category_ids
 
     def is_event_with_category_visible(self, category):
-        if category is None:
-            return True
-        elif self.view_cats_individually:
-            return self.is_category_visible(category)
-        else:
-            return self._is_category_recursively_visible(category)
-
-    def _is_category_recursively_visible(self, category):
-        if self.is_category_visible(category):
-            if category.parent is None:
-                return True
-            else:
-                return self._is_category_recursively_visible(category.parent)
-        else:
-            return False
+        return self._get_event_filter().is_event_with_category_visible(category, {})
 
     def set_categories_visible(self, categories, is_visible=True):
         category_ids = [category.id for category in categories]
@@ -276,7 +287,62 @@ class ViewProperties(Observable):
                 self._hidden_category_ids.remove(category_id)
                 need_notify = True
             elif is_visible is False and category_id not in self._hidden_category_ids:
-                self._hidden_category_ids.append(category_id)
+                self._hidden_category_ids.add(category_id)
                 need_notify = True
         if need_notify:
+            self._event_filter = None
             self._notify()
+
+
+class EventFilter:
+
+    """
+    Decide which events are visible given the visibility settings of a
+    ViewProperties.
+
+    A new filter is created when the settings change. Categories can change
+    in the database without the view properties knowing, so the visibility
+    of a category and its parents is only remembered during one call to
+    filter.
+    """
+
+    def __init__(self, hidden_category_ids, view_cats_individually,
+                 hide_events_done, labels_filter_controller):
+        self._hidden_category_ids = hidden_category_ids
+        self._view_cats_individually = view_cats_individually
+        self._hide_events_done = hide_events_done
+        self._labels_filter_controller = labels_filter_controller
+
+    def filter(self, events):
+        category_visibility = {}
+        return [
+            event
+            for event in events
+            if self._is_event_visible(event, category_visibility)
+        ]
+
+    def _is_event_visible(self, event, category_visibility):
+        if self._labels_filter_controller:
+            if not self._labels_filter_controller.visible(event):
+                return False
+        if self._hide_events_done and event.get_progress() == 100:
+            return False
+        if event.is_subevent():
+            return (self.is_event_with_category_visible(event.get_category(), category_visibility) and
+                    self.is_event_with_category_visible(event.container.get_category(), category_visibility))
+        else:
+            return self.is_event_with_category_visible(event.get_category(), category_visibility)
+
+    def is_event_with_category_visible(self, category, category_visibility):
+        if category is None:
+            return True
+        visible = category_visibility.get(id(category))
+        if visible is None:
+            if category.get_id() in self._hidden_category_ids:
+                visible = False
+            elif self._view_cats_individually or category.parent is None:
+                visible = True
+            else:
+                visible = self.is_event_with_category_visible(category.parent, category_visibility)
+            category_visibility[id(category)] = visible
+        return visible
@@ -0,0 +1,62 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+class RedrawScheduler:
+
+    """
+    Collapses redraw requests into one redraw.
+
+    Without a call_after function every request redraws at once. With one,
+    the first request schedules a redraw with call_after, and requests that
+    come before that redraw has been done are collapsed into it. Collapsed
+    requests are counted in monitoring.
+
+    The redraw is a fast draw only if all collapsed requests asked for one.
+    """
+
+    def __init__(self, redraw_fn, monitoring, call_after=None):
+        self._redraw_fn = redraw_fn
+        self._monitoring = monitoring
+        self._call_after = call_after
+        self._pending = False
+        self._fast_draw = False
+
+    def set_call_after(self, call_after):
+        self.flush()
+        self._call_after = call_after
+
+    def request(self, fast_draw=False):
+        if self._pending:
+            self._fast_draw = self._fast_draw and fast_draw
+            self._monitoring.count_collapsed_redraw()
+        elif self._call_after is None:
+            self._redraw_fn(fast_draw)
+        else:
+            self._pending = True
+            self._fast_draw = fast_draw
+            self._call_after(self.flush)
+
+    def flush(self):
+        """Do a scheduled redraw now instead of later."""
+        if self._pending:
+            self._pending = False
+            self._redraw_fn(self._fast_draw)
+
+    def cancel(self):
+        """Do not do a scheduled redraw."""
+        self._pending = False
@@ -167,7 +167,7 @@ class SVGDrawingAlgorithm:
         return self._draw_vertical_line(self._scene.x_pos_for_time(time), "lightgrey")
 
     def _draw_minor_strip_label(self, strip_period):
-        label = self._scene.minor_strip.label(strip_period.start_time)
+        label = self._scene.get_minor_strip_label(strip_period.start_time)
         x = self._calc_x_for_minor_strip_label(strip_period)
         y = self._calc_y_for_minor_strip_label()
         return self._draw_label(label, x, y, self._small_font_style)
@@ -191,7 +191,7 @@ class SVGDrawingAlgorithm:
         return ShapeBuilder().createLine(x, 0, x, self._scene.height, strokewidth=0.5, stroke=colour)
 
     def _draw_major_strip_label(self, tp):
-        label = self._scene.major_strip.label(tp.start_time, True)
+        label = self._scene.get_major_strip_label(tp.start_time)
         # If the label is not visible when it is positioned in the middle
         # of the period, we move it so that as much of it as possible is
         # visible without crossing strip borders.
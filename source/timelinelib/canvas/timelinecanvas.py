@@ -53,6 +53,7 @@ class TimelineCanvas(wx.Panel):
     def __init__(self, parent):
         wx.Panel.__init__(self, parent, style=wx.NO_BORDER | wx.WANTS_CHARS)
         self._controller = TimelineCanvasController(self)
+        self._controller.set_redraw_call_after(wx.CallAfter)
         self._surface_bitmap = None
         self._create_gui()
         self.SetDividerPosition(50)
@@ -597,6 +598,7 @@ class TimelineCanvas(wx.Panel):
         self.Bind(wx.EVT_ERASE_BACKGROUND, self._on_erase_background)
         self.Bind(wx.EVT_PAINT, self._on_paint)
         self.Bind(wx.EVT_SIZE, self._on_size)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self._on_destroy)
 
     def _on_erase_background(self, event):
         # For double buffering
@@ -612,6 +614,12 @@ class TimelineCanvas(wx.Panel):
     def _on_size(self, evt):
         self._controller.window_resized()
 
+    def _on_destroy(self, evt):
+        # Destroy events of child windows are also sent here
+        if evt.GetEventObject() is self:
+            self._controller.cancel_redraw()
+        evt.Skip()
+
     def HighligtEvent(self, event, clear=False):
         self._controller.add_highlight(event, clear)
         self._highlight_timer.start_highlighting()
@@ -24,6 +24,7 @@ from timelinelib.canvas.drawing import get_drawer
 from timelinelib.canvas.drawing.viewproperties import ViewProperties
 from timelinelib.canvas.eventboxdrawers.defaulteventboxdrawer import DefaultEventBoxDrawer
 from timelinelib.canvas.events import create_timeline_redrawn_event
+from timelinelib.canvas.redrawscheduler import RedrawScheduler
 from timelinelib import DEBUG_ENABLED
 from timelinelib.monitoring import Monitoring
 from timelinelib.wxgui.components.font import Font
@@ -44,21 +45,35 @@ class TimelineCanvasController:
         """
         self.appearance = None
         self.monitoring = Monitoring()
+        self._redraw_scheduler = RedrawScheduler(self._redraw_now, self.monitoring)
+        self._fast_draw = False
         self.view = view
         self._set_drawing_algorithm(drawer)
         self.timeline = None
         self.set_appearance(Appearance())
         self.set_event_box_drawer(DefaultEventBoxDrawer())
         self.set_background_drawer(DefaultBackgroundDrawer())
-        self._fast_draw = False
         self._set_initial_values_to_member_variables()
         self._set_colors_and_styles()
         self._set_search_choises()
 
     @property
     def scene(self):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.scene
 
+    def set_redraw_call_after(self, call_after):
+        """
+        Collapse redraw requests into one redraw that is done with call_after.
+
+        Queries that depend on the drawn scene do a pending redraw first.
+        """
+        self._redraw_scheduler.set_call_after(call_after)
+
+    def cancel_redraw(self):
+        """Do not do a pending redraw, because the view is destroyed."""
+        self._redraw_scheduler.cancel()
+
     def get_appearance(self):
         return self.appearance
 
@@ -154,24 +169,24 @@ class TimelineCanvasController:
         self._redraw_timeline()
 
     def _one_and_only_one_event_selected(self):
-        selected_event_ids = self.view_properties.get_selected_event_ids()
-        nbr_of_selected_event_ids = len(selected_event_ids)
-        return nbr_of_selected_event_ids == 1
+        return self.view_properties.get_selected_event_count() == 1
 
     def _get_first_selected_event(self):
-        selected_event_ids = self.view_properties.get_selected_event_ids()
-        if len(selected_event_ids) > 0:
-            event_id = selected_event_ids[0]
+        if self.view_properties.get_selected_event_count() > 0:
+            event_id = self.view_properties.get_first_selected_event_id()
             return self.timeline.find_event_with_id(event_id)
         return None
 
     def get_time(self, x):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.get_time(x)
 
     def event_with_rect_at(self, x, y, alt_down=False):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.event_with_rect_at(x, y, alt_down)
 
     def event_at(self, x, y, alt_down=False):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.event_at(x, y, alt_down)
 
     def set_selected(self, event, is_selected):
@@ -255,9 +270,11 @@ class TimelineCanvasController:
         return [e for e in events if period.overlaps(e.get_time_period())]
 
     def event_is_period(self, event):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.event_is_period(event.get_time_period())
 
     def snap(self, time):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.snap(time)
 
     def get_selected_events(self):
@@ -266,9 +283,11 @@ class TimelineCanvasController:
         )
 
     def get_events_in_rect(self, rect):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.get_events_in_rect(rect)
 
     def get_hidden_event_count(self):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.get_hidden_event_count()
 
     def increment_font_size(self):
@@ -282,9 +301,11 @@ class TimelineCanvasController:
         return font
 
     def get_closest_overlapping_event(self, event, up):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.get_closest_overlapping_event(event, up=up)
 
     def balloon_at(self, cursor):
+        self._redraw_scheduler.flush()
         return self.drawing_algorithm.balloon_at(*cursor.pos)
 
     def _timeline_changed(self, state_change):
@@ -303,6 +324,11 @@ class TimelineCanvasController:
         self.view.Disable()
 
     def _redraw_timeline(self):
+        fast_draw = self._fast_draw
+        self._fast_draw = False
+        self._redraw_scheduler.request(fast_draw)
+
+    def _redraw_now(self, fast_draw):
 
         def display_monitor_result(dc):
             (width, height) = self.view.GetSize()
@@ -311,6 +337,11 @@ class TimelineCanvasController:
             dc.SetTextForeground((255, 0, 0))
             dc.SetFont(Font(12, weight=wx.FONTWEIGHT_BOLD))
             index, is_in_transaction, history = self.timeline.transactions_status()
+            text_size_cache = self.drawing_algorithm.get_text_size_cache()
+            dc.DrawText("Collapsed redraw requests: %d" % self.monitoring.collapsed_redraw_count,
+                        width - 300, height - 140)
+            dc.DrawText("Text size cache hits/misses: %d/%d" % (text_size_cache.hits, text_size_cache.misses),
+                        width - 300, height - 120)
             dc.DrawText("Undo buffer size: %d" % len(history), width - 300, height - 100)
             dc.DrawText("Undo buffer pos: %d" % index, width - 300, height - 80)
             dc.DrawText("Redraw count: %d" % self.monitoring.timeline_redraw_count, width - 300, height - 60)
@@ -319,12 +350,14 @@ class TimelineCanvasController:
         def fn_draw(dc):
             self.monitoring.timer_start()
             self.drawing_algorithm.set_event_font(self.appearance.get_event_font())
-            self.drawing_algorithm.draw(dc, self.timeline, self.view_properties, self.appearance, fast_draw=self._fast_draw)
+            self.drawing_algorithm.draw(dc, self.timeline, self.view_properties, self.appearance, fast_draw=fast_draw)
             self.monitoring.timer_end()
             if DEBUG_ENABLED:
                 display_monitor_result(dc)
-            self._fast_draw = False
 
+        if not self.view:
+            # The view was destroyed after the redraw was scheduled
+            return
         if self.timeline and self.view_properties.displayed_period:
             self.view_properties.divider_position = (float(self.view.GetDividerPosition()) / 100.0)
             self.view.RedrawSurface(fn_draw)
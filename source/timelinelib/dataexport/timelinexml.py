@@ -17,9 +17,8 @@
 
 
 from xml.sax.saxutils import escape as xmlescape
-import base64
-import io
 
+from timelinelib.db.icons import icon_string
 from timelinelib.db.utils import safe_write
 from timelinelib.meta.version import get_full_version
 
@@ -54,6 +53,9 @@ class Exporter:
 
     def __init__(self, db):
         self.db = db
+        # Ids of the written records in the order they are written. When the
+        # file is read, records get ids 1, 2, 3, ... in this order.
+        self.record_ids = []
 
     def export(self, path):
         safe_write(path, ENCODING, self._write_xml_doc)
@@ -86,6 +88,7 @@ class Exporter:
     _write_categories = wrap_in_tag(_write_categories, "categories", INDENT1)
 
     def _write_category(self, xmlfile, cat):
+        self.record_ids.append(cat.id)
         write_simple_tag(xmlfile, "name", cat.get_name(), INDENT3)
         write_simple_tag(xmlfile, "color", color_string(cat.get_color()), INDENT3)
         write_simple_tag(xmlfile, "progress_color", color_string(cat.get_progress_color()), INDENT3)
@@ -104,6 +107,7 @@ class Exporter:
     _write_events = wrap_in_tag(_write_events, "events", INDENT1)
 
     def _write_event(self, xmlfile, evt):
+        self.record_ids.append(evt.id)
         write_simple_tag(xmlfile, "start",
                          self._time_string(evt.get_time_period().start_time), INDENT3)
         write_simple_tag(xmlfile, "end",
@@ -138,7 +142,9 @@ class Exporter:
         if hyperlink is not None:
             write_simple_tag(xmlfile, "hyperlink", hyperlink, INDENT3)
         if evt.get_data("icon") is not None:
-            icon_text = icon_string(evt.get_data("icon"))
+            icon_text = evt.get_icon_text()
+            if icon_text is None:
+                icon_text = icon_string(evt.get_data("icon"))
             write_simple_tag(xmlfile, "icon", icon_text, INDENT3)
         default_color = evt.get_data("default_color")
         if default_color is not None:
@@ -158,6 +164,7 @@ class Exporter:
     _write_eras = wrap_in_tag(_write_eras, "eras", INDENT1)
 
     def _write_era(self, xmlfile, era):
+        self.record_ids.append(era.id)
         write_simple_tag(xmlfile, "name", era.get_name(), INDENT3)
         write_simple_tag(xmlfile, "start", self._time_string(era.get_time_period().start_time), INDENT3)
         write_simple_tag(xmlfile, "end", self._time_string(era.get_time_period().end_time), INDENT3)
@@ -216,13 +223,6 @@ def color_string(color):
     return "%i,%i,%i" % color[:3]
 
 
-def icon_string(bitmap):
-    stream = io.BytesIO()
-    image = bitmap.ConvertToImage()
-    image.SaveFile(stream, 'image/png')
-    return base64.b64encode(stream.getvalue()).decode()
-
-
 def alert_string(time_type, alert):
     time, text = alert
     time_string = time_type.time_string(time)
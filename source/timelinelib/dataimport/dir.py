@@ -56,6 +56,7 @@ def _load(db, dir_path):
         color_ranges = {}  # Used to color categories
         color_ranges[dir_path] = (0.0, 1.0, 1.0)
         all_cats = []
+        all_events = []
         parents = {}
         for (dirpath, dirnames, filenames) in os.walk(dir_path):
             # Assign color ranges
@@ -75,19 +76,17 @@ def _load(db, dir_path):
             cat = Category().update(dirpath, (233, 233, 233), None, parent=p)
             parents[os.path.normpath(dirpath)] = cat
             all_cats.append(cat)
-            db.save_category(cat)
             for filename in filenames:
                 path_inner = os.path.join(dirpath, filename)
-                evt = _event_from_path(db, path_inner)
-                db.save_event(evt)
-        # Hide all categories but the first
-        db.set_hidden_categories(all_cats[1:])
+                all_events.append(_event_from_path(path_inner, cat))
         # Set colors and change names
         used_names = []
-        for cat in db.get_categories():
+        for cat in all_cats:
             cat.color = _color_from_range(color_ranges[cat.name])
             cat.name = get_unique_cat_name(os.path.basename(cat.name), used_names)
-            db.save_category(cat)
+        db.bulk_load(categories=all_cats, events=all_events)
+        # Hide all categories but the first
+        db.set_hidden_categories(all_cats[1:])
     except Exception as e:
         msg = _("Unable to read from filename '%s'.") % dir_path
         whole_msg = "%s\n\n%s" % (msg, e)
@@ -107,7 +106,7 @@ def get_unique_cat_name(name, used_names):
     return cat_name
 
 
-def _event_from_path(db, file_path):
+def _event_from_path(file_path, category):
     stat = os.stat(file_path)
     # st_atime (time of most recent access),
     # st_mtime (time of most recent content modification),
@@ -119,18 +118,10 @@ def _event_from_path(db, file_path):
     if start_time > end_time:
         start_time, end_time = end_time, start_time
     text = os.path.basename(file_path)
-    category = _category_from_path(db, file_path)
     evt = Event().update(start_time, end_time, text, category)
     return evt
 
 
-def _category_from_path(db, file_path):
-    for cat in db.get_categories():
-        if cat.name == os.path.dirname(file_path):
-            return cat
-    return None
-
-
 def _color_from_range(color_range):
     (rstart, _, b) = color_range
     (r, g, b) = colorsys.hsv_to_rgb(rstart, b, 1)
@@ -129,10 +129,7 @@ class IcsLoader:
             raise TimelineIOError(whole_msg)
 
     def _save_data_in_db(self, db):
-        for event in self.events:
-            db.save_event(event)
-        for category in self.categories:
-            db.save_category(category)
+        db.bulk_load(categories=self.categories, events=self.events)
 
     def _load_vevent(self, db, vevent):
         try:
@@ -17,12 +17,9 @@
 
 
 from os.path import abspath
-import base64
 import re
 import shutil
-import io
-
-import wx
+from xml.etree.ElementTree import iterparse
 
 from timelinelib.calendar.bosparanian.timetype.timetype import BosparanianTimeType
 from timelinelib.calendar.gregorian.timetype import GregorianTimeType
@@ -31,21 +28,17 @@ from timelinelib.calendar.coptic.timetype.timetype import CopticTimeType
 from timelinelib.calendar.pharaonic.timetype.timetype import PharaonicTimeType
 from timelinelib.canvas.data.memorydb.db import MemoryDB
 from timelinelib.canvas.data.exceptions import TimelineIOError
-from timelinelib.canvas.data import Category
 from timelinelib.canvas.data import Container
-from timelinelib.canvas.data import Era
-from timelinelib.canvas.data import Event
 from timelinelib.canvas.data import Subevent
 from timelinelib.canvas.data import TimePeriod
-from timelinelib.canvas.data.milestone import Milestone
+from timelinelib.canvas.data.immutable import ImmutableCategory
+from timelinelib.canvas.data.immutable import ImmutableContainer
+from timelinelib.canvas.data.immutable import ImmutableEra
+from timelinelib.canvas.data.immutable import ImmutableEvent
+from timelinelib.canvas.data.immutable import ImmutableMilestone
+from timelinelib.canvas.drawing.drawers import get_progress_color
+from timelinelib.db.icons import parse_icon_string
 from timelinelib.db.utils import create_non_exising_path
-from timelinelib.general.xmlparser import ANY
-from timelinelib.general.xmlparser import OPTIONAL
-from timelinelib.general.xmlparser import parse
-from timelinelib.general.xmlparser import parse_fn_store
-from timelinelib.general.xmlparser import parse_fn_store_to_list
-from timelinelib.general.xmlparser import SINGLE
-from timelinelib.general.xmlparser import Tag
 from timelinelib.utils import ex_msg
 
 
@@ -65,39 +58,252 @@ class ParseException(Exception):
 
 class Parser:
 
+    """
+    Reads a .timeline file into a db.
+
+    The file is streamed with iterparse and every ``<event>`` (or other child
+    of a section) is handled and thrown away as soon as it has been read.
+    Instead of creating wrappers and saving them one by one, which creates a
+    new version of the immutable db for every item, the immutable records are
+    created directly and saved to the db in one transaction.
+    """
+
     def __init__(self, db, path):
         self.db = db
         self.path = path
+        self._version = None
+        self._category_ids = {}
+        self._hidden_category_names = []
+        self._categories = {}
+        self._eras = {}
+        self._events = {}
+        self._milestones = {}
+        self._containers = {}
         self._containers_by_cid = {}
+        self._subevents = []
+        self._next_sort_order = None
+        # Icons with the same text share one bitmap
+        self._icons_by_text = {}
 
     def parse(self):
-        self._load()
-
-    def _load(self):
         try:
-            # _parse_version will create the rest of the schema dynamically
-            partial_schema = Tag("timeline", SINGLE, None, [
-                Tag("version", SINGLE, self._parse_version)
-            ])
-            tmp_dict = {
-                "partial_schema": partial_schema,
-                "category_map": {},
-                "hidden_categories": [],
-            }
-            parse(self.path, partial_schema, tmp_dict)
+            self._read()
         except Exception as e:
             msg = _("Unable to read timeline data from '%s'.")
             whole_msg = (msg + "\n\n%s") % (abspath(self.path), ex_msg(e))
             raise TimelineIOError(whole_msg)
 
-    def _parse_version(self, text, tmp_dict):
+    def _read(self):
+        self._next_sort_order = self.db.get_max_sort_order() + 1
+        depth = 0
+        section = None
+        for (action, element) in iterparse(self.path, events=("start", "end")):
+            if action == "start":
+                depth += 1
+                if depth == 1 and element.tag != "timeline":
+                    raise ParseException("Expected <timeline> but got <%s>." % element.tag)
+                elif depth == 2:
+                    self._ensure_version_read(element.tag)
+                    section = element
+            else:
+                depth -= 1
+                if depth == 2:
+                    self._parse_section_child(section.tag, element)
+                    section.clear()
+                elif depth == 1:
+                    self._parse_section(element)
+        self._commit()
+        self.db.set_hidden_categories([
+            self.db.get_category_by_id(self._category_ids[name])
+            for name in self._hidden_category_names
+        ])
+
+    def _ensure_version_read(self, tag):
+        if self._version is None and tag != "version":
+            raise ParseException("Expected <version> but got <%s>." % tag)
+
+    def _parse_section(self, element):
+        if element.tag == "version":
+            self._version = self._parse_version_number(_get_text(element))
+        elif element.tag == "timetype":
+            self._parse_timetype(_get_text(element))
+        elif element.tag == "now":
+            self._parse_saved_now(_get_text(element))
+        elif element.tag not in ("eras", "categories", "events", "view"):
+            raise ParseException("Did not expect <%s>." % element.tag)
+
+    def _parse_section_child(self, section_tag, element):
+        if (section_tag, element.tag) == ("events", "event"):
+            self._parse_event_element(element)
+        elif (section_tag, element.tag) == ("categories", "category"):
+            self._parse_category_element(element)
+        elif (section_tag, element.tag) == ("eras", "era"):
+            self._parse_era_element(element)
+        elif (section_tag, element.tag) == ("view", "displayed_period"):
+            fields = _get_fields(element)
+            self.db.set_displayed_period(TimePeriod(
+                self._parse_time(fields["start"]),
+                self._parse_time(fields["end"])
+            ))
+        elif (section_tag, element.tag) == ("view", "hidden_categories"):
+            for child in element:
+                self._get_category_id(_get_text(child))
+                self._hidden_category_names.append(_get_text(child))
+        else:
+            raise ParseException("Did not expect <%s>." % element.tag)
+
+    def _parse_category_element(self, element):
+        fields = _get_fields(element)
+        name = fields["name"]
+        color = parse_color(fields["color"])
+        progress_color = self._parse_optional_color_field(fields, "progress_color")
+        done_color = self._parse_optional_color_field(fields, "done_color")
+        font_color = self._parse_optional_color_field(fields, "font_color")
+        parent_name = fields.get("parent")
+        if parent_name:
+            parent_id = self._category_ids.get(parent_name)
+            if parent_id is None:
+                raise ParseException("Parent category '%s' not found." % parent_name)
+        else:
+            parent_id = None
+        if name in self._category_ids:
+            return
+        id_ = self.db.next_id()
+        self._category_ids[name] = id_
+        self._categories[id_] = ImmutableCategory(
+            name=name,
+            color=color,
+            progress_color=progress_color or get_progress_color(color),
+            done_color=done_color or get_progress_color(color),
+            font_color=font_color or (0, 0, 0),
+            parent_id=parent_id
+        )
+
+    def _parse_era_element(self, element):
+        fields = _get_fields(element)
+        self._eras[self.db.next_id()] = ImmutableEra(
+            name=fields["name"].strip(),
+            time_period=TimePeriod(
+                self._parse_time(fields["start"]),
+                self._parse_time(fields["end"])
+            ),
+            color=parse_color(fields["color"]),
+            ends_today=fields.get("ends_today") == "True"
+        )
+
+    def _parse_event_element(self, element):
+        fields, category_names = _get_event_fields(element)
+        start = self._parse_time(fields["start"])
+        end = self._parse_time(fields["end"])
+        text = fields["text"]
+        category_id, category_ids = self._get_event_category_ids(
+            fields.get("category"),
+            category_names
+        )
+        description = fields.get("description")
+        if _is_container_event(text):
+            cid, text = _extract_container_id(text)
+            id_ = self.db.next_id()
+            container = ImmutableContainer(
+                text=text.strip(),
+                category_id=category_id,
+                category_ids=category_ids,
+                time_period=TimePeriod(start, end),
+                description=description
+            )
+            self._containers[id_] = container
+            self._containers_by_cid[cid] = Container(id_=id_, immutable_value=container)
+            return
+        values = dict(
+            category_id=category_id,
+            category_ids=category_ids,
+            description=description,
+            default_color=parse_color(fields.get("default_color", "200,200,200")),
+        )
+        if not _is_subevent(text) and fields.get("milestone") == "True":
+            id_ = self.db.next_id()
+            self._milestones[id_] = ImmutableMilestone(
+                text=text.strip(),
+                time_period=TimePeriod(start, start),
+                sort_order=self._get_next_sort_order(),
+                **values
+            )
+            return
+        values.update(
+            time_period=TimePeriod(start, end),
+            locked=fields.get("locked") == "True",
+            ends_today=fields.get("ends_today") == "True",
+            labels=fields.get("labels"),
+            icon=self._parse_icon(fields.get("icon")),
+            icon_text=fields.get("icon"),
+            hyperlink=fields.get("hyperlink"),
+            alert=parse_alert_string(self.db.get_time_type(), fields.get("alert")),
+            progress=int(fields.get("progress", 0)),
+        )
+        if _is_subevent(text):
+            cid, text = _extract_subid(text)
+            container = self._containers_by_cid[cid]
+            id_ = self.db.next_id()
+            event = ImmutableEvent(
+                text=text.strip(),
+                container_id=container.id,
+                sort_order=self._get_next_sort_order(),
+                **values
+            )
+            subevent = Subevent(id_=id_, immutable_value=event)
+            subevent.container = container
+            self._subevents.append(subevent)
+        else:
+            if _text_starts_with_added_space(text):
+                text = _remove_added_space(text)
+            id_ = self.db.next_id()
+            event = ImmutableEvent(
+                text=text.strip(),
+                fuzzy=fields.get("fuzzy") == "True",
+                sort_order=self._get_next_sort_order(),
+                **values
+            )
+        self._events[id_] = event
+
+    def _get_event_category_ids(self, category_name, category_names):
+        if category_name is None:
+            category_id = None
+        else:
+            category_id = self._get_category_id(category_name)
+        category_ids = {}
+        # Remove duplicates but preserve order
+        for name in dict.fromkeys(category_names):
+            id_ = self._get_category_id(name)
+            if category_id is None:
+                category_id = id_
+            elif id_ != category_id:
+                category_ids[id_] = None
+        return category_id, category_ids
+
+    def _get_category_id(self, name):
+        id_ = self._category_ids.get(name)
+        if id_ is None:
+            raise ParseException("Category '%s' not found." % name)
+        return id_
+
+    def _get_next_sort_order(self):
+        sort_order = self._next_sort_order
+        self._next_sort_order += 1
+        return sort_order
+
+    def _parse_optional_color_field(self, fields, name):
+        if name in fields:
+            return parse_color(fields[name])
+        else:
+            return None
+
+    def _parse_version_number(self, text):
         match = re.search(r"^(\d+).(\d+).(\d+)(.*)$", text)
         if match:
             (x, y, z) = (int(match.group(1)), int(match.group(2)),
                          int(match.group(3)))
             self._backup((x, y, z))
-            tmp_dict["version"] = (x, y, z)
-            self._create_rest_of_schema(tmp_dict)
+            return (x, y, z)
         else:
             raise ParseException("Could not parse version number from '%s'."
                                  % text)
@@ -108,71 +314,7 @@ class Parser:
             shutil.copy(self.path,
                         create_non_exising_path(self.path, "pre100bak"))
 
-    def _create_rest_of_schema(self, tmp_dict):
-        """
-        Ensure all versions of the xml format can be parsed with this schema.
-
-        tmp_dict["version"] can be used to create different schemas depending
-        on the version.
-        """
-        tmp_dict["partial_schema"].add_child_tags([
-            Tag("timetype", OPTIONAL, self._parse_timetype),
-            Tag("eras", OPTIONAL, None, [
-                Tag("era", ANY, self._parse_era, [
-                    Tag("name", SINGLE, parse_fn_store("tmp_name")),
-                    Tag("start", SINGLE, parse_fn_store("tmp_start")),
-                    Tag("end", SINGLE, parse_fn_store("tmp_end")),
-                    Tag("color", SINGLE, parse_fn_store("tmp_color")),
-                    Tag("ends_today", OPTIONAL, parse_fn_store("tmp_ends_today")),
-                ])
-            ]),
-            Tag("categories", SINGLE, None, [
-                Tag("category", ANY, self._parse_category, [
-                    Tag("name", SINGLE, parse_fn_store("tmp_name")),
-                    Tag("color", SINGLE, parse_fn_store("tmp_color")),
-                    Tag("progress_color", OPTIONAL, parse_fn_store("tmp_progress_color")),
-                    Tag("done_color", OPTIONAL, parse_fn_store("tmp_done_color")),
-                    Tag("font_color", OPTIONAL, parse_fn_store("tmp_font_color")),
-                    Tag("parent", OPTIONAL, parse_fn_store("tmp_parent")),
-                ])
-            ]),
-            Tag("events", SINGLE, None, [
-                Tag("event", ANY, self._parse_event, [
-                    Tag("start", SINGLE, parse_fn_store("tmp_start")),
-                    Tag("end", SINGLE, parse_fn_store("tmp_end")),
-                    Tag("text", SINGLE, parse_fn_store("tmp_text")),
-                    Tag("progress", OPTIONAL, parse_fn_store("tmp_progress")),
-                    Tag("fuzzy", OPTIONAL, parse_fn_store("tmp_fuzzy")),
-                    Tag("locked", OPTIONAL, parse_fn_store("tmp_locked")),
-                    Tag("ends_today", OPTIONAL, parse_fn_store("tmp_ends_today")),
-                    Tag("category", OPTIONAL, parse_fn_store("tmp_category")),
-                    Tag("categories", OPTIONAL, None, [
-                        Tag("category", ANY, parse_fn_store_to_list("tmp_categories"))
-                    ]),
-                    Tag("description", OPTIONAL, parse_fn_store("tmp_description")),
-                    Tag("labels", OPTIONAL, parse_fn_store("tmp_labels")),
-                    Tag("alert", OPTIONAL, parse_fn_store("tmp_alert")),
-                    Tag("hyperlink", OPTIONAL, parse_fn_store("tmp_hyperlink")),
-                    Tag("icon", OPTIONAL, parse_fn_store("tmp_icon")),
-                    Tag("default_color", OPTIONAL, parse_fn_store("tmp_default_color")),
-                    Tag("milestone", OPTIONAL, parse_fn_store("tmp_milestone")),
-                ])
-            ]),
-            Tag("view", SINGLE, None, [
-                Tag("displayed_period", OPTIONAL,
-                    self._parse_displayed_period, [
-                        Tag("start", SINGLE, parse_fn_store("tmp_start")),
-                        Tag("end", SINGLE, parse_fn_store("tmp_end")),
-                    ]),
-                Tag("hidden_categories", OPTIONAL,
-                    self._parse_hidden_categories, [
-                        Tag("name", ANY, self._parse_hidden_category),
-                    ]),
-            ]),
-            Tag("now", OPTIONAL, self._parse_saved_now),
-        ])
-
-    def _parse_timetype(self, text, tmp_dict):
+    def _parse_timetype(self, text):
         self.db.set_time_type(None)
         valid_time_types = (GregorianTimeType(), BosparanianTimeType(), NumTimeType(), CopticTimeType(), PharaonicTimeType())
         for timetype in valid_time_types:
@@ -182,183 +324,89 @@ class Parser:
         if self.db.get_time_type() is None:
             raise ParseException("Invalid timetype '%s' found." % text)
 
-    def _parse_category(self, text, tmp_dict):
-        name = tmp_dict.pop("tmp_name")
-        color = parse_color(tmp_dict.pop("tmp_color"))
-        progress_color = self._parse_optional_color(tmp_dict, "tmp_progress_color", None)
-        done_color = self._parse_optional_color(tmp_dict, "tmp_done_color", None)
-        font_color = self._parse_optional_color(tmp_dict, "tmp_font_color")
-        parent_name = tmp_dict.pop("tmp_parent", None)
-        if parent_name:
-            parent = tmp_dict["category_map"].get(parent_name, None)
-            if parent is None:
-                raise ParseException("Parent category '%s' not found." % parent_name)
-        else:
-            parent = None
-        category = Category().update(name, color, font_color, parent=parent)
-        if progress_color:
-            category.set_progress_color(progress_color)
-        if done_color:
-            category.set_done_color(done_color)
-        old_category = self.db.get_category_by_name(name)
-        if old_category is not None:
-            category = old_category
-        if name not in tmp_dict["category_map"]:
-            tmp_dict["category_map"][name] = category
-            self.db.save_category(category)
-
-    def _parse_event(self, text, tmp_dict):
-        start = self._parse_time(tmp_dict.pop("tmp_start"))
-        end = self._parse_time(tmp_dict.pop("tmp_end"))
-        text = tmp_dict.pop("tmp_text")
-        progress = self._parse_optional_int(tmp_dict, "tmp_progress")
-        fuzzy = self._parse_optional_bool(tmp_dict, "tmp_fuzzy")
-        locked = self._parse_optional_bool(tmp_dict, "tmp_locked")
-        ends_today = self._parse_optional_bool(tmp_dict, "tmp_ends_today")
-        category_text = tmp_dict.pop("tmp_category", None)
-        if category_text is None:
-            category = None
-        else:
-            category = self.get_category(tmp_dict, category_text)
-        categories = []
-        if "tmp_categories" in tmp_dict:
-            # Remove duplicates but preserve order
-            dic = {k: 0 for k in tmp_dict.pop("tmp_categories", None)}
-            for category_text in dic:
-                if category_text is not None:
-                    cat = self.get_category(tmp_dict, category_text)
-                    if category is None:
-                        category = cat
-                    else:
-                        categories.append(cat)
-        description = tmp_dict.pop("tmp_description", None)
-        labels =  tmp_dict.pop("tmp_labels", None)
-        alert_string = tmp_dict.pop("tmp_alert", None)
-        alert = parse_alert_string(self.db.get_time_type(), alert_string)
-        icon_text = tmp_dict.pop("tmp_icon", None)
+    def _parse_saved_now(self, text):
+        time = self.db.time_type.parse_time(text)
+        self.db.set_saved_now(time)
+
+    def _parse_time(self, time_string):
+        return self.db.get_time_type().parse_time(time_string)
+
+    def _parse_icon(self, icon_text):
         if icon_text is None:
-            icon = None
-        else:
-            icon = parse_icon(icon_text)
-        hyperlink = tmp_dict.pop("tmp_hyperlink", None)
-        milestone = self._parse_optional_bool(tmp_dict, "tmp_milestone")
-        if self._is_container_event(text):
-            cid, text = self._extract_container_id(text)
-            event = Container().update(start, end, text, category)
-            self._containers_by_cid[cid] = event
-        elif self._is_subevent(text):
-            cid, text = self._extract_subid(text)
-            event = Subevent().update(
-                start,
-                end,
-                text,
-                category,
-                locked=locked,
-                ends_today=ends_today
+            return None
+        if icon_text not in self._icons_by_text:
+            self._icons_by_text[icon_text] = parse_icon(icon_text)
+        return self._icons_by_text[icon_text]
+
+    def _commit(self):
+        # The container strategy might have moved subevents that were read
+        # before the last subevent in the same container
+        for subevent in self._subevents:
+            self._events[subevent.id] = self._events[subevent.id].update(
+                time_period=subevent.get_time_period()
+            )
+        with self.db.transaction("Load timeline") as t:
+            t.load(
+                categories=self._categories,
+                eras=self._eras,
+                events=self._events,
+                milestones=self._milestones,
+                containers=self._containers
             )
-            event.container = self._containers_by_cid[cid]
-        elif milestone:
-            event = Milestone().update(start, start, text)
-            event.set_category(category)
-        else:
-            if self._text_starts_with_added_space(text):
-                text = self._remove_added_space(text)
-            event = Event().update(start, end, text, category, fuzzy, locked, ends_today)
-        if categories:
-            event.set_categories(categories)
-        default_color = tmp_dict.pop("tmp_default_color", "200,200,200")
-        event.set_data("description", description)
-        event.set_data("labels", labels)
-        event.set_data("icon", icon)
-        event.set_data("alert", alert)
-        event.set_data("hyperlink", hyperlink)
-        event.set_data("progress", int(progress))
-        event.set_data("default_color", parse_color(default_color))
-        self.db.save_event(event)
-
-    def get_category(self, tmp_dict, category_text):
-        cat = tmp_dict["category_map"].get(category_text, None)
-        if cat is None:
-            raise ParseException("Category '%s' not found." % category_text)
-        return cat
-
-    def _parse_era(self, text, tmp_dict):
-        name = tmp_dict.pop("tmp_name")
-        start = self._parse_time(tmp_dict.pop("tmp_start"))
-        end = self._parse_time(tmp_dict.pop("tmp_end"))
-        color = parse_color(tmp_dict.pop("tmp_color"))
-        ends_today = self._parse_optional_bool(tmp_dict, "tmp_ends_today")
-        era = Era().update(start, end, name, color)
-        era.set_ends_today(ends_today)
-        self.db.save_era(era)
-
-    def _text_starts_with_added_space(self, text):
-        return text[0:2] in (" (", " [")
-
-    def _remove_added_space(self, text):
-        return text[1:]
-
-    def _is_container_event(self, text):
-        return text.startswith("[")
-
-    def _is_subevent(self, text):
-        return text.startswith("(")
-
-    def _extract_container_id(self, text):
-        str_id, text = text.split("]", 1)
-        try:
-            str_id = str_id[1:]
-            cid = int(str_id)
-        except:
-            cid = -1
-        return cid, text
 
-    def _extract_subid(self, text):
-        cid, text = text.split(")", 1)
-        try:
-            cid = int(cid[1:])
-        except:
-            cid = -1
-        return cid, text
 
-    def _parse_optional_bool(self, tmp_dict, cid):
-        if cid in tmp_dict:
-            return tmp_dict.pop(cid) == "True"
-        else:
-            return False
+def _is_container_event(text):
+    return text.startswith("[")
 
-    def _parse_optional_int(self, tmp_dict, cid):
-        if cid in tmp_dict:
-            return int(tmp_dict.pop(cid))
-        else:
-            return 0
 
-    def _parse_optional_color(self, tmp_dict, cid, missing_value=(0, 0, 0)):
-        if cid in tmp_dict:
-            return parse_color(tmp_dict.pop(cid))
-        else:
-            return missing_value
+def _is_subevent(text):
+    return text.startswith("(")
 
-    def _parse_displayed_period(self, text, tmp_dict):
-        start = self._parse_time(tmp_dict.pop("tmp_start"))
-        end = self._parse_time(tmp_dict.pop("tmp_end"))
-        self.db.set_displayed_period(TimePeriod(start, end))
 
-    def _parse_hidden_category(self, text, tmp_dict):
-        category = tmp_dict["category_map"].get(text, None)
-        if category is None:
-            raise ParseException("Category '%s' not found." % text)
-        tmp_dict["hidden_categories"].append(category)
+def _extract_container_id(text):
+    str_id, text = text.split("]", 1)
+    try:
+        str_id = str_id[1:]
+        cid = int(str_id)
+    except:
+        cid = -1
+    return cid, text
 
-    def _parse_hidden_categories(self, text, tmp_dict):
-        self.db.set_hidden_categories(tmp_dict.pop("hidden_categories"))
 
-    def _parse_time(self, time_string):
-        return self.db.get_time_type().parse_time(time_string)
+def _extract_subid(text):
+    cid, text = text.split(")", 1)
+    try:
+        cid = int(cid[1:])
+    except:
+        cid = -1
+    return cid, text
 
-    def _parse_saved_now(self, text, tmp_dict):
-        time = self.db.time_type.parse_time(text)
-        self.db.set_saved_now(time)
+
+def _text_starts_with_added_space(text):
+    return text[0:2] in (" (", " [")
+
+
+def _remove_added_space(text):
+    return text[1:]
+
+
+def _get_text(element):
+    return element.text or ""
+
+
+def _get_fields(element):
+    return {child.tag: _get_text(child) for child in element}
+
+
+def _get_event_fields(element):
+    fields = {}
+    category_names = []
+    for child in element:
+        if child.tag == "categories":
+            category_names.extend(_get_text(category) for category in child)
+        else:
+            fields[child.tag] = _get_text(child)
+    return fields, category_names
 
 
 def parse_color(color_string):
@@ -390,10 +438,7 @@ def parse_icon(bitmap_string):
     Return a wx.Bitmap.
     """
     try:
-        stream = io.BytesIO(base64.b64decode(bitmap_string.encode()))
-        stream.seek(0, 0)
-        image = wx.Image(stream)
-        return image.ConvertToBitmap()
+        return parse_icon_string(bitmap_string)
     except TypeError as e:
         raise ParseException("Could not parse icon from '%s'." % bitmap_string)
 
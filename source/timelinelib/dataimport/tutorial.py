@@ -53,6 +53,11 @@ class TutorialTimelineCreator:
         self.start, self.end = self.get_start_end()
         self.db.set_displayed_period(TimePeriod(self.start, self.end))
         self.last_cat = None
+        self.categories = []
+        self.events = []
+        self.milestones = []
+        self.eras = []
+        self.containers = []
 
     def add_category(self, name, color, font_color, make_last_added_parent=False):
         if make_last_added_parent:
@@ -65,18 +70,19 @@ class TutorialTimelineCreator:
             color=color,
             font_color=font_color,
             parent=parent
-        ).save()
+        )
+        self.categories.append(self.last_cat)
 
     def add_milestone(self, time_add, text, label):
         start, end = self._calc_start_end(time_add, time_add)
-        self.db.new_milestone(
+        self.milestones.append(self.db.new_milestone(
             description=text
-        ).update(start, start, label).save()
+        ).update(start, start, label))
 
     def add_era(self, start_add, end_add, name):
         start, end = self._calc_start_end(start_add, end_add)
-        self.db.new_era(
-        ).update(start, end, name, color=(250, 250, 230)).save()
+        self.eras.append(self.db.new_era(
+        ).update(start, end, name, color=(250, 250, 230)))
 
     def add_event(self, text, description, start_add, end_add=None, hyperlink=None):
         start, end = self._calc_start_end(start_add, end_add)
@@ -86,13 +92,15 @@ class TutorialTimelineCreator:
         if hyperlink:
             event.set_hyperlink(hyperlink)
         event.set_default_color((200, 200, 200))
-        event.save()
+        self.events.append(event)
         return event
 
     def add_container(self, text, description, start_add, end_add=None):
         start, end = self._calc_start_end(start_add, end_add)
-        return self.db.new_container(
-        ).update(start, end, text, self.prev_cat).save()
+        container = self.db.new_container(
+        ).update(start, end, text, self.prev_cat)
+        self.containers.append(container)
+        return container
 
     def add_subevent(self, container, text, description, start_add, end_add=None, hyperlink=None):
         start, end = self._calc_start_end(start_add, end_add)
@@ -104,9 +112,16 @@ class TutorialTimelineCreator:
             event.set_data("description", description)
         if hyperlink:
             event.set_hyperlink(hyperlink)
-        event.save()
+        self.events.append(event)
 
     def get_db(self):
+        self.db.bulk_load(
+            categories=self.categories,
+            events=self.events,
+            milestones=self.milestones,
+            eras=self.eras,
+            containers=self.containers
+        )
         self.db.clear_transactions()
         return self.db
 
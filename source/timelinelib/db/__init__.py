@@ -81,11 +81,37 @@ def db_open_timeline(path, timetype=None):
         return db_open_newtype_timeline(path, timetype)
 
 
+def db_read_timeline(path):
+    """
+    Read the timeline file and its journal without opening them for saving.
+
+    Nothing is written and no dialogs are shown. This is used to see what
+    someone else has saved.
+    """
+    from timelinelib.dataimport.timelinexml import import_db_from_timeline_xml
+    from timelinelib.db.journal import Journal
+    db = import_db_from_timeline_xml(path)
+    Journal(db, path).replay(move_orphan=False)
+    return db
+
+
 def db_open_newtype_timeline(path, timetype=None):
+    from timelinelib.db.journal import Journal
     if os.path.exists(path):
         from timelinelib.dataimport.timelinexml import import_db_from_timeline_xml
         db = import_db_from_timeline_xml(path)
-        if dir_is_read_only(path):
+        journal = Journal(db, path)
+        read_only = dir_is_read_only(path)
+        # A journal can't be moved aside in a read-only directory
+        journal.replay(move_orphan=not read_only)
+        if journal.get_orphan_path() is not None:
+            from timelinelib.wxgui.utils import display_warning_message
+            display_warning_message(
+                _("The journal of '%s' does not belong to this version of the file and was not applied.") % path +
+                "\n\n" +
+                _("It was moved to '%s'.") % journal.get_orphan_path()
+            )
+        if read_only:
             from timelinelib.wxgui.utils import display_warning_message
             db.set_readonly()
             display_warning_message(_("Since the directory of the Timeline file is not writable,\nthe timeline is opened in read-only mode"))
@@ -98,15 +124,44 @@ def db_open_newtype_timeline(path, timetype=None):
             db.set_time_type(GregorianTimeType())
         else:
             db.set_time_type(timetype)
+        journal = Journal(db, path)
+
+    writer = create_background_writer(journal.compact)
 
     def save_callback():
-        from timelinelib.dataexport.timelinexml import export_db_to_timeline_xml
-        export_db_to_timeline_xml(db, path)
+        from timelinelib.db.icons import icon_string
+        from timelinelib.features.experimental.experimentalfeatures import BACKGROUND_SAVE
+        from timelinelib.features.experimental.experimentalfeatures import JOURNAL_SAVE
+        db.store_icon_texts(icon_string)
+        if JOURNAL_SAVE.enabled():
+            writer.flush()
+            journal.save()
+        elif BACKGROUND_SAVE.enabled():
+            writer.write(db.create_snapshot())
+        else:
+            writer.flush()
+            journal.compact()
+
+    def close_callback():
+        writer.close()
+        journal.close()
     db.register_save_callback(save_callback)
+    db.register_close_callback(close_callback)
+    db.register_background_writer(writer)
     db.set_should_lock(True)
     return db
 
 
+def create_background_writer(write_fn):
+    import wx
+    from timelinelib.db.backgroundwriter import BackgroundWriter
+    from timelinelib.wxgui.utils import display_error_message
+
+    def report_error(e):
+        display_error_message(str(e))
+    return BackgroundWriter(write_fn, wx.CallAfter, report_error)
+
+
 def dir_is_read_only(path):
     try:
         testfile = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path)))
@@ -0,0 +1,120 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Writing of db snapshots on a background thread.
+
+Records in the db are immutable, so a snapshot of the db can be written on
+another thread while the db changes. Snapshots that are given while another
+one is being written replace each other, so that only the latest one is
+written when the thread is done.
+"""
+
+
+import threading
+
+
+class BackgroundWriter:
+
+    def __init__(self, write_fn, call_after_fn, report_error_fn):
+        """
+        write_fn is called with a snapshot on the background thread.
+
+        call_after_fn is used to call functions on the thread that gives the
+        snapshots, for example wx.CallAfter. Errors from write_fn are reported
+        that way to report_error_fn.
+        """
+        self._write_fn = write_fn
+        self._call_after_fn = call_after_fn
+        self._report_error_fn = report_error_fn
+        self._condition = threading.Condition()
+        self._pending_snapshot = None
+        self._writing = False
+        self._closed = False
+        self._when_written_fns = []
+        self._thread = None
+
+    def write(self, snapshot):
+        with self._condition:
+            self._pending_snapshot = snapshot
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="BackgroundWriter",
+                    daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def when_written(self, fn):
+        """Call fn when all snapshots given so far have been written."""
+        with self._condition:
+            if self._is_busy() or self._when_written_fns:
+                self._when_written_fns.append(fn)
+                return
+        fn()
+
+    def flush(self):
+        """Wait until all snapshots have been written."""
+        with self._condition:
+            while self._is_busy():
+                self._condition.wait()
+        self._call_when_written_fns()
+
+    def close(self):
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join()
+
+    def _is_busy(self):
+        return self._pending_snapshot is not None or self._writing
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending_snapshot is None and not self._closed:
+                    self._condition.wait()
+                if self._pending_snapshot is None:
+                    return
+                snapshot = self._pending_snapshot
+                self._pending_snapshot = None
+                self._writing = True
+            try:
+                self._write_fn(snapshot)
+            except Exception as e:
+                self._call_after_fn(self._report_error_fn, e)
+            with self._condition:
+                self._writing = False
+                done = not self._is_busy()
+                self._condition.notify_all()
+            if done:
+                self._call_after_fn(self._call_when_written_fns)
+
+    def _call_when_written_fns(self):
+        with self._condition:
+            if self._is_busy():
+                return
+            fns = self._when_written_fns
+            self._when_written_fns = []
+        for fn in fns:
+            fn()
@@ -0,0 +1,66 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Conversion of icons between bitmaps and the base64 encoded PNG images they
+are saved as.
+
+Encoding a bitmap as PNG is slow. Event records keep the text of their icon
+in their icon_text field, both when the icon was read from a file and when
+it was set from an image, so icons are not encoded again when the timeline
+is saved.
+"""
+
+
+import base64
+import io
+
+import wx
+
+
+def icon_string(bitmap):
+    return _encode_image(bitmap.ConvertToImage())
+
+
+def image_to_icon(image):
+    """
+    Return the bitmap and the icon string of an image.
+
+    The icon string should be set on the event together with the bitmap so
+    that it does not have to be encoded again when the event is saved.
+    """
+    return (image.ConvertToBitmap(), _encode_image(image))
+
+
+def parse_icon_string(text):
+    stream = io.BytesIO(base64.b64decode(text.encode()))
+    return wx.Image(stream).ConvertToBitmap()
+
+
+def record_icon_string(record):
+    """Return the icon string of an event record that has an icon."""
+    if record.icon_text is None:
+        return icon_string(record.icon)
+    else:
+        return record.icon_text
+
+
+def _encode_image(image):
+    stream = io.BytesIO()
+    image.SaveFile(stream, "image/png")
+    return base64.b64encode(stream.getvalue()).decode()
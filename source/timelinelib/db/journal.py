@@ -0,0 +1,379 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Saving of a timeline as a journal of changes next to the timeline file.
+
+Writing the whole timeline file after every change is slow for large
+timelines. Instead, the records that changed since the previous save are
+appended as one line of JSON to the journal file. When the timeline is
+opened, the changes in the journal are applied after the timeline file has
+been read. The journal is compacted by writing the whole timeline file and
+removing the journal.
+
+Records are identified in the journal by the ids they get when the timeline
+file is read. Those are the same as the ids in the db until the journal is
+compacted. After that, ids are translated to the order in which the records
+were written to the timeline file.
+
+The first line of the journal identifies the timeline file it belongs to. If
+the timeline file is written without the journal, for example by an older
+version of Timeline, the journal is moved aside to <file>.journal.orphanN
+instead of being applied.
+"""
+
+
+import json
+import os
+
+from timelinelib.canvas.data import TimePeriod
+from timelinelib.canvas.data.exceptions import TimelineIOError
+from timelinelib.canvas.data.immutable import ImmutableCategory
+from timelinelib.canvas.data.immutable import ImmutableContainer
+from timelinelib.canvas.data.immutable import ImmutableEra
+from timelinelib.canvas.data.immutable import ImmutableEvent
+from timelinelib.canvas.data.immutable import ImmutableMilestone
+from timelinelib.dataexport.timelinexml import Exporter
+from timelinelib.dataexport.timelinexml import alert_string
+from timelinelib.dataimport.timelinexml import parse_alert_string
+from timelinelib.dataimport.timelinexml import parse_icon
+from timelinelib.db.icons import record_icon_string
+from timelinelib.db.utils import create_non_exising_path
+
+
+JOURNAL_SUFFIX = ".journal"
+ORPHAN_SUFFIX = "orphan"
+MAX_ENTRIES = 500
+RECORD_TYPES = {
+    "categories": ImmutableCategory,
+    "containers": ImmutableContainer,
+    "events": ImmutableEvent,
+    "milestones": ImmutableMilestone,
+    "eras": ImmutableEra,
+}
+ID_FIELDS = ("category_id", "parent_id", "container_id")
+COLOR_FIELDS = ("color", "progress_color", "done_color", "font_color", "default_color")
+
+
+def get_journal_path(path):
+    return path + JOURNAL_SUFFIX
+
+
+class Journal:
+
+    def __init__(self, db, path):
+        self._db = db
+        self._path = path
+        self._journal_path = get_journal_path(path)
+        self._entry_count = 0
+        self._header_written = False
+        self._must_compact = False
+        self._file_ids = None
+        self._next_file_id = None
+        self._orphan_path = None
+        self._base = self._get_base()
+        self._mark_saved()
+
+    def replay(self, move_orphan=True):
+        """
+        Apply the changes in the journal to the db.
+
+        Must be called right after the timeline file has been read, since the
+        journal refers to records by the ids they get then. If move_orphan is
+        False, a journal that does not belong to the timeline file is left
+        where it is.
+        """
+        entries = self._read_entries(move_orphan)
+        if not entries:
+            return
+        view = None
+        max_id = 0
+        try:
+            with self._db.transaction("Replay journal") as t:
+                for entry in entries:
+                    t.unload(**entry.get("delete", {}))
+                    put = {
+                        name: {
+                            int(id_): self._decode_record(name, fields)
+                            for (id_, fields) in records.items()
+                        }
+                        for (name, records) in entry.get("put", {}).items()
+                    }
+                    t.load(**put)
+                    for records in put.values():
+                        max_id = max([max_id] + list(records))
+                    view = entry.get("view", view)
+            if view is not None:
+                self._apply_view(view)
+        except Exception as e:
+            raise TimelineIOError(
+                _("Unable to read journal '%s'.") % self._journal_path +
+                "\n\n" + str(e)
+            )
+        self._db.reserve_ids(max_id)
+        self._db.clear_transactions()
+        self._entry_count = len(entries)
+        self._mark_saved()
+
+    def save(self):
+        """Append the changes since the previous save to the journal."""
+        if (not os.path.exists(self._path) or
+                self._must_compact or
+                self._entry_count >= MAX_ENTRIES or
+                self._get_base() != self._base):
+            self.compact()
+            return
+        entry = self._create_entry()
+        if entry:
+            self._append(entry)
+            self._mark_saved()
+
+    def compact(self, snapshot=None):
+        """
+        Write the whole timeline file and remove the journal.
+
+        If a snapshot of the db is given, it is written instead of the db.
+        Only the snapshot is read then, so this can run on another thread
+        while the db changes.
+        """
+        if snapshot is None:
+            snapshot = self._db
+        exporter = Exporter(snapshot)
+        exporter.export(self._path)
+        if os.path.exists(self._journal_path):
+            os.remove(self._journal_path)
+        self._file_ids = {
+            id_: index + 1
+            for (index, id_) in enumerate(exporter.record_ids)
+        }
+        self._next_file_id = len(exporter.record_ids) + 1
+        self._entry_count = 0
+        self._header_written = False
+        self._must_compact = False
+        self._base = self._get_base()
+        self._mark_saved(snapshot)
+
+    def get_orphan_path(self):
+        """
+        Return the path that a journal that did not belong to the timeline
+        file was moved to, or None if there was no such journal.
+        """
+        return self._orphan_path
+
+    def close(self):
+        if self._entry_count > 0 or self._must_compact:
+            self.compact()
+
+    def _mark_saved(self, db=None):
+        if db is None:
+            db = self._db
+        self._saved_db = db.get_immutable_db()
+        self._saved_view = self._get_view(db)
+
+    def _read_entries(self, move_orphan):
+        try:
+            with open(self._journal_path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []
+        if not lines:
+            return []
+        if not self._header_matches(lines[0]):
+            if move_orphan:
+                self._move_aside()
+            return []
+        self._header_written = True
+        entries = []
+        for (index, line) in enumerate(lines[1:], start=1):
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                if index < len(lines) - 1:
+                    raise TimelineIOError(
+                        _("Unable to read journal '%s'.") % self._journal_path
+                    )
+                # Timeline stopped while writing the last entry. Appending
+                # after it is not possible, so the journal must be compacted.
+                self._must_compact = True
+        return entries
+
+    def _header_matches(self, line):
+        try:
+            return json.loads(line) == self._create_header()
+        except ValueError:
+            return False
+
+    def _move_aside(self):
+        # The entries can't be applied to this timeline file, but they must
+        # not be overwritten either, so that they can be recovered by hand.
+        self._orphan_path = create_non_exising_path(self._journal_path, ORPHAN_SUFFIX)
+        os.rename(self._journal_path, self._orphan_path)
+
+    def _append(self, entry):
+        if not self._header_written and os.path.exists(self._journal_path):
+            self._move_aside()
+        try:
+            with open(self._journal_path, "a" if self._header_written else "w", encoding="utf-8") as f:
+                if not self._header_written:
+                    f.write(json.dumps(self._create_header()) + "\n")
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except IOError as e:
+            raise TimelineIOError(
+                _("Unable to save timeline data to '%s'.") % self._journal_path +
+                "\n\n" + str(e)
+            )
+        self._header_written = True
+        self._entry_count += 1
+        self._base = self._get_base()
+
+    def _get_base(self):
+        # Someone else has saved the timeline if this changes. The journal
+        # then no longer matches what is saved, so it must be compacted.
+        if not os.path.exists(self._path):
+            return None
+        try:
+            journal_size = os.path.getsize(self._journal_path)
+        except OSError:
+            journal_size = None
+        return (self._create_header(), journal_size)
+
+    def _create_header(self):
+        stat = os.stat(self._path)
+        return {"base": [stat.st_size, stat.st_mtime_ns]}
+
+    def _create_entry(self):
+        new_db = self._db.get_immutable_db()
+        put = {}
+        delete = {}
+        for name in RECORD_TYPES:
+            old_records = getattr(self._saved_db, name)
+            new_records = getattr(new_db, name)
+            if old_records is new_records:
+                continue
+            changed = {
+                str(self._get_file_id(id_)): self._encode_record(record)
+                for (id_, record) in new_records
+                if old_records.get(id_) is not record
+            }
+            if changed:
+                put[name] = changed
+            deleted = [
+                self._get_file_id(id_)
+                for (id_, _) in old_records
+                if id_ not in new_records
+            ]
+            if deleted:
+                delete[name] = deleted
+        entry = {}
+        if delete:
+            entry["delete"] = delete
+        if put:
+            entry["put"] = put
+        view = self._get_view(self._db)
+        if view != self._saved_view:
+            entry["view"] = self._encode_view(view)
+        return entry
+
+    def _get_file_id(self, id_):
+        if self._file_ids is None or id_ is None:
+            return id_
+        if id_ not in self._file_ids:
+            self._file_ids[id_] = self._next_file_id
+            self._next_file_id += 1
+        return self._file_ids[id_]
+
+    def _get_view(self, db):
+        return (
+            db.get_displayed_period(),
+            tuple(category.id for category in db.get_hidden_categories())
+        )
+
+    def _encode_view(self, view):
+        (displayed_period, hidden_category_ids) = view
+        return {
+            "displayed_period": self._encode_field("time_period", displayed_period),
+            "hidden_category_ids": [self._get_file_id(id_) for id_ in hidden_category_ids],
+        }
+
+    def _apply_view(self, view):
+        self._db.set_displayed_period(
+            self._decode_field("time_period", view["displayed_period"])
+        )
+        self._db.set_hidden_categories([
+            self._db.get_category_by_id(id_)
+            for id_ in view["hidden_category_ids"]
+        ])
+
+    def _encode_record(self, record):
+        fields = {
+            name: self._encode_field(name, value)
+            for (name, value) in record
+            if name not in ("icon", "icon_text")
+        }
+        if record.get("icon") is not None:
+            fields["icon"] = record_icon_string(record)
+        return fields
+
+    def _decode_record(self, record_type_name, fields):
+        values = {
+            name: self._decode_field(name, value)
+            for (name, value) in fields.items()
+        }
+        if fields.get("icon") is not None:
+            values["icon_text"] = fields["icon"]
+        return RECORD_TYPES[record_type_name](**values)
+
+    def _encode_field(self, name, value):
+        time_type = self._db.get_time_type()
+        if value is None:
+            return None
+        elif name == "time_period":
+            return [
+                time_type.time_string(value.start_time),
+                time_type.time_string(value.end_time),
+            ]
+        elif name == "alert":
+            return alert_string(time_type, value)
+        elif name == "category_ids":
+            return [self._get_file_id(id_) for id_ in dict(value)]
+        elif name in ID_FIELDS:
+            return self._get_file_id(value)
+        else:
+            return value
+
+    def _decode_field(self, name, value):
+        time_type = self._db.get_time_type()
+        if value is None:
+            return None
+        elif name == "time_period":
+            return TimePeriod(
+                time_type.parse_time(value[0]),
+                time_type.parse_time(value[1])
+            )
+        elif name == "alert":
+            return parse_alert_string(time_type, value)
+        elif name == "icon":
+            return parse_icon(value)
+        elif name == "category_ids":
+            return {id_: None for id_ in value}
+        elif name in COLOR_FIELDS:
+            return tuple(value)
+        else:
+            return value
@@ -17,6 +17,8 @@
 
 
 from timelinelib.db.interface import ContainerStrategy
+from timelinelib.canvas.data.periodindex import CHUNK_SIZE
+from timelinelib.canvas.data.periodindex import PeriodIndex
 from timelinelib.canvas.data.subevent import Subevent
 
 
@@ -24,6 +26,7 @@ class DefaultContainerStrategy(ContainerStrategy):
 
     def __init__(self, container):
         ContainerStrategy.__init__(self, container)
+        self._subevent_index = SubeventIndex()
 
     def register_subevent(self, subevent):
         if not isinstance(subevent, Subevent):
@@ -34,26 +37,16 @@ class DefaultContainerStrategy(ContainerStrategy):
                 self._adjust_time_period(subevent)
 
     def _append_subevent(self, subevent):
-        self.container.subevents.append(subevent)
-        self._sort_subevents()
-
-    def _sort_subevents(self):
-        without_sort_order = []
-        with_sort_order = []
-        for subevent in self.container.subevents:
-            if subevent.sort_order is None:
-                without_sort_order.append(subevent)
-            else:
-                with_sort_order.append(subevent)
-        self.container.subevents = sorted(
-            with_sort_order,
-            key=lambda subevent: subevent.sort_order
-        ) + without_sort_order
+        self._get_subevent_index().add(subevent)
 
     def unregister_subevent(self, subevent):
         if self._is_subevent_missing(subevent):
             return
-        self.container.subevents.remove(subevent)
+        self._get_subevent_index().remove(subevent)
+
+    def _get_subevent_index(self):
+        self._subevent_index.sync(self.container.subevents)
+        return self._subevent_index
 
     def update(self, subevent):
         self.unregister_subevent(subevent)
@@ -168,7 +161,8 @@ class DefaultContainerStrategy(ContainerStrategy):
         self._move_late_events_right(new_event, earliest_start, delta)
 
     def _event_totally_overlapping_new_event(self, new_event):
-        for event in self.container.subevents:
+        index = self._get_subevent_index()
+        for event in index.in_list_order(index.get_overlapping(new_event.get_time_period())):
             if event is new_event:
                 continue
             if self._event_totally_overlaps_new_event(new_event, event):
@@ -180,8 +174,9 @@ class DefaultContainerStrategy(ContainerStrategy):
                 event.get_time_period().end_time >= new_event.get_time_period().end_time)
 
     def _events_overlapped_by_new_event(self, new_event):
+        index = self._get_subevent_index()
         overlapping_events = []
-        for event in self.container.subevents:
+        for event in index.in_list_order(index.get_overlapping(new_event.get_time_period())):
             if event is not new_event:
                 if self._starts_within(event, new_event) or self._ends_within(event, new_event):
                     overlapping_events.append(event)
@@ -198,25 +193,61 @@ class DefaultContainerStrategy(ContainerStrategy):
         return s1 and s2
 
     def _move_early_events_left(self, new_event, latest_start_time, delta):
-        delta = -delta
-        for event in self.container.subevents:
-            if event is new_event:
-                continue
-            if event.get_time_period().start_time <= latest_start_time:
-                event.move_delta(delta)
+        index = self._get_subevent_index()
+        self._move_events(
+            new_event,
+            lambda: index.get_starting_at_or_before(latest_start_time),
+            lambda event: event.get_time_period().start_time <= latest_start_time,
+            -delta
+        )
 
     def _move_late_events_right(self, new_event, earliest_start_time, delta):
-        for event in self.container.subevents:
-            if event is new_event:
-                continue
-            if event.get_time_period().start_time >= earliest_start_time:
+        index = self._get_subevent_index()
+        self._move_events(
+            new_event,
+            lambda: index.get_starting_at_or_after(earliest_start_time),
+            lambda event: event.get_time_period().start_time >= earliest_start_time,
+            delta
+        )
+
+    def _move_events(self, new_event, get_candidates, should_move, delta):
+        if not self.container.is_updating():
+            self._move_events_updating_container(new_event, should_move, delta)
+            return
+        # Moved subevents do not update the container, so the subevents to
+        # move can be found in the index
+        index = self._get_subevent_index()
+        moved_events = []
+        for event in index.in_list_order(get_candidates()):
+            if event is not new_event and should_move(event):
                 event.move_delta(delta)
+                moved_events.append(event)
+        index.refresh(moved_events)
+
+    def _move_events_updating_container(self, new_event, should_move, delta):
+        # A moved subevent updates the container, which can move other
+        # subevents. This loop used to iterate the subevent list while the
+        # first such update removed the subevent from the list and added it
+        # last, so that subevent was visited again and the one after it was
+        # skipped. Later updates did not change the iterated list. Subevents
+        # are still moved that way, so that they end up where they did.
+        events = list(self.container.subevents)
+        list_changed = False
+        position = 0
+        while position < len(events):
+            event = events[position]
+            position += 1
+            if event is new_event or not should_move(event):
+                continue
+            event.move_delta(delta)
+            self._get_subevent_index().refresh([event])
+            if not list_changed and event.container is self.container:
+                events.remove(event)
+                events.append(event)
+                list_changed = True
 
     def _is_subevent_missing(self, subevent):
-        for x in self.container.subevents:
-            if x is subevent:
-                return False
-        return True
+        return subevent not in self._get_subevent_index()
 
 
 class ExtendedContainerStrategy(DefaultContainerStrategy):
@@ -229,3 +260,152 @@ class ExtendedContainerStrategy(DefaultContainerStrategy):
 
     def allow_ends_today_on_subevents(self):
         return True
+
+
+class SubeventIndex:
+
+    """
+    Keeps the subevents of a container in a list sorted on sort order and
+    in a PeriodIndex so that overlap queries do not have to scan all
+    subevents.
+
+    Subevents with the same sort order are kept in the order they were added.
+    If the sort order of a subevent has changed, the list is sorted again
+    before the next subevent is added. Time periods are indexed as they were
+    when the subevent was added or refreshed. The index is rebuilt if the
+    subevent list of the container has been replaced or changed by someone
+    else.
+    """
+
+    def __init__(self):
+        self._subevents = None
+        self._period_index = PeriodIndex()
+        self._periods = {}
+        self._subevents_by_id = {}
+        self._sequence_numbers = {}
+        self._next_sequence_number = 0
+        self._sort_order_change_count = None
+
+    def sync(self, subevents):
+        if subevents is self._subevents and len(subevents) == len(self._periods):
+            return
+        self._subevents = subevents
+        self._periods = {
+            id(subevent): subevent.get_time_period()
+            for subevent in subevents
+        }
+        self._period_index = PeriodIndex(self._periods.items())
+        self._subevents_by_id = {
+            id(subevent): subevent
+            for subevent in subevents
+        }
+        self._number_in_list_order()
+        self._sort_order_change_count = None
+
+    def __contains__(self, subevent):
+        return id(subevent) in self._periods
+
+    def add(self, subevent):
+        self._ensure_sorted()
+        time_period = subevent.get_time_period()
+        self._sequence_numbers[id(subevent)] = self._next_sequence_number
+        self._next_sequence_number += 1
+        self._subevents.insert(self._bisect(self._list_key(subevent)), subevent)
+        self._periods[id(subevent)] = time_period
+        self._subevents_by_id[id(subevent)] = subevent
+        self._period_index = self._period_index.add(id(subevent), time_period)
+
+    def remove(self, subevent):
+        del self._subevents[self._position(subevent)]
+        time_period = self._periods.pop(id(subevent))
+        del self._subevents_by_id[id(subevent)]
+        del self._sequence_numbers[id(subevent)]
+        self._period_index = self._period_index.remove(id(subevent), time_period)
+
+    def refresh(self, subevents):
+        """Index the current time periods of subevents that have been moved."""
+        changed = [
+            (subevent, self._periods[id(subevent)])
+            for subevent in subevents
+            if id(subevent) in self._periods and
+            self._periods[id(subevent)] != subevent.get_time_period()
+        ]
+        for (subevent, _) in changed:
+            self._periods[id(subevent)] = subevent.get_time_period()
+        if len(changed) > len(self._periods) // CHUNK_SIZE:
+            self._period_index = PeriodIndex(self._periods.items())
+            return
+        for (subevent, old_time_period) in changed:
+            self._period_index = self._period_index.remove(
+                id(subevent), old_time_period
+            ).add(
+                id(subevent), subevent.get_time_period()
+            )
+
+    def get_overlapping(self, time_period):
+        return self._get_subevents(
+            self._period_index.get_ids_overlapping(time_period)
+        )
+
+    def get_starting_at_or_before(self, time):
+        return self._get_subevents(
+            self._period_index.get_ids_starting_at_or_before(time)
+        )
+
+    def get_starting_at_or_after(self, time):
+        return self._get_subevents(
+            self._period_index.get_ids_starting_at_or_after(time)
+        )
+
+    def in_list_order(self, subevents):
+        return sorted(subevents, key=self._list_key)
+
+    def _ensure_sorted(self):
+        if self._sort_order_change_count == Subevent.sort_order_change_count:
+            return
+        self._sort_order_change_count = Subevent.sort_order_change_count
+        # The sort is stable, so subevents with the same sort order keep
+        # their order
+        self._subevents.sort(key=_sort_key)
+        self._number_in_list_order()
+
+    def _number_in_list_order(self):
+        self._sequence_numbers = {
+            id(subevent): sequence_number
+            for (sequence_number, subevent) in enumerate(self._subevents)
+        }
+        self._next_sequence_number = len(self._subevents)
+
+    def _get_subevents(self, ids):
+        return [self._subevents_by_id[id_] for id_ in ids]
+
+    def _list_key(self, subevent):
+        return (_sort_key(subevent), self._sequence_numbers[id(subevent)])
+
+    def _position(self, subevent):
+        position = self._bisect(self._list_key(subevent))
+        if position < len(self._subevents) and self._subevents[position] is subevent:
+            return position
+        # The sort order has been changed after the subevent was added
+        for position, x in enumerate(self._subevents):
+            if x is subevent:
+                return position
+        raise ValueError("Subevent is not in index")
+
+    def _bisect(self, key):
+        low = 0
+        high = len(self._subevents)
+        while low < high:
+            middle = (low + high) // 2
+            if self._list_key(self._subevents[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+def _sort_key(subevent):
+    """Subevents without sort order are placed last."""
+    if subevent.sort_order is None:
+        return (1, 0)
+    return (0, subevent.sort_order)
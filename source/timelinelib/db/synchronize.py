@@ -0,0 +1,194 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Synchronization of a timeline with a newer version of its timeline file.
+
+The timeline file has no record ids. Records get ids in the order they are
+read, so the same record can get a different id every time the file is read.
+Records in the newer version are therefore matched with records in the db by
+content, after references to other records have been translated to the ids
+in the db. Records that are left are matched by text and then by time period,
+so that a record that was edited keeps its id. Only records that differ are
+changed in the db.
+"""
+
+
+import collections
+
+from timelinelib.db.icons import record_icon_string
+from timelinelib.general.immutable import ImmutableDict
+
+
+RECORD_TYPES = ("containers", "events", "milestones", "eras")
+ID_FIELDS = {
+    "category_id": "categories",
+    "parent_id": "categories",
+    "container_id": "containers",
+}
+
+
+def synchronize(db, saved_db):
+    """
+    Make the content of db the same as the content of saved_db.
+
+    saved_db is a newer version of the timeline that db was read from. The
+    changes are made in one transaction, so view properties, selection, and
+    undo history of db are kept.
+    """
+    if db.get_time_type() != saved_db.get_time_type():
+        raise ValueError("Time type of saved timeline does not match")
+    synchronizer = Synchronizer(
+        db.get_immutable_db(),
+        saved_db.get_immutable_db(),
+        db.next_id
+    )
+    db.load_saved_changes(*synchronizer.get_changes())
+
+
+class Synchronizer:
+
+    def __init__(self, current_db, saved_db, next_id):
+        self._current_db = current_db
+        self._saved_db = saved_db
+        self._next_id = next_id
+        self._ids = {}
+        self._delete = {}
+        self._put = {}
+
+    def get_changes(self):
+        """
+        Return (delete, put) that change current_db into saved_db.
+
+        They are given as arguments to ImmutableDB.unload and
+        ImmutableDB.load.
+        """
+        self._synchronize_categories()
+        for name in RECORD_TYPES:
+            self._synchronize_records(name)
+        return (self._delete, self._put)
+
+    def _synchronize_categories(self):
+        current_ids = {
+            category.name: id_
+            for (id_, category) in self._current_db.categories
+        }
+        for (saved_id, category) in self._saved_db.categories:
+            if category.name in current_ids:
+                self._ids["categories", saved_id] = current_ids.pop(category.name)
+            else:
+                self._ids["categories", saved_id] = self._next_id()
+        for (saved_id, category) in self._saved_db.categories:
+            id_ = self._ids["categories", saved_id]
+            category = self._translate("categories", category)
+            if self._current_db.categories.get(id_) != category:
+                self._put_record("categories", id_, category)
+        for id_ in current_ids.values():
+            self._delete_record("categories", id_)
+
+    def _synchronize_records(self, name):
+        unmatched_current = collections.OrderedDict(
+            getattr(self._current_db, name)
+        )
+        unmatched_saved = [
+            (saved_id, self._translate(name, record))
+            for (saved_id, record) in getattr(self._saved_db, name)
+        ]
+        for key in (_content_key, _text_key, _time_period_key):
+            ids_by_key = collections.defaultdict(collections.deque)
+            for (id_, record) in unmatched_current.items():
+                ids_by_key[key(record)].append(id_)
+            still_unmatched_saved = []
+            for (saved_id, record) in unmatched_saved:
+                ids = ids_by_key.get(key(record))
+                if ids:
+                    id_ = ids.popleft()
+                    self._ids[name, saved_id] = id_
+                    if _is_changed(unmatched_current.pop(id_), record):
+                        self._put_record(name, id_, record)
+                else:
+                    still_unmatched_saved.append((saved_id, record))
+            unmatched_saved = still_unmatched_saved
+        for (saved_id, record) in unmatched_saved:
+            id_ = self._next_id()
+            self._ids[name, saved_id] = id_
+            self._put_record(name, id_, record)
+        for id_ in unmatched_current:
+            self._delete_record(name, id_)
+
+    def _translate(self, name, record):
+        changes = {}
+        for (field, records_name) in ID_FIELDS.items():
+            saved_id = record.get(field)
+            if saved_id is not None:
+                changes[field] = self._ids[records_name, saved_id]
+        if "category_ids" in record:
+            changes["category_ids"] = ImmutableDict(
+                (self._ids["categories", saved_id], value)
+                for (saved_id, value) in record.category_ids
+            )
+        if changes:
+            return record.update(changes)
+        return record
+
+    def _put_record(self, name, id_, record):
+        self._put.setdefault(name, {})[id_] = record
+
+    def _delete_record(self, name, id_):
+        self._delete.setdefault(name, []).append(id_)
+
+
+def _is_changed(current_record, saved_record):
+    return (
+        _content_key(current_record) != _content_key(saved_record) or
+        current_record.get("sort_order") != saved_record.get("sort_order")
+    )
+
+
+def _content_key(record):
+    """
+    Return a hashable key of all fields except the sort order.
+
+    The sort order is not in the timeline file. It is given by the order of
+    the records, so it changes for all records after an inserted one.
+    """
+    return tuple(
+        (field, _hashable_value(record, field, value))
+        for (field, value) in sorted(record)
+        if field not in ("sort_order", "icon_text")
+    )
+
+
+def _hashable_value(record, field, value):
+    if value is None:
+        return None
+    elif field == "icon":
+        return record_icon_string(record)
+    elif field == "category_ids":
+        return tuple(value)
+    else:
+        return value
+
+
+def _text_key(record):
+    # Eras have a name instead of a text
+    return record.get("text", record.get("name"))
+
+
+def _time_period_key(record):
+    return record.time_period
@@ -99,6 +99,11 @@ def safe_locking(controller, edit_function, exception_handler=None):
 
 
 def get_modification_date(path):
+    from timelinelib.db.journal import get_journal_path
+    return max(_get_mtime(path), _get_mtime(get_journal_path(path)))
+
+
+def _get_mtime(path):
     try:
         return os.path.getmtime(path)
     except:
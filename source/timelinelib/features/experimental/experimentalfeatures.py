@@ -39,12 +39,18 @@ To add a new experimental feature, do as follows:
 from timelinelib.features.experimental.experimentalfeaturecontainersize import ExperimentalFeatureContainerSize
 from timelinelib.features.experimental.experimentalfeaturenegativejuliandays import ExperimentalFeatureNegativeJulianDays
 from timelinelib.features.experimental.experimentalfeatureextendedcontainerstrategy import ExperimentalFeatureExtendedContainerStrategy
+from timelinelib.features.experimental.experimentalfeaturestableeventrows import ExperimentalFeatureStableEventRows
+from timelinelib.features.experimental.experimentalfeaturejournalsave import ExperimentalFeatureJournalSave
+from timelinelib.features.experimental.experimentalfeaturebackgroundsave import ExperimentalFeatureBackgroundSave
 
 
 EXTENDED_CONTAINER_HEIGHT = ExperimentalFeatureContainerSize()
 NEGATIVE_JULIAN_DAYS = ExperimentalFeatureNegativeJulianDays()
 EXTENDED_CONTAINER_STRATEGY = ExperimentalFeatureExtendedContainerStrategy()
-FEATURES = (EXTENDED_CONTAINER_HEIGHT, NEGATIVE_JULIAN_DAYS, EXTENDED_CONTAINER_STRATEGY)
+STABLE_EVENT_ROWS = ExperimentalFeatureStableEventRows()
+JOURNAL_SAVE = ExperimentalFeatureJournalSave()
+BACKGROUND_SAVE = ExperimentalFeatureBackgroundSave()
+FEATURES = (EXTENDED_CONTAINER_HEIGHT, NEGATIVE_JULIAN_DAYS, EXTENDED_CONTAINER_STRATEGY, STABLE_EVENT_ROWS, JOURNAL_SAVE, BACKGROUND_SAVE)
 
 
 class ExperimentalFeatureException(Exception):
@@ -0,0 +1,36 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from timelinelib.features.experimental.experimentalfeature import ExperimentalFeature
+
+
+CONFIG_NAME = "Stable event rows"
+DISPLAY_NAME = _("Stable event rows")
+DESCRIPTION = _("""
+              Keep the vertical position of events when scrolling and zooming.
+
+              Events that were visible before keep their row if it is still free.
+              Events that become visible and events that no longer fit in their
+              row are placed in the first free row.
+              """)
+
+
+class ExperimentalFeatureStableEventRows(ExperimentalFeature):
+
+    def __init__(self):
+        ExperimentalFeature.__init__(self, DISPLAY_NAME, DESCRIPTION, CONFIG_NAME)
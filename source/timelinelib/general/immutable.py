@@ -16,21 +16,47 @@
 # along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
 
 
+from timelinelib.general.persistentmap import PersistentMap
+
+
 class ImmutableDict(tuple):
 
+    """
+    An immutable mapping.
+
+    The values are stored in a PersistentMap so that update and remove only
+    copy O(log n) nodes and share the rest with the original.
+    """
+
     def __new__(cls, *args, **kwargs):
         if (len(args) == 1 and
             len(kwargs) == 0 and
             isinstance(args[0], _AlreadyCopiedDict)):
             d = args[0].value
         else:
-            d = {}
-            for arg in args:
-                d.update(arg)
-            for key, value in kwargs.items():
-                d[key] = value
+            d = cls._create_internal(args, kwargs)
         return tuple.__new__(cls, (d,))
 
+    @staticmethod
+    def _create_internal(args, kwargs):
+        if args and isinstance(args[0], PersistentMap) and len(args[0]) > 0:
+            d = args[0]
+            args = args[1:]
+        else:
+            new = {}
+            for arg in args:
+                new.update(arg)
+            new.update(kwargs)
+            return PersistentMap(new)
+        for arg in args:
+            if isinstance(arg, dict):
+                arg = arg.items()
+            for key, value in arg:
+                d = d.set(key, value)
+        for key, value in kwargs.items():
+            d = d.set(key, value)
+        return d
+
     @property
     def _internal(self):
         return tuple.__getitem__(self, 0)
@@ -39,21 +65,21 @@ class ImmutableDict(tuple):
         return self.__class__(self._internal, *args, **kwargs)
 
     def remove(self, key):
-        new = {}
-        new.update(self._internal)
-        del new[key]
-        return self.__class__(_AlreadyCopiedDict(new))
+        return self.__class__(_AlreadyCopiedDict(self._internal.delete(key)))
 
     def map(self, fn):
-        return self.__class__(_AlreadyCopiedDict({
-            key: fn(value)
+        return self.__class__(_AlreadyCopiedDict(PersistentMap(
+            (key, fn(value))
             for key, value
             in self._internal.items()
-        }))
+        )))
 
     def get(self, name, default=None):
         return self._internal.get(name, default)
 
+    def changed_keys(self, other):
+        return self._internal.changed_keys(other._internal)
+
     def __len__(self):
         return len(self._internal)
 
@@ -138,12 +164,39 @@ class ImmutableRecord(ImmutableDict, metaclass=ImmutableRecordMeta):
                 ))
         return d
 
+    @staticmethod
+    def _create_internal(args, kwargs):
+        # Records only have a handful of fields, so a plain dict is both
+        # smaller and faster than a PersistentMap here.
+        d = {}
+        for arg in args:
+            d.update(arg)
+        for key, value in kwargs.items():
+            d[key] = value
+        return d
+
+    def remove(self, key):
+        new = {}
+        new.update(self._internal)
+        del new[key]
+        return self.__class__(_AlreadyCopiedDict(new))
+
+    def map(self, fn):
+        return self.__class__(_AlreadyCopiedDict({
+            key: fn(value)
+            for key, value
+            in self._internal.items()
+        }))
+
 
 class _AlreadyCopiedDict:
 
     """
     A special value that can be passed as the single value to the constructor
     of ImmutableDict to prevent unnecessary copying.
+
+    The value is the internal mapping: a PersistentMap for ImmutableDict and a
+    dict for ImmutableRecord.
     """
 
     def __init__(self, value):
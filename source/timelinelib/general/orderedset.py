@@ -0,0 +1,78 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+_MISSING = object()
+
+
+class OrderedSet:
+
+    """
+    A set that remembers the order in which items were added.
+
+    The methods that change the set return True if something changed, so
+    that bulk changes can be followed by a single notification.
+    """
+
+    def __init__(self, items=()):
+        self._items = dict.fromkeys(items)
+
+    def add(self, item):
+        if item in self._items:
+            return False
+        self._items[item] = None
+        return True
+
+    def discard(self, item):
+        if item not in self._items:
+            return False
+        del self._items[item]
+        return True
+
+    def update(self, items):
+        size = len(self._items)
+        for item in items:
+            self._items.setdefault(item, None)
+        return len(self._items) != size
+
+    def difference_update(self, items):
+        changed = False
+        for item in items:
+            if self._items.pop(item, _MISSING) is not _MISSING:
+                changed = True
+        return changed
+
+    def clear(self):
+        if not self._items:
+            return False
+        self._items.clear()
+        return True
+
+    def to_list(self):
+        return list(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __repr__(self):
+        return "{0}({1!r})".format(self.__class__.__name__, self.to_list())
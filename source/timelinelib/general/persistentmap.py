@@ -0,0 +1,425 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+A persistent map with structural sharing.
+
+Keys are stored in a hash array mapped trie (HAMT) that maps every key to a
+sequence number. The sequence number is an index into a persistent vector
+that holds the (key, value) pairs in insertion order. That way iteration
+order is the same as for a dict, and both set and delete only copy the
+O(log n) nodes on the path to the changed entry. All other nodes are shared
+between the old and the new map.
+"""
+
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+
+_MISSING = object()
+_DELETED = object()
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(value):
+        return bin(value).count("1")
+
+
+class PersistentMap:
+
+    __slots__ = ("_root", "_count", "_entries")
+
+    def __init__(self, items=()):
+        if isinstance(items, (dict, PersistentMap)):
+            items = items.items()
+        pairs = {}
+        for key, value in items:
+            pairs[key] = value
+        self._entries = _Vector.from_list(list(pairs.items()))
+        self._root = _build_trie([
+            (key, hash(key) & _HASH_MASK, seq)
+            for seq, key in enumerate(pairs)
+        ])
+        self._count = len(pairs)
+
+    @classmethod
+    def _create(cls, root, count, entries):
+        new = cls.__new__(cls)
+        new._root = root
+        new._count = count
+        new._entries = entries
+        return new
+
+    def get(self, key, default=None):
+        leaf = _trie_get(self._root, hash(key) & _HASH_MASK, key)
+        if leaf is None:
+            return default
+        return self._entries.get(leaf[2])[1]
+
+    def set(self, key, value):
+        h = hash(key) & _HASH_MASK
+        leaf = _trie_get(self._root, h, key)
+        if leaf is None:
+            seq = len(self._entries)
+            root = _trie_set(self._root, 0, (key, h, seq))
+            entries = self._entries.append((key, value))
+            return self._create(root, self._count + 1, entries)
+        else:
+            entries = self._entries.set(leaf[2], (key, value))
+            return self._create(self._root, self._count, entries)
+
+    def delete(self, key):
+        h = hash(key) & _HASH_MASK
+        leaf = _trie_get(self._root, h, key)
+        if leaf is None:
+            raise KeyError(key)
+        count = self._count - 1
+        if count < len(self._entries) // 2:
+            return self.__class__(item for item in self.items() if item[0] != key)
+        root = _trie_delete(self._root, 0, h, key)
+        if root is None or type(root) is tuple:
+            root = _wrap_in_bitmap_node(root)
+        entries = self._entries.set(leaf[2], _DELETED)
+        return self._create(root, count, entries)
+
+    def changed_keys(self, other):
+        """
+        Return the keys that are in only one of the maps or that map to
+        different objects in the two maps.
+
+        Parts of the entry vectors that the maps share are skipped, so
+        comparing a map with one derived from it by a few set and delete calls
+        only costs time for the changed entries.
+        """
+        candidates = {}
+        for index in self._entries.changed_indices(other._entries):
+            for entries in [self._entries, other._entries]:
+                if index < len(entries):
+                    entry = entries.get(index)
+                    if entry is not _DELETED:
+                        candidates[entry[0]] = None
+        return [
+            key
+            for key in candidates
+            if self.get(key, _MISSING) is not other.get(key, _MISSING)
+        ]
+
+    def items(self):
+        for entry in self._entries:
+            if entry is not _DELETED:
+                yield entry
+
+    def keys(self):
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return _trie_get(self._root, hash(key) & _HASH_MASK, key) is not None
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return self.keys()
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, PersistentMap) or len(self) != len(other):
+            return False
+        for key, value in self.items():
+            if other.get(key, _MISSING) != value:
+                return False
+        return True
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "{0}({1!r})".format(self.__class__.__name__, dict(self.items()))
+
+
+class _BitmapNode:
+
+    __slots__ = ("bitmap", "array")
+
+    def __init__(self, bitmap, array):
+        self.bitmap = bitmap
+        self.array = array
+
+
+class _CollisionNode:
+
+    __slots__ = ("hash", "array")
+
+    def __init__(self, hash_, array):
+        self.hash = hash_
+        self.array = array
+
+
+# Trie entries are either nodes or leaves. A leaf is a tuple
+# (key, hash, sequence number).
+
+
+def _trie_get(node, h, key):
+    shift = 0
+    while True:
+        if type(node) is _BitmapNode:
+            bit = 1 << ((h >> shift) & _MASK)
+            if not node.bitmap & bit:
+                return None
+            entry = node.array[_popcount(node.bitmap & (bit - 1))]
+            if type(entry) is tuple:
+                if entry[1] == h and (entry[0] is key or entry[0] == key):
+                    return entry
+                return None
+            node = entry
+            shift += _BITS
+        else:
+            if node.hash != h:
+                return None
+            for entry in node.array:
+                if entry[0] is key or entry[0] == key:
+                    return entry
+            return None
+
+
+def _trie_set(node, shift, leaf):
+    h = leaf[1]
+    if type(node) is _CollisionNode:
+        if node.hash == h:
+            return _CollisionNode(h, tuple(
+                entry for entry in node.array if entry[0] != leaf[0]
+            ) + (leaf,))
+        node = _BitmapNode(1 << ((node.hash >> shift) & _MASK), (node,))
+    bit = 1 << ((h >> shift) & _MASK)
+    index = _popcount(node.bitmap & (bit - 1))
+    array = node.array
+    if not node.bitmap & bit:
+        return _BitmapNode(node.bitmap | bit, array[:index] + (leaf,) + array[index:])
+    entry = array[index]
+    if type(entry) is tuple:
+        if entry[0] == leaf[0]:
+            new_entry = leaf
+        else:
+            new_entry = _merge_leaves(shift + _BITS, entry, leaf)
+    else:
+        new_entry = _trie_set(entry, shift + _BITS, leaf)
+    return _BitmapNode(node.bitmap, array[:index] + (new_entry,) + array[index + 1:])
+
+
+def _merge_leaves(shift, leaf1, leaf2):
+    if leaf1[1] == leaf2[1]:
+        return _CollisionNode(leaf1[1], (leaf1, leaf2))
+    index1 = (leaf1[1] >> shift) & _MASK
+    index2 = (leaf2[1] >> shift) & _MASK
+    if index1 == index2:
+        return _BitmapNode(1 << index1, (_merge_leaves(shift + _BITS, leaf1, leaf2),))
+    elif index1 < index2:
+        return _BitmapNode((1 << index1) | (1 << index2), (leaf1, leaf2))
+    else:
+        return _BitmapNode((1 << index1) | (1 << index2), (leaf2, leaf1))
+
+
+def _trie_delete(node, shift, h, key):
+    """
+    Return the node without the key.
+
+    The result is None if the node became empty, and a leaf if only one leaf
+    remains so that the parent can inline it.
+    """
+    if type(node) is _CollisionNode:
+        array = tuple(entry for entry in node.array if entry[0] != key)
+        if len(array) == 1:
+            return array[0]
+        return _CollisionNode(node.hash, array)
+    bit = 1 << ((h >> shift) & _MASK)
+    index = _popcount(node.bitmap & (bit - 1))
+    entry = node.array[index]
+    if type(entry) is tuple:
+        new_entry = None
+    else:
+        new_entry = _trie_delete(entry, shift + _BITS, h, key)
+    if new_entry is None:
+        bitmap = node.bitmap & ~bit
+        array = node.array[:index] + node.array[index + 1:]
+    else:
+        bitmap = node.bitmap
+        array = node.array[:index] + (new_entry,) + node.array[index + 1:]
+    if len(array) == 0:
+        return None
+    if len(array) == 1 and type(array[0]) is tuple:
+        return array[0]
+    return _BitmapNode(bitmap, array)
+
+
+def _wrap_in_bitmap_node(leaf):
+    if leaf is None:
+        return _BitmapNode(0, ())
+    return _BitmapNode(1 << (leaf[1] & _MASK), (leaf,))
+
+
+def _build_trie(leaves, shift=0):
+    if shift >= 64:
+        return _CollisionNode(leaves[0][1], tuple(leaves))
+    buckets = {}
+    for leaf in leaves:
+        buckets.setdefault((leaf[1] >> shift) & _MASK, []).append(leaf)
+    bitmap = 0
+    array = []
+    for index in sorted(buckets):
+        bitmap |= 1 << index
+        bucket = buckets[index]
+        if len(bucket) == 1:
+            array.append(bucket[0])
+        elif all(leaf[1] == bucket[0][1] for leaf in bucket):
+            array.append(_CollisionNode(bucket[0][1], tuple(bucket)))
+        else:
+            array.append(_build_trie(bucket, shift + _BITS))
+    return _BitmapNode(bitmap, tuple(array))
+
+
+class _Vector:
+
+    """
+    A persistent vector implemented as a trie of tuples with _WIDTH elements
+    in every node.
+    """
+
+    __slots__ = ("_count", "_shift", "_root")
+
+    def __init__(self, count, shift, root):
+        self._count = count
+        self._shift = shift
+        self._root = root
+
+    @classmethod
+    def from_list(cls, elements):
+        shift = 0
+        nodes = [
+            tuple(elements[index:index + _WIDTH])
+            for index in range(0, len(elements), _WIDTH)
+        ]
+        while len(nodes) > 1:
+            shift += _BITS
+            nodes = [
+                tuple(nodes[index:index + _WIDTH])
+                for index in range(0, len(nodes), _WIDTH)
+            ]
+        return cls(len(elements), shift, nodes[0] if nodes else ())
+
+    def get(self, index):
+        node = self._root
+        shift = self._shift
+        while shift > 0:
+            node = node[(index >> shift) & _MASK]
+            shift -= _BITS
+        return node[index & _MASK]
+
+    def set(self, index, value):
+        return _Vector(self._count, self._shift, self._set(self._root, self._shift, index, value))
+
+    def _set(self, node, shift, index, value):
+        position = (index >> shift) & _MASK
+        if shift == 0:
+            new_child = value
+        else:
+            new_child = self._set(node[position], shift - _BITS, index, value)
+        return node[:position] + (new_child,) + node[position + 1:]
+
+    def append(self, value):
+        if self._count == _WIDTH << self._shift:
+            root = (self._root, self._new_path(self._shift, value))
+            return _Vector(self._count + 1, self._shift + _BITS, root)
+        return _Vector(self._count + 1, self._shift, self._append(self._root, self._shift, value))
+
+    def _append(self, node, shift, value):
+        if shift == 0:
+            return node + (value,)
+        position = (self._count >> shift) & _MASK
+        if position < len(node):
+            return node[:position] + (self._append(node[position], shift - _BITS, value),)
+        return node + (self._new_path(shift - _BITS, value),)
+
+    def _new_path(self, shift, value):
+        node = (value,)
+        while shift > 0:
+            node = (node,)
+            shift -= _BITS
+        return node
+
+    def changed_indices(self, other):
+        return _diff_vector_nodes(self._root, self._shift, other._root, other._shift, 0)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return _iter_vector_node(self._root, self._shift)
+
+
+def _iter_vector_node(node, shift):
+    if shift == 0:
+        yield from node
+    else:
+        for child in node:
+            yield from _iter_vector_node(child, shift - _BITS)
+
+
+def _diff_vector_nodes(node1, shift1, node2, shift2, offset):
+    """
+    Yield the indices where the two vector nodes might hold different
+    elements.
+
+    A missing node is passed as an empty tuple. When one vector has grown a
+    level, the other one is compared with its first child.
+    """
+    if node1 is node2 and shift1 == shift2:
+        return
+    if shift1 > shift2:
+        yield from _diff_vector_nodes(node1[0] if node1 else (), shift1 - _BITS, node2, shift2, offset)
+        for index in range(1, len(node1)):
+            yield from _diff_vector_nodes(node1[index], shift1 - _BITS, (), shift1 - _BITS, offset + (index << shift1))
+    elif shift2 > shift1:
+        yield from _diff_vector_nodes(node2, shift2, node1, shift1, offset)
+    elif shift1 == 0:
+        for index in range(max(len(node1), len(node2))):
+            element1 = node1[index] if index < len(node1) else _MISSING
+            element2 = node2[index] if index < len(node2) else _MISSING
+            if element1 is not element2:
+                yield offset + index
+    else:
+        for index in range(max(len(node1), len(node2))):
+            yield from _diff_vector_nodes(
+                node1[index] if index < len(node1) else (), shift1 - _BITS,
+                node2[index] if index < len(node2) else (), shift2 - _BITS,
+                offset + (index << shift1)
+            )
@@ -33,11 +33,14 @@ from timelinelib.timer import Timer
 class Monitoring:
     """
     * Kepp track of the number of times the timeline has been redrawn.
+    * Keep track of the number of redraw requests that were collapsed into
+      another redraw.
     * Measure the time it takes to redraw.
     """
     def __init__(self, timer=None):
         self._timeline_redraw_count = 0
         self._category_redraw_count = 0
+        self._collapsed_redraw_count = 0
         if timer is None:
             self._timer = Timer()
         else:
@@ -51,6 +54,14 @@ class Monitoring:
         """Increment counter."""
         self._timeline_redraw_count += 1
 
+    @property
+    def collapsed_redraw_count(self):
+        return self._collapsed_redraw_count
+
+    def count_collapsed_redraw(self):
+        """Increment counter."""
+        self._collapsed_redraw_count += 1
+
     def count_category_redraw(self):
         """Increment counter."""
         self._category_redraw_count += 1
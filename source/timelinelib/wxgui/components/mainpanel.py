@@ -32,10 +32,10 @@ class FileDropTarget(wx.FileDropTarget):
         self._canvas = canvas
 
     def OnDropFiles(self, x, y, filenames):
-        bitmap = FileToBitmapConverter().convert(filenames[0])
+        bitmap, icon_text = FileToBitmapConverter().convert(filenames[0])
         event = self._canvas.controller.event_at(x, y)
         if event:
-            event.set_icon(bitmap)
+            event.set_icon(bitmap, icon_text)
             event.save()
             return True
         else:
@@ -167,18 +167,17 @@ class MainPanel(wx.Panel):
         return self.timeline_panel.get_time_period()
 
     def get_ids_of_two_first_selected_events(self):
-        view_properties = self.get_view_properties()
-        return (view_properties.selected_event_ids[0],
-                view_properties.selected_event_ids[1])
+        selected_event_ids = self.get_view_properties().get_selected_event_ids()
+        return (selected_event_ids[0], selected_event_ids[1])
 
     def get_selected_event_ids(self):
         return self.get_view_properties().get_selected_event_ids()
 
     def get_id_of_first_selected_event(self):
-        return self.get_view_properties().get_selected_event_ids()[0]
+        return self.get_view_properties().get_first_selected_event_id()
 
     def get_nbr_of_selected_events(self):
-        return len(self.get_view_properties().get_selected_event_ids())
+        return self.get_view_properties().get_selected_event_count()
 
     def open_event_editor(self, event):
         self.timeline_panel.open_event_editor(event)
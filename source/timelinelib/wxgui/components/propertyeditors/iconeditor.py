@@ -20,6 +20,7 @@ import os.path
 
 import wx
 
+from timelinelib.db.icons import image_to_icon
 from timelinelib.wxgui.components.propertyeditors.baseeditor import BaseEditor
 
 
@@ -29,6 +30,7 @@ class FileToBitmapConverter:
         self.MAX_SIZE = (128, 128)
 
     def convert(self, path):
+        """Return the bitmap and the icon string of the image in path."""
         try:
             image = wx.Image(0, 0)
             success = image.LoadFile(path)
@@ -46,9 +48,10 @@ class FileToBitmapConverter:
                     w = w * factor
                     h = h * factor
                 image = image.Scale(w, h, wx.IMAGE_QUALITY_HIGH)
-                return image.ConvertToBitmap()
+                return image_to_icon(image)
         except:
             pass
+        return (None, None)
 
 
 class IconEditorGuiCreator(wx.Panel):
@@ -109,8 +112,9 @@ class IconEditor(BaseEditor, IconEditorGuiCreator):
     def clear_data(self):
         self.set_icon(None)
 
-    def set_icon(self, bmp):
+    def set_icon(self, bmp, icon_text=None):
         self.bmp = bmp
+        self.icon_text = icon_text
         if self.bmp is None:
             self.img_icon.SetBitmap(wx.EmptyBitmap(1, 1))
         else:
@@ -120,16 +124,20 @@ class IconEditor(BaseEditor, IconEditorGuiCreator):
     def get_icon(self):
         return self.bmp
 
+    def get_icon_text(self):
+        return self.icon_text
+
     def _initialize_data(self):
         self.bmp = None
+        self.icon_text = None
 
     def _btn_select_on_click(self, evt):
         dialog = wx.FileDialog(self, message=_("Select Icon"),
                                wildcard="*", style=wx.FD_OPEN)
         if dialog.ShowModal() == wx.ID_OK:
             try:
-                bitmap = FileToBitmapConverter().convert(dialog.GetPath())
-                self.set_icon(bitmap)
+                bitmap, icon_text = FileToBitmapConverter().convert(dialog.GetPath())
+                self.set_icon(bitmap, icon_text)
             except:
                 pass
         dialog.Destroy()
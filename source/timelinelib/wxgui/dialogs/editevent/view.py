@@ -282,6 +282,8 @@ class EditEventDialog(Dialog):
             data = editor.get_data()
             if data is not None:
                 event_data[data_id] = editor.get_data()
+        if self.icon.get_icon_text() is not None:
+            event_data["icon_text"] = self.icon.get_icon_text()
         return event_data
 
     def SetEventData(self, event_data):
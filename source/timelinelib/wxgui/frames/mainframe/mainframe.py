@@ -23,6 +23,7 @@ from timelinelib.canvas.data import TimePeriod
 from timelinelib.config.dotfile import read_config
 from timelinelib.config.wxlocale import set_wx_locale
 from timelinelib.db import db_open
+from timelinelib.db import db_read_timeline
 from timelinelib.features.experimental.experimentalfeatures import ExperimentalFeatures
 from timelinelib.meta.about import APPLICATION_NAME
 from timelinelib.wxgui.frames.mainframe.mainframecontroller import LockedException
@@ -66,7 +67,7 @@ class MainFrame(wx.Frame, guic.GuiCreator):
         self.Bind(wx.EVT_CLOSE, self.exit)
         self.locale = set_wx_locale()
         # self.help_browser = HelpBrowserFrame(self)
-        self.controller = MainFrameController(self, db_open, self.config)
+        self.controller = MainFrameController(self, db_open, self.config, db_read_timeline)
         self.menu_controller = MenuController()
         self.timeline = None
         ExperimentalFeatures().set_active_state_on_all_features_from_config_string(
@@ -124,6 +125,8 @@ class MainFrame(wx.Frame, guic.GuiCreator):
         try:
             if self.ok_to_edit():
                 self.save_current_timeline_data()
+                if self.timeline:
+                    self.timeline.close()
         finally:
             self.edit_ends()
         self.Destroy()
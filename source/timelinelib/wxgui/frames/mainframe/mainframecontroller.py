@@ -30,13 +30,16 @@ from timelinelib.wxgui.frames.mainframe.lockhandler import LockHandler, LockedEx
 from timelinelib.meta.about import get_title
 from timelinelib.wxgui.dialogs.exceptionreport.exceptionreport import exception_report
 from timelinelib.db.utils import get_modification_date
+from timelinelib.db.synchronize import synchronize
+from timelinelib.canvas.data.exceptions import TimelineIOError
 
 
 class MainFrameController:
 
-    def __init__(self, main_frame, db_open_fn, config):
+    def __init__(self, main_frame, db_open_fn, config, db_read_fn):
         self._main_frame = main_frame
         self._db_open_fn = db_open_fn
+        self._db_read_fn = db_read_fn
         self._config = config
         self._timeline = None
         self._timelinepath = None
@@ -75,6 +78,7 @@ class MainFrameController:
             return True
         if self._timeline.is_read_only():
             return False
+        self._timeline.wait_until_saved()
         if self._lock_handler.locked(self._timelinepath):
             display_warning_message("The Timeline is Locked by someone else.\nTry again later")
             return False
@@ -95,9 +99,18 @@ class MainFrameController:
         return True
 
     def edit_ends(self):
-        if self._lock_handler.the_lock_is_mine(self._timelinepath):
-            self._last_changed = get_modification_date(self._timelinepath)
-            self._lock_handler.unlock(self._timelinepath)
+        path = self._timelinepath
+        if self._timeline is None:
+            self._unlock(path)
+        else:
+            # The lock must be kept until the changes are written
+            self._timeline.when_saved(lambda: self._unlock(path))
+
+    def _unlock(self, path):
+        if self._lock_handler.the_lock_is_mine(path):
+            if path == self._timelinepath:
+                self._last_changed = get_modification_date(path)
+            self._lock_handler.unlock(path)
 
     # File Menu action handlers (New, Open, Open recent, Save as, Import, Export, Exit
     def create_new_timeline(self, timetype):
@@ -154,5 +167,10 @@ class MainFrameController:
                 self._main_frame.EnableDisableMenus()
 
     def _reload_from_disk(self):
-        self._open_or_create_timeline(self._timelinepath, save_current_data=False)
+        try:
+            synchronize(self._timeline, self._db_read_fn(self._timelinepath))
+        except (ValueError, TimelineIOError):
+            self._open_or_create_timeline(self._timelinepath, save_current_data=False)
+        else:
+            self._last_changed = get_modification_date(self._timelinepath)
         self._main_frame.canvas.Redraw()
@@ -69,6 +69,17 @@ class GregorianConversionsSpec(UnitTestCase):
             roundtrip = gregorian.gregorian_ymd_to_julian_day(year, month, day)
             self.assertEqual(roundtrip, julian_day)
 
+    def test_julian_day_conversion_checks_min_julian_day_for_cached_days(self):
+        """
+        Converted days are cached, but the limit can change between calls.
+        """
+        GregorianTime.set_min_julian_day(True)
+        try:
+            gregorian.julian_day_to_gregorian_ymd(-10)
+        finally:
+            GregorianTime.set_min_julian_day(False)
+        self.assertRaises(ValueError, gregorian.julian_day_to_gregorian_ymd, -10)
+
     def test_roundtrip_gregorian_dates_conversions(self):
         """ """
         dates = [
@@ -56,6 +56,22 @@ class describe_time_properties(UnitTestCase):
     def test_can_return_min_time(self):
         self.assertEqual(GregorianTime(GregorianTime.MIN_JULIAN_DAY, 0), GregorianTime.min())
 
+    def test_can_be_ordered(self):
+        times = [GregorianTime(11, 0), GregorianTime(10, 5), GregorianTime(10, 86399)]
+        self.assertEqual(
+            sorted(times),
+            [GregorianTime(10, 5), GregorianTime(10, 86399), GregorianTime(11, 0)]
+        )
+        self.assertTrue(GregorianTime(10, 5) <= GregorianTime(10, 5))
+        self.assertTrue(GregorianTime(10, 5) >= GregorianTime(10, 5))
+
+    def test_can_be_hashed(self):
+        self.assertEqual(hash(GregorianTime(10, 5)), hash(GregorianTime(10, 5)))
+        self.assertEqual(len({GregorianTime(10, 5), GregorianTime(10, 5), GregorianTime(10, 6)}), 2)
+
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(GregorianTime(10, 5), "__dict__"))
+
 
 class describe_time_delta_properties(UnitTestCase):
 
@@ -75,3 +91,7 @@ class describe_time_delta_properties(UnitTestCase):
 
     def test_negate(self):
         self.assertEqual(GregorianDelta(-2), -GregorianDelta(2))
+
+    def test_can_be_hashed(self):
+        self.assertEqual(len({GregorianDelta(2), GregorianDelta(2), GregorianDelta(3)}), 2)
+        self.assertFalse(hasattr(GregorianDelta(2), "__dict__"))
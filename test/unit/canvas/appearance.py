@@ -42,6 +42,13 @@ class describe_appearance(WxAppTestCase):
         self.appearance.set_never_use_time(True)
         self.assertEqual(listener.call_count, 2)
 
+    def test_version_changes_when_value_changes(self):
+        version = self.appearance.get_version()
+        self.appearance.set_legend_visible(True)
+        self.assertEqual(self.appearance.get_version(), version)
+        self.appearance.set_legend_visible(False)
+        self.assertNotEqual(self.appearance.get_version(), version)
+
     def test_has_properties(self):
         self.appearance.get_never_use_time()
         self.appearance.set_never_use_time(sentinel.VALUE)
@@ -58,6 +58,13 @@ class describe_container(UnitTestCase):
     def test_is_not_a_milestone(self):
         self.assertFalse(a_container_with(text="container").is_milestone())
 
+    def test_can_be_hashed_together_with_subevents(self):
+        container = a_container_with(text="container")
+        container.set_id(1)
+        subevent = a_subevent_with(start="1 Jan 200 10:01", end="3 Mar 200 10:01")
+        subevent.set_id(2)
+        self.assertEqual({container: "c", subevent: "s"}[subevent], "s")
+
 
 class describe_container_construction(UnitTestCase):
 
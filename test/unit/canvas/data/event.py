@@ -97,6 +97,21 @@ class describe_event(UnitTestCase):
             an_event_with(locked=True).set_ends_today(True).get_ends_today(),
             False)
 
+    def test_icon_text_is_kept_until_icon_is_replaced(self):
+        an_icon = "really not an icon"
+        event = an_event().set_icon(an_icon, "icon text")
+        self.assertEqual(event.set_icon(an_icon).get_icon_text(), "icon text")
+        self.assertEqual(event.set_icon("another icon").get_icon_text(), None)
+
+    def test_icon_text_can_be_set_with_data(self):
+        event = an_event()
+        event.data = {"icon": "really not an icon", "icon_text": "icon text"}
+        self.assertEqual(event.get_icon_text(), "icon text")
+        event.data = {"icon": "really not an icon"}
+        self.assertEqual(event.get_icon_text(), "icon text")
+        event.data = {"icon": "another icon"}
+        self.assertEqual(event.get_icon_text(), None)
+
     def test_ends_today_can_be_changed_with_update(self):
         event = an_event_with(ends_today=False)
         event.update(event.get_time_period().start_time, event.get_time_period().end_time, event.get_text(), ends_today=True)
@@ -125,6 +140,21 @@ class describe_event(UnitTestCase):
     def test_can_be_compared(self):
         self.assertEqNeImplementationIsCorrect(an_event, EVENT_MODIFIERS)
 
+    def test_is_hashed_on_id(self):
+        event = an_event_with(text="foo")
+        event.set_id(5)
+        other = an_event_with(text="bar")
+        other.set_id(5)
+        self.assertEqual(hash(event), hash(5))
+        self.assertEqual(hash(event), hash(other))
+        self.assertEqual(len({event, other}), 2)
+
+    def test_unsaved_events_are_hashed_on_identity(self):
+        event = an_event()
+        other = an_event()
+        self.assertEqual(hash(event), object.__hash__(event))
+        self.assertNotEqual(hash(event), hash(other))
+
     def test_point_event_has_a_label(self):
         event = an_event_with(text="foo", time="11 Jul 2014 10:11")
         self.assertEqual(
@@ -25,6 +25,7 @@ from timelinelib.canvas.data.immutable import ImmutableMilestone
 from timelinelib.canvas.data.immutable import InvalidOperationError
 from timelinelib.general.immutable import ImmutableDict
 from timelinelib.test.cases.unit import UnitTestCase
+from timelinelib.test.utils import numeric_period
 
 
 class DBTestCase(UnitTestCase):
@@ -108,6 +109,187 @@ class describe_deleting_event(DBTestCase):
         )
 
 
+class describe_loading(DBTestCase):
+
+    def test_db_is_not_mutated(self):
+        db1 = ImmutableDB()
+        db2 = db1.load(events={1: ImmutableEvent()})
+        self.assertDifferentIdentity(db1, db2)
+
+    def test_records_are_added(self):
+        db = ImmutableDB()
+        db = db.save_category(ImmutableCategory(name="work"), 1)
+        db = db.load(
+            categories={2: ImmutableCategory(name="home", parent_id=1)},
+            containers={3: ImmutableContainer(text="project", category_id=2)},
+            events={4: ImmutableEvent(text="meeting", category_id=1, container_id=3)},
+            milestones={5: ImmutableMilestone(text="start")},
+            eras={6: ImmutableEra(name="era")}
+        )
+        self.assertEqual(db, ImmutableDB(
+            categories=ImmutableDict({
+                1: ImmutableCategory(name="work"),
+                2: ImmutableCategory(name="home", parent_id=1),
+            }),
+            containers=ImmutableDict({
+                3: ImmutableContainer(text="project", category_id=2),
+            }),
+            events=ImmutableDict({
+                4: ImmutableEvent(text="meeting", category_id=1, container_id=3),
+            }),
+            milestones=ImmutableDict({
+                5: ImmutableMilestone(text="start"),
+            }),
+            eras=ImmutableDict({
+                6: ImmutableEra(name="era"),
+            }),
+        ))
+        self.assertEqual(db.get_subevent_ids(3), (4,))
+
+    def test_fails_if_category_name_exists(self):
+        db = ImmutableDB()
+        db = db.save_category(ImmutableCategory(name="foo"), 1)
+        self.assertRaisesRegex(
+            InvalidOperationError,
+            r"^Category name 'foo' is not unique$",
+            db.load, categories={2: ImmutableCategory(name="foo")}
+        )
+
+    def test_fails_if_parent_creates_circular_reference(self):
+        db = ImmutableDB()
+        self.assertRaisesRegex(
+            InvalidOperationError,
+            r"^Circular category parent$",
+            db.load, categories={
+                1: ImmutableCategory(name="a", parent_id=2),
+                2: ImmutableCategory(name="b", parent_id=1),
+            }
+        )
+
+    def test_fails_if_category_does_not_exist(self):
+        db = ImmutableDB()
+        self.assertRaisesRegex(
+            InvalidOperationError,
+            r"^Category with id 99 does not exist$",
+            db.load, milestones={1: ImmutableMilestone(category_id=99)}
+        )
+
+    def test_fails_if_container_does_not_exist(self):
+        db = ImmutableDB()
+        self.assertRaisesRegex(
+            InvalidOperationError,
+            r"^Container with id 99 does not exist$",
+            db.load, events={1: ImmutableEvent(container_id=99)}
+        )
+
+
+class describe_unloading(DBTestCase):
+
+    def test_records_are_removed(self):
+        db = ImmutableDB().load(
+            categories={1: ImmutableCategory(name="work")},
+            events={2: ImmutableEvent(text="meeting"), 3: ImmutableEvent(text="lunch")},
+            eras={4: ImmutableEra(name="era")}
+        )
+        db = db.unload(categories=[1], events=[2], eras=[4])
+        self.assertEqual(db, ImmutableDB(
+            events=ImmutableDict({
+                3: ImmutableEvent(text="lunch"),
+            }),
+        ))
+
+    def test_removed_events_are_not_found_in_period(self):
+        db = ImmutableDB().load(events={
+            1: ImmutableEvent(time_period=numeric_period(1, 5)),
+        })
+        db.get_event_ids_in_period(numeric_period(0, 10))
+        db = db.unload(events=[1])
+        self.assertEqual(db.get_event_ids_in_period(numeric_period(0, 10)), [])
+
+
+class describe_getting_event_ids_in_period(DBTestCase):
+
+    def test_finds_events_not_outside_period(self):
+        db = ImmutableDB()
+        db = db.save_event(ImmutableEvent(time_period=numeric_period(0, 5)), 1)
+        db = db.save_event(ImmutableEvent(time_period=numeric_period(6, 9)), 2)
+        self.assertEqual(db.get_event_ids_in_period(numeric_period(5, 5)), [1])
+
+    def test_is_correct_after_changes(self):
+        db1 = ImmutableDB()
+        db1 = db1.save_event(ImmutableEvent(time_period=numeric_period(0, 5)), 1)
+        db1 = db1.save_event(ImmutableEvent(time_period=numeric_period(6, 9)), 2)
+        db1.get_event_ids_in_period(numeric_period(0, 0))
+        db2 = db1.save_event(ImmutableEvent(time_period=numeric_period(20, 30)), 1)
+        db3 = db2.delete_event(2)
+        db4 = db3.save_category(ImmutableCategory(name="work"), 3)
+        period = numeric_period(0, 100)
+        self.assertEqual(sorted(db1.get_event_ids_in_period(period)), [1, 2])
+        self.assertEqual(sorted(db2.get_event_ids_in_period(period)), [1, 2])
+        self.assertEqual(db2.get_event_ids_in_period(numeric_period(0, 5)), [])
+        self.assertEqual(db3.get_event_ids_in_period(period), [1])
+        self.assertEqual(db4.get_event_ids_in_period(period), [1])
+
+
+class describe_getting_subevent_ids(DBTestCase):
+
+    def test_finds_events_in_container(self):
+        db = ImmutableDB()
+        db = db.save_container(ImmutableContainer(), 1)
+        db = db.save_event(ImmutableEvent(container_id=1), 2)
+        db = db.save_event(ImmutableEvent(), 3)
+        db = db.save_event(ImmutableEvent(container_id=1), 4)
+        self.assertEqual(db.get_subevent_ids(1), (2, 4))
+        self.assertEqual(db.get_subevent_ids(5), ())
+
+    def test_is_correct_after_changes(self):
+        db1 = ImmutableDB()
+        db1 = db1.save_container(ImmutableContainer(), 1)
+        db1 = db1.save_container(ImmutableContainer(), 2)
+        db1 = db1.save_event(ImmutableEvent(container_id=1), 3)
+        db1 = db1.save_event(ImmutableEvent(container_id=1), 4)
+        db1.get_subevent_ids(1)
+        db2 = db1.save_event(ImmutableEvent(container_id=2), 3)
+        db3 = db2.delete_event(4)
+        db4 = db3.delete_container(2)
+        self.assertEqual((db1.get_subevent_ids(1), db1.get_subevent_ids(2)), ((3, 4), ()))
+        self.assertEqual((db2.get_subevent_ids(1), db2.get_subevent_ids(2)), ((4,), (3,)))
+        self.assertEqual((db3.get_subevent_ids(1), db3.get_subevent_ids(2)), ((), (3,)))
+        self.assertEqual((db4.get_subevent_ids(1), db4.get_subevent_ids(2)), ((), ()))
+
+
+class describe_getting_max_sort_order(DBTestCase):
+
+    def test_is_minus_one_for_empty_db(self):
+        self.assertEqual(ImmutableDB().get_max_sort_order(), -1)
+
+    def test_includes_events_and_milestones(self):
+        db = ImmutableDB()
+        db = db.save_event(ImmutableEvent(sort_order=3), 1)
+        db = db.save_milestone(ImmutableMilestone(sort_order=7), 2)
+        db = db.save_event(ImmutableEvent(sort_order=5), 3)
+        self.assertEqual(db.get_max_sort_order(), 7)
+
+    def test_is_correct_after_changes(self):
+        db1 = ImmutableDB()
+        db1 = db1.save_event(ImmutableEvent(sort_order=3), 1)
+        db1 = db1.save_event(ImmutableEvent(sort_order=9), 2)
+        db1 = db1.save_milestone(ImmutableMilestone(sort_order=5), 3)
+        db1.get_max_sort_order()
+        db2 = db1.save_event(ImmutableEvent(sort_order=12), 1)
+        db3 = db2.delete_event(1)
+        db4 = db3.delete_event(2)
+        db5 = db4.delete_milestone(3)
+        db6 = db3.load(events={4: ImmutableEvent(sort_order=20)})
+        self.assertEqual(db1.get_max_sort_order(), 9)
+        self.assertEqual(db2.get_max_sort_order(), 12)
+        self.assertEqual(db3.get_max_sort_order(), 9)
+        self.assertEqual(db4.get_max_sort_order(), 5)
+        self.assertEqual(db5.get_max_sort_order(), -1)
+        self.assertEqual(db6.get_max_sort_order(), 20)
+        self.assertEqual(db1.get_max_sort_order(), 9)
+
+
 class describe_saving_category(DBTestCase):
 
     def test_db_is_not_mutated(self):
@@ -698,6 +698,37 @@ class describe_query(UnitTestCase):
             [id(sub1), id(sub2)]
         )
 
+    def test_reuses_wrappers_between_queries(self):
+        first = self.db.get_all_events()
+        second = self.db.get_all_events()
+        self.assertEqual([id(event) for event in first], [id(event) for event in second])
+
+    def test_creates_new_wrappers_for_changed_items(self):
+        sub1, sub2 = self.db.find_event_with_ids([self.sub1.id, self.sub2.id])
+        event = self.db.new_event(text="event").save()
+        event = self.db.find_event_with_id(event.id)
+        sub1.text = "new sub1"
+        sub1.save()
+        new_sub1, new_sub2 = self.db.find_event_with_ids([self.sub1.id, self.sub2.id])
+        self.assertEqual(new_sub1.text, "new sub1")
+        self.assertFalse(new_sub2 is sub2)
+        self.assertTrue(self.db.find_event_with_id(event.id) is event)
+
+    def test_creates_new_wrappers_for_items_modified_without_saving(self):
+        sub1 = self.db.find_event_with_id(self.sub1.id)
+        sub1.text = "not saved"
+        self.assertEqual(self.db.find_event_with_id(self.sub1.id).text, "sub1")
+        category = self.db.get_category_by_name("category")
+        sub1 = self.db.find_event_with_id(self.sub1.id)
+        sub1.category = None
+        self.assertTrue(self.db.find_event_with_id(self.sub1.id).category is category)
+
+    def test_creates_new_wrappers_after_undo(self):
+        self.db.find_event_with_id(self.sub1.id).set_text("changed").save()
+        self.assertEqual(self.db.find_event_with_id(self.sub1.id).text, "changed")
+        self.db.undo()
+        self.assertEqual(self.db.find_event_with_id(self.sub1.id).text, "sub1")
+
     def setUp(self):
         self.db = MemoryDB()
         self.container = self.db.new_container(
@@ -718,6 +749,75 @@ class describe_query(UnitTestCase):
         ).save()
 
 
+class describe_bulk_loading(UnitTestCase):
+
+    def test_loads_items_that_refer_to_each_other(self):
+        parent = a_category_with(name="parent")
+        child = a_category_with(name="child", parent=parent)
+        event = an_event_with(text="event", category=child)
+        container, subevent = a_container(name="container", category=parent, sub_events=[
+            ("subevent", child),
+        ])
+        self.db.bulk_load(
+            categories=[child, parent],
+            events=[event, subevent],
+            containers=[container],
+            eras=[a_gregorian_era()]
+        )
+        self.assertEqual(
+            sorted((category.name, category.parent and category.parent.name) for category in self.db.get_categories()),
+            [("child", "parent"), ("parent", None)]
+        )
+        self.assertEqual(
+            sorted((event.text, event.category.name) for event in self.db.get_all_events()),
+            [("container", "parent"), ("event", "child"), ("subevent", "child")]
+        )
+        self.assertEqual(
+            [subevent.text for subevent in self.db.get_containers()[0].subevents],
+            ["subevent"]
+        )
+        self.assertEqual(len(self.db.get_all_eras()), 1)
+
+    def test_gives_new_events_increasing_sort_orders(self):
+        self.db.save_event(an_event_with(text="saved"))
+        self.db.bulk_load(events=[an_event_with(text="first"), an_event_with(text="second")])
+        self.assertEqual(
+            sorted((event.sort_order, event.text) for event in self.db.get_all_events()),
+            [(0, "saved"), (1, "first"), (2, "second")]
+        )
+
+    def test_notifies_once_and_creates_one_undo_step(self):
+        listener = Mock()
+        self.db.listen_for_any(listener)
+        self.db.bulk_load(
+            categories=[a_category_with(name="category")],
+            events=[an_event_with(text="first"), an_event_with(text="second")]
+        )
+        self.assertEqual(listener.call_count, 1)
+        self.db.undo()
+        self.assertEqual(self.db.get_all_events(), [])
+        self.assertEqual(self.db.get_categories(), [])
+
+    def test_fails_if_category_names_are_not_unique(self):
+        self.db.save_category(a_category_with(name="category"))
+        self.assertRaises(
+            TimelineIOError,
+            self.db.bulk_load,
+            categories=[a_category_with(name="category")]
+        )
+        self.assertEqual(len(self.db.get_categories()), 1)
+
+    def test_fails_if_category_is_not_loaded(self):
+        self.assertRaises(
+            TimelineIOError,
+            self.db.bulk_load,
+            events=[an_event_with(category=a_category_with(name="category"))]
+        )
+
+    def setUp(self):
+        self.db = MemoryDB()
+
+
 class describe_eras(UnitTestCase):
 
     def test_save(self):
@@ -740,6 +840,59 @@ class describe_eras(UnitTestCase):
         self.db = MemoryDB()
 
 
+class describe_snapshot(UnitTestCase):
+
+    def test_has_content_of_db_when_created(self):
+        self.db.save_event(an_event_with(text="first"))
+        snapshot = self.db.create_snapshot()
+        event = self.db.get_all_events()[0]
+        event.text = "changed"
+        self.db.save_event(event)
+        self.db.save_event(an_event_with(text="second"))
+        self.assertEqual([event.text for event in snapshot.get_all_events()], ["first"])
+        self.assertTrue(snapshot.is_read_only())
+
+    def test_has_view_of_db_when_created(self):
+        category = a_category_with(name="work")
+        self.db.save_category(category)
+        view_properties = ViewProperties()
+        view_properties.displayed_period = gregorian_period("1 Jan 2010", "1 Jan 2011")
+        view_properties.set_category_visible(category, False)
+        self.db.save_view_properties(view_properties)
+        snapshot = self.db.create_snapshot()
+        self.db.set_hidden_categories([])
+        self.assertEqual(snapshot.get_displayed_period(), view_properties.displayed_period)
+        self.assertEqual([category.name for category in snapshot.get_hidden_categories()], ["work"])
+
+    def setUp(self):
+        self.db = MemoryDB()
+
+
+class describe_icon_texts(UnitTestCase):
+
+    def test_encodes_icons_without_text_once(self):
+        self.db.save_event(an_event_with(text="new").set_icon("new icon"))
+        self.db.save_event(an_event_with(text="read").set_icon("read icon", "read text"))
+        icon_string = Mock(side_effect=lambda icon: "encoded " + icon)
+        self.db.store_icon_texts(icon_string)
+        self.db.store_icon_texts(icon_string)
+        self.assertEqual(
+            sorted(event.get_icon_text() for event in self.db.get_all_events()),
+            ["encoded new icon", "read text"]
+        )
+        icon_string.assert_called_once_with("new icon")
+
+    def test_does_not_create_undo_step(self):
+        self.db.save_event(an_event_with(text="new").set_icon("new icon"))
+        status = self.db.transactions_status()
+        self.db.store_icon_texts(lambda icon: "encoded " + icon)
+        self.assertEqual(self.db.transactions_status()[0], status[0])
+        self.assertEqual(len(self.db.transactions_status()[2]), len(status[2]))
+
+    def setUp(self):
+        self.db = MemoryDB()
+
+
 def replace_category_with_name(tree):
     return [(category.get_name(), replace_category_with_name(child_tree))
             for (category, child_tree) in tree]
@@ -0,0 +1,108 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import random
+
+from timelinelib.canvas.data import periodindex
+from timelinelib.canvas.data.periodindex import PeriodIndex
+from timelinelib.test.cases.unit import UnitTestCase
+from timelinelib.test.utils import numeric_period
+
+
+class describe_period_index(UnitTestCase):
+
+    def test_finds_overlapping_periods(self):
+        index = PeriodIndex([
+            (1, numeric_period(0, 5)),
+            (2, numeric_period(6, 8)),
+            (3, numeric_period(10, 20)),
+        ])
+        self.assertEqual(sorted(index.get_ids_overlapping(numeric_period(4, 7))), [1, 2])
+        self.assertEqual(sorted(index.get_ids_overlapping(numeric_period(12, 13))), [3])
+        self.assertEqual(index.get_ids_overlapping(numeric_period(21, 30)), [])
+
+    def test_includes_periods_touching_borders(self):
+        index = PeriodIndex([
+            (1, numeric_period(0, 5)),
+            (2, numeric_period(10, 10)),
+        ])
+        self.assertEqual(sorted(index.get_ids_overlapping(numeric_period(5, 10))), [1, 2])
+
+    def test_skips_missing_periods(self):
+        index = PeriodIndex([(1, None), (2, numeric_period(1, 2))])
+        self.assertEqual(len(index), 1)
+
+    def test_finds_periods_by_start_time(self):
+        index = PeriodIndex()
+        for id_ in range(3 * periodindex.CHUNK_SIZE):
+            index = index.add(id_, numeric_period(id_ // 2, 1000))
+        self.assertEqual(
+            sorted(index.get_ids_starting_at_or_before(10)),
+            list(range(22))
+        )
+        self.assertEqual(
+            sorted(index.get_ids_starting_at_or_after(80)),
+            list(range(160, 3 * periodindex.CHUNK_SIZE))
+        )
+        self.assertEqual(index.get_ids_starting_at_or_before(-1), [])
+        self.assertEqual(index.get_ids_starting_at_or_after(1000), [])
+
+    def test_add_and_remove_maintain_immutability(self):
+        index1 = PeriodIndex([(1, numeric_period(0, 5))])
+        index2 = index1.add(2, numeric_period(3, 4))
+        index3 = index2.remove(1, numeric_period(0, 5))
+        period = numeric_period(0, 10)
+        self.assertEqual(sorted(index1.get_ids_overlapping(period)), [1])
+        self.assertEqual(sorted(index2.get_ids_overlapping(period)), [1, 2])
+        self.assertEqual(sorted(index3.get_ids_overlapping(period)), [2])
+
+    def test_remove_of_missing_entry_fails(self):
+        index = PeriodIndex([(1, numeric_period(0, 5))])
+        with self.assertRaises(ValueError):
+            index.remove(2, numeric_period(0, 5))
+
+    def test_handles_many_periods_with_same_start(self):
+        index = PeriodIndex()
+        for id_ in range(3 * periodindex.CHUNK_SIZE):
+            index = index.add(id_, numeric_period(7, 7 + id_))
+        for id_ in range(0, 3 * periodindex.CHUNK_SIZE, 2):
+            index = index.remove(id_, numeric_period(7, 7 + id_))
+        self.assertEqual(
+            sorted(index.get_ids_overlapping(numeric_period(0, 7 + 100))),
+            list(range(1, 3 * periodindex.CHUNK_SIZE, 2))
+        )
+
+    def test_gives_same_result_as_inside_period(self):
+        rnd = random.Random(0)
+        periods = {}
+        index = PeriodIndex()
+        for id_ in range(1000):
+            if periods and rnd.random() < 0.3:
+                removed_id = rnd.choice(list(periods))
+                index = index.remove(removed_id, periods.pop(removed_id))
+            start = rnd.randint(0, 10000)
+            periods[id_] = numeric_period(start, start + rnd.randint(0, 300))
+            index = index.add(id_, periods[id_])
+        self.assertEqual(len(index), len(periods))
+        for _ in range(100):
+            start = rnd.randint(-100, 10100)
+            query = numeric_period(start, start + rnd.randint(0, 500))
+            self.assertEqual(
+                sorted(index.get_ids_overlapping(query)),
+                sorted(id_ for id_, period in periods.items() if period.inside_period(query))
+            )
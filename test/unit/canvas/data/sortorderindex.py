@@ -0,0 +1,58 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import random
+
+from timelinelib.canvas.data import sortorderindex
+from timelinelib.canvas.data.sortorderindex import SortOrderIndex
+from timelinelib.test.cases.unit import UnitTestCase
+
+
+class describe_sort_order_index(UnitTestCase):
+
+    def test_finds_max_sort_order(self):
+        self.assertEqual(SortOrderIndex().get_max(-1), -1)
+        self.assertEqual(SortOrderIndex([4, None, 9, 2]).get_max(), 9)
+
+    def test_add_and_remove_maintain_immutability(self):
+        index1 = SortOrderIndex([1, 5])
+        index2 = index1.add(7)
+        index3 = index2.remove(7).remove(5)
+        self.assertEqual((index1.get_max(), len(index1)), (5, 2))
+        self.assertEqual((index2.get_max(), len(index2)), (7, 3))
+        self.assertEqual((index3.get_max(), len(index3)), (1, 1))
+
+    def test_remove_of_missing_sort_order_fails(self):
+        with self.assertRaises(ValueError):
+            SortOrderIndex([1, 5]).remove(3)
+
+    def test_gives_same_max_as_list(self):
+        rnd = random.Random(0)
+        sort_orders = []
+        index = SortOrderIndex()
+        for _ in range(5 * sortorderindex.CHUNK_SIZE):
+            if sort_orders and rnd.random() < 0.4:
+                sort_order = rnd.choice(sort_orders)
+                sort_orders.remove(sort_order)
+                index = index.remove(sort_order)
+            else:
+                sort_order = rnd.randint(0, 1000)
+                sort_orders.append(sort_order)
+                index = index.add(sort_order)
+            self.assertEqual(index.get_max(-1), max(sort_orders, default=-1))
+            self.assertEqual(len(index), len(sort_orders))
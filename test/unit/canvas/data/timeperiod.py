@@ -93,6 +93,14 @@ class time_period_spec(UnitTestCase):
             return TimePeriod(ATime(50), ATime(60))
         self.assertEqNeImplementationIsCorrect(a_time_period, TIME_PERIOD_MODIFIERS)
 
+    def test_can_be_hashed(self):
+        periods = {
+            TimePeriod(ATime(50), ATime(60)),
+            TimePeriod(ATime(50), ATime(60)),
+            TimePeriod(ATime(50), ATime(61)),
+        }
+        self.assertEqual(len(periods), 2)
+
     def test_overlaps(self):
         p = TimePeriod(ATime(10), ATime(20))
         self.assertFalse(p.overlaps(TimePeriod(ATime(0), ATime(9))))
@@ -214,6 +214,18 @@ class describe_transactions(UnitTestCase):
         self.transactions.clear()
         self.assertEqual(fn.call_count, 1)
 
+    def test_replaced_value_does_not_add_history(self):
+        with self.transactions.new("t1") as t:
+            t.append("1")
+        fn = Mock()
+        self.transactions.listen_for_any(fn)
+        self.transactions.replace_value(ImmutableText("2"))
+        self.assertEqual(self.transactions.status, (1, False, [
+            (self.INITIAL, ImmutableText("")),
+            ("t1", ImmutableText("2")),
+        ]))
+        self.assertEqual(fn.call_count, 0)
+
     def assertHasValue(self, value):
         self.assertEqual(self.transactions.value, value)
 
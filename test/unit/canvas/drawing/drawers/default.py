@@ -55,6 +55,17 @@ class describe_default_drawer(WxAppTestCase):
         self.when_timeline_is_drawn()
         self.assert_text_drawn_above("mike's birthday", BASELINE_Y_POS)
 
+    def test_reuses_background_layer_until_it_changes(self):
+        background_drawer = Mock(DefaultBackgroundDrawer)
+        self.drawer.set_background_drawer(background_drawer)
+        appearance = Appearance()
+        self.drawer.draw(self.dc, self.timeline, self.view_properties, appearance)
+        self.drawer.draw(self.dc, self.timeline, self.view_properties, appearance)
+        self.assertEqual(background_drawer.draw.call_count, 1)
+        appearance.set_bg_colour((0, 0, 0))
+        self.drawer.draw(self.dc, self.timeline, self.view_properties, appearance)
+        self.assertEqual(background_drawer.draw.call_count, 2)
+
     def given_event(self, name, start, end, progress=0):
         event = Event().update(start, end, name)
         event.set_progress(progress)
@@ -0,0 +1,74 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import random
+
+import wx
+
+from timelinelib.canvas.drawing.rectindex import RectIndex
+from timelinelib.test.cases.unit import UnitTestCase
+
+
+class describe_rect_index(UnitTestCase):
+
+    def test_finds_rects_containing_point(self):
+        index = RectIndex([
+            ("a", wx.Rect(0, 0, 10, 10)),
+            ("b", wx.Rect(5, 5, 10, 10)),
+            ("c", wx.Rect(100, 100, 10, 10)),
+        ])
+        self.assertEqual(index.get_values_at(7, 7), ["a", "b"])
+        self.assertEqual(index.get_values_at(12, 12), ["b"])
+        self.assertEqual(index.get_values_at(50, 50), [])
+
+    def test_finds_rects_intersecting_rect(self):
+        index = RectIndex([
+            ("a", wx.Rect(0, 0, 10, 10)),
+            ("b", wx.Rect(500, 0, 10, 10)),
+            ("c", wx.Rect(200, 20, 10, 10)),
+        ])
+        self.assertEqual(index.get_values_in_rect(wx.Rect(5, 5, 200, 20)), ["a", "c"])
+
+    def test_finds_wide_rects(self):
+        index = RectIndex([
+            ("wide", wx.Rect(-100000, 10, 200000, 10)),
+            ("tall", wx.Rect(10, -100000, 10, 200000)),
+        ])
+        self.assertEqual(index.get_values_at(5000, 15), ["wide"])
+        self.assertEqual(index.get_values_at(15, 5000), ["tall"])
+        self.assertEqual(index.get_values_in_rect(wx.Rect(0, 0, 30, 30)), ["wide", "tall"])
+
+    def test_returns_same_values_as_checking_all_rects(self):
+        rnd = random.Random(0)
+        items = [
+            (value, wx.Rect(rnd.randint(-200, 1000), rnd.randint(-200, 600),
+                            rnd.randint(0, 300), rnd.randint(0, 40)))
+            for value in range(300)
+        ]
+        index = RectIndex(items)
+        for _ in range(200):
+            (x, y) = (rnd.randint(-300, 1100), rnd.randint(-300, 700))
+            self.assertEqual(
+                index.get_values_at(x, y),
+                [value for (value, rect) in items if rect.Contains(wx.Point(x, y))]
+            )
+            query = wx.Rect(x, y, rnd.randint(1, 400), rnd.randint(1, 400))
+            self.assertEqual(
+                index.get_values_in_rect(query),
+                [value for (value, rect) in items if rect.Intersects(query)]
+            )
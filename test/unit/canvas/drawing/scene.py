@@ -16,11 +16,17 @@
 # along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import random
+
+from timelinelib.calendar.gregorian.time import GregorianDelta
 from timelinelib.canvas.appearance import Appearance
+from timelinelib.canvas.drawing.scene import PAIRWISE_LAYOUT
+from timelinelib.canvas.drawing.scene import SWEEP_LINE_LAYOUT
 from timelinelib.canvas.drawing.scene import TimelineScene
 from timelinelib.canvas.drawing.viewproperties import ViewProperties
 from timelinelib.canvas.data.memorydb.db import MemoryDB
 from timelinelib.canvas.data import Event
+from timelinelib.canvas.data import TimePeriod
 from timelinelib.test.cases.wxapp import WxAppTestCase
 from timelinelib.test.utils import a_category_with
 from timelinelib.test.utils import gregorian_period
@@ -169,3 +175,132 @@ class describe_scene(WxAppTestCase):
         self.scene.set_inner_padding(self.inner_padding)
         self.scene.set_baseline_padding(self.baseline_padding)
         self.scene.create()
+
+
+class describe_sweep_line_layout(WxAppTestCase):
+
+    def test_gives_same_rects_as_pairwise_layout(self):
+        for seed in range(5):
+            self.db = a_db_with_random_events(random.Random(seed), self.view_properties)
+            for outer_padding in [0, 5]:
+                self.assertEqual(
+                    self.create_rects(SWEEP_LINE_LAYOUT, outer_padding),
+                    self.create_rects(PAIRWISE_LAYOUT, outer_padding)
+                )
+
+    def create_rects(self, layout, outer_padding):
+        scene = TimelineScene((800, 400), self.db, self.view_properties, lambda text: (len(text) * 3, 10), Appearance())
+        scene.set_outer_padding(outer_padding)
+        scene.create(layout)
+        return [
+            (event.id, rect.X, rect.Y, rect.Width, rect.Height)
+            for (event, rect) in scene.event_data
+        ]
+
+    def setUp(self):
+        WxAppTestCase.setUp(self)
+        self.view_properties = ViewProperties()
+
+
+class describe_stable_event_rows(WxAppTestCase):
+
+    def test_keeps_rows_of_events_when_scrolling(self):
+        self.given_event("2 Jan 2010", "4 Jan 2010")
+        row_2_event = self.given_event("3 Jan 2010", "9 Jan 2010")
+        self.given_displayed_period("1 Jan 2010", "12 Jan 2010")
+        first_scene = self.create_scene()
+        self.given_displayed_period("5 Jan 2010", "16 Jan 2010")
+        self.assertEqual(
+            self.get_rect(self.create_scene(first_scene), row_2_event).Y,
+            self.get_rect(first_scene, row_2_event).Y
+        )
+        self.assertTrue(
+            self.get_rect(self.create_scene(), row_2_event).Y <
+            self.get_rect(first_scene, row_2_event).Y
+        )
+
+    def test_moves_events_that_no_longer_fit_in_their_row(self):
+        left_event = self.given_event("3 Jan 2010", "3 Jan 2010")
+        right_event = self.given_event("8 Jan 2010", "8 Jan 2010")
+        self.given_displayed_period("1 Jan 2010", "12 Jan 2010")
+        first_scene = self.create_scene()
+        self.assertEqual(self.get_rect(first_scene, left_event).Y, self.get_rect(first_scene, right_event).Y)
+        self.given_displayed_period("1 Jan 2009", "12 Jan 2011")
+        scene = self.create_scene(first_scene)
+        self.assertTrue(self.get_rect(scene, right_event).Y < self.get_rect(scene, left_event).Y)
+
+    def test_never_gives_overlapping_rects(self):
+        rnd = random.Random(0)
+        self.db = a_db_with_random_events(rnd, self.view_properties)
+        scene = None
+        for _ in range(10):
+            start = human_time_to_gregorian("1 Jan 2010") + GregorianDelta.from_days(rnd.randint(-20, 40))
+            self.view_properties.displayed_period = TimePeriod(start, start + GregorianDelta.from_days(rnd.randint(5, 120)))
+            scene = self.create_scene(scene)
+            self.assertNoOverlappingRects(scene)
+
+    def assertNoOverlappingRects(self, scene):
+        rects = [rect for (event, rect) in scene.event_data if not event.is_milestone()]
+        for (index, rect) in enumerate(rects):
+            for other_rect in rects[:index]:
+                # Rects that are next to each other may overlap with a few
+                # pixels
+                self.assertFalse(
+                    rect.X + 2 < other_rect.X + other_rect.Width and
+                    other_rect.X + 2 < rect.X + rect.Width and
+                    rect.Y < other_rect.Y + other_rect.Height and
+                    other_rect.Y < rect.Y + rect.Height and
+                    not self.is_subevent_in_container(scene, rect, other_rect)
+                )
+
+    def is_subevent_in_container(self, scene, rect, other_rect):
+        events = dict((id(r), e) for (e, r) in scene.event_data)
+        event, other_event = events[id(rect)], events[id(other_rect)]
+        return event.is_subevent() and event.container is other_event
+
+    def given_event(self, start, end):
+        event = Event().update(human_time_to_gregorian(start), human_time_to_gregorian(end), "event-text")
+        self.db.save_event(event)
+        return event
+
+    def given_displayed_period(self, start, end):
+        self.view_properties.displayed_period = gregorian_period(start, end)
+
+    def create_scene(self, previous_scene=None):
+        scene = TimelineScene((800, 400), self.db, self.view_properties, lambda text: (len(text) * 3, 10), Appearance())
+        scene.create(previous_scene=previous_scene)
+        return scene
+
+    def get_rect(self, scene, event):
+        for (scene_event, rect) in scene.event_data:
+            if scene_event.id == event.id:
+                return rect
+
+    def setUp(self):
+        WxAppTestCase.setUp(self)
+        self.db = MemoryDB()
+        self.view_properties = ViewProperties()
+
+
+def a_db_with_random_events(rnd, view_properties):
+    db = MemoryDB()
+    start = human_time_to_gregorian("1 Jan 2010")
+    view_properties.displayed_period = gregorian_period("1 Jan 2010", "1 Apr 2010")
+
+    def random_period():
+        event_start = start + GregorianDelta.from_days(rnd.randint(-10, 95))
+        return (event_start, event_start + GregorianDelta.from_days(rnd.choice([0, 0, 1, 3, 10, 40])))
+
+    def random_text():
+        return "x" * rnd.randint(0, 30)
+    for _ in range(40):
+        db.save_event(Event().update(*random_period(), text=random_text()))
+    for _ in range(3):
+        container = db.new_container(text=random_text()).save()
+        for _ in range(rnd.randint(1, 8)):
+            subevent = db.new_subevent(container=container, text=random_text())
+            subevent.update_period(*random_period())
+            subevent.save()
+    for _ in range(5):
+        db.new_milestone(text=random_text(), time_period=gregorian_period("1 Feb 2010", "1 Feb 2010")).save()
+    return db
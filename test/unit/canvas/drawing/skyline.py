@@ -0,0 +1,67 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import random
+
+from timelinelib.canvas.drawing.skyline import Skyline
+from timelinelib.test.cases.unit import UnitTestCase
+
+
+class describe_skyline(UnitTestCase):
+
+    def test_finds_nothing_when_empty(self):
+        skyline = Skyline([(0, 10)])
+        self.assertEqual(skyline.get_max(0, 10), None)
+
+    def test_intervals_touching_end_points_overlap(self):
+        skyline = Skyline([(0, 10), (10, 20), (21, 30)])
+        skyline.insert(0, 10, 1)
+        self.assertEqual(skyline.get_max(10, 20), 1)
+        self.assertEqual(skyline.get_max(21, 30), None)
+
+    def test_inverted_intervals_overlap_intervals_covering_the_gap(self):
+        skyline = Skyline([(0, 10), (4, 6), (12, 20)])
+        skyline.insert(0, 10, 1)
+        skyline.insert(12, 20, 2)
+        self.assertEqual(skyline.get_max(6, 4), 1)
+        self.assertEqual(skyline.get_max(13, 9), None)
+        skyline.insert(6, 4, 3)
+        self.assertEqual(skyline.get_max(4, 6), 3)
+
+    def test_fails_for_unknown_interval(self):
+        skyline = Skyline([(0, 10)])
+        with self.assertRaises(ValueError):
+            skyline.insert(0, 5, 1)
+
+    def test_gives_same_result_as_comparing_all_intervals(self):
+        rnd = random.Random(0)
+        intervals = []
+        for _ in range(300):
+            lo = rnd.randint(-50, 500)
+            intervals.append((lo, lo + rnd.randint(-5, 60)))
+        skyline = Skyline(intervals)
+        inserted = []
+        for (lo, hi) in intervals:
+            expected = None
+            for (other_lo, other_hi, value) in inserted:
+                if other_lo <= hi and lo <= other_hi and (expected is None or value > expected):
+                    expected = value
+            self.assertEqual(skyline.get_max(lo, hi), expected)
+            value = rnd.randint(0, 1000)
+            skyline.insert(lo, hi, value)
+            inserted.append((lo, hi, value))
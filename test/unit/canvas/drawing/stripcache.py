@@ -0,0 +1,98 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from timelinelib.calendar.num.time import NumTime
+from timelinelib.calendar.num.timetype.strips.numstrip import NumStrip
+from timelinelib.canvas.data import TimePeriod
+from timelinelib.canvas.drawing.stripcache import StripCache
+from timelinelib.test.cases.unit import UnitTestCase
+
+
+class describe_strip_cache(UnitTestCase):
+
+    def test_returns_strips_covering_period(self):
+        self.assertEqual(
+            self.cache.get_periods(self.strip, num_period(5, 31)),
+            [num_period(0, 10), num_period(10, 20), num_period(20, 30), num_period(30, 40)]
+        )
+        self.assertEqual(
+            self.cache.get_periods(self.strip, num_period(10, 20)),
+            [num_period(10, 20)]
+        )
+
+    def test_extends_cached_strips_when_panning(self):
+        self.cache.get_periods(self.strip, num_period(100, 200))
+        self.strip.increments = 0
+        self.assertEqual(
+            self.cache.get_periods(self.strip, num_period(120, 220)),
+            [num_period(start, start + 10) for start in range(120, 220, 10)]
+        )
+        self.assertEqual(self.strip.increments, 2)
+        self.strip.increments = 0
+        self.assertEqual(
+            self.cache.get_periods(self.strip, num_period(80, 180)),
+            [num_period(start, start + 10) for start in range(80, 180, 10)]
+        )
+        self.assertEqual(self.strip.increments, 2)
+
+    def test_does_not_share_strips_with_different_keys(self):
+        self.cache.get_periods(self.strip, num_period(0, 100))
+        self.assertEqual(
+            self.cache.get_periods(CountingNumStrip(25), num_period(0, 100)),
+            [num_period(start, start + 25) for start in range(0, 100, 25)]
+        )
+
+    def test_restarts_when_period_is_far_away(self):
+        self.cache.get_periods(self.strip, num_period(0, 100))
+        self.assertEqual(
+            self.cache.get_periods(self.strip, num_period(1000, 1020)),
+            [num_period(1000, 1010), num_period(1010, 1020)]
+        )
+
+    def test_caches_labels(self):
+        self.assertEqual(self.cache.get_label(self.strip, NumTime(10)), "10")
+        self.assertEqual(self.cache.get_label(self.strip, NumTime(10)), "10")
+        self.assertEqual(self.cache.get_label(self.strip, NumTime(10), True), "10")
+        self.assertEqual(self.strip.labels, 2)
+
+    def setUp(self):
+        self.cache = StripCache()
+        self.strip = CountingNumStrip(10)
+
+
+class CountingNumStrip(NumStrip):
+
+    def __init__(self, size):
+        NumStrip.__init__(self, size)
+        self.increments = 0
+        self.labels = 0
+
+    def get_cache_key(self):
+        return (NumStrip, self.size)
+
+    def label(self, time, major=False):
+        self.labels += 1
+        return NumStrip.label(self, time, major)
+
+    def increment(self, time):
+        self.increments += 1
+        return NumStrip.increment(self, time)
+
+
+def num_period(start, end):
+    return TimePeriod(NumTime(start), NumTime(end))
@@ -0,0 +1,66 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from timelinelib.canvas.drawing.textsizecache import TextSizeCache
+from timelinelib.test.cases.unit import UnitTestCase
+
+
+class describe_text_size_cache(UnitTestCase):
+
+    def test_measures_text_only_once(self):
+        self.assertEqual(self.get_text_size("hello"), (5, 10))
+        self.assertEqual(self.get_text_size("hello"), (5, 10))
+        self.assertEqual(self.measured, ["hello"])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_measures_text_again_when_font_changes(self):
+        self.get_text_size("hello")
+        self.cache.set_font("font-b")
+        self.get_text_size("hello")
+        self.assertEqual(self.measured, ["hello", "hello"])
+        self.assertEqual(len(self.cache), 1)
+
+    def test_keeps_texts_when_same_font_is_set(self):
+        self.get_text_size("hello")
+        self.cache.set_font("font-a")
+        self.get_text_size("hello")
+        self.assertEqual(self.measured, ["hello"])
+
+    def test_drops_least_recently_used_text_when_full(self):
+        self.get_text_size("a")
+        self.get_text_size("b")
+        self.get_text_size("c")
+        self.get_text_size("a")
+        self.get_text_size("d")
+        self.assertEqual(len(self.cache), 3)
+        self.get_text_size("a")
+        self.get_text_size("c")
+        self.get_text_size("b")
+        self.assertEqual(self.measured, ["a", "b", "c", "d", "b"])
+
+    def setUp(self):
+        self.measured = []
+        self.cache = TextSizeCache(max_size=3)
+        self.cache.set_font("font-a")
+
+    def get_text_size(self, text):
+        return self.cache.get_text_size(text, self.measure)
+
+    def measure(self, text):
+        self.measured.append(text)
+        return (len(text), 10)
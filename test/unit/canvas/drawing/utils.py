@@ -17,13 +17,17 @@
 
 
 from random import random
+from unittest.mock import patch
+import unittest
 
 from timelinelib.calendar.gregorian.timetype import GregorianTimeType
+from timelinelib.calendar.num.time import NumTime
 from timelinelib.calendar.num.timetype.timetype import NumTimeType
 from timelinelib.canvas.data.timeperiod import TimePeriod
 from timelinelib.canvas.drawing.utils import darken_color
 from timelinelib.canvas.drawing.utils import lighten_color
 from timelinelib.canvas.drawing.utils import Metrics
+from timelinelib.canvas.drawing.utils import numpy
 from timelinelib.test.cases.unit import UnitTestCase
 from timelinelib.test.utils import human_time_to_gregorian
 
@@ -97,6 +101,69 @@ class describe_numeric_overflow_error(MetricsTestCase):
         self.assertEqual(WIDTH + 1, self.metrics.calc_x(time))
 
 
+class describe_calc_x_array(MetricsTestCase):
+
+    def test_gives_same_positions_as_calc_x_for_gregorian_times(self):
+        self.given_a_gregorian_scene_period()
+        times = self.a_few_gregorian_times()
+        self.assertEqual(
+            self.metrics.calc_x_array([time.to_number() for time in times]),
+            [self.metrics.calc_x(time) for time in times]
+        )
+
+    def test_gives_same_positions_without_numpy(self):
+        self.given_a_gregorian_scene_period()
+        times = self.a_few_gregorian_times()
+        with patch("timelinelib.canvas.drawing.utils.numpy", None):
+            self.assertEqual(
+                self.metrics.calc_x_array([time.to_number() for time in times]),
+                [self.metrics.calc_x(time) for time in times]
+            )
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_gives_same_positions_with_numpy(self):
+        self.given_a_gregorian_scene_period()
+        times = self.a_few_gregorian_times()
+        start = START_TIME.to_number()
+        self.assertEqual(
+            self.metrics._calc_x_array_with_numpy(
+                [time.to_number() for time in times],
+                start,
+                END_TIME.to_number() - start
+            ),
+            [self.metrics.calc_x(time) for time in times]
+        )
+
+    def test_gives_same_positions_as_calc_x_for_numeric_times(self):
+        self.given_a_numeric_scene_period(NumTime(0), NumTime(3))
+        times = [NumTime(value) for value in [-7, 0, 0.5, 1, 2.25, 3, 100]]
+        self.assertEqual(
+            self.metrics.calc_x_array([time.to_number() for time in times]),
+            [self.metrics.calc_x(time) for time in times]
+        )
+
+    def test_overflow_is_handled(self):
+        self.given_a_numeric_scene_period(NumTime(0), NumTime(1))
+        self.assertEqual(
+            self.metrics.calc_x_array([-10 ** 400, 1, 10 ** 400]),
+            [-1, WIDTH, WIDTH + 1]
+        )
+
+    def test_no_times_give_no_positions(self):
+        self.given_a_gregorian_scene_period()
+        self.assertEqual(self.metrics.calc_x_array([]), [])
+
+    def a_few_gregorian_times(self):
+        return [
+            human_time_to_gregorian("31 Dec 9987 23:59"),
+            START_TIME,
+            human_time_to_gregorian("1 Jan 9988 00:00:17"),
+            human_time_to_gregorian("1 Jan 9988 00:00:45"),
+            END_TIME,
+            human_time_to_gregorian("1 Jan -4700"),
+        ]
+
+
 class describe_drawing_utils(UnitTestCase):
 
     def test_darken_color_good_factor(self):
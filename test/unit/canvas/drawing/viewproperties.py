@@ -16,6 +16,8 @@
 # along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
 
 
+from unittest.mock import Mock
+
 from timelinelib.canvas.drawing.viewproperties import ViewProperties
 from timelinelib.test.cases.unit import UnitTestCase
 from timelinelib.test.utils import an_event_with, a_container, a_category_with
@@ -85,6 +87,14 @@ class describe_event_visiblity(Base):
         self.view_properties.set_category_visible(self.work, False)
         self.assertEventWithCategoryVisible(self.boring_meetings)
 
+    def test_visibility_follows_changes_to_individual_view(self):
+        self.view_properties.set_category_visible(self.work, False)
+        self.assertEventWithCategoryHidden(self.boring_meetings)
+        self.view_properties.view_cats_individually = True
+        self.assertEventWithCategoryVisible(self.boring_meetings)
+        self.view_properties.change_view_cats_individually(False)
+        self.assertEventWithCategoryHidden(self.boring_meetings)
+
 
 class describe_event_filtering(Base):
 
@@ -128,6 +138,13 @@ class describe_event_filtering(Base):
         self.view_properties.set_category_visible(self.work, False)
         self.assertEqual(self.view_properties.filter_events(events), [])
 
+    def test_filters_done_events_when_hiding_events_done(self):
+        self.write_report.set_progress(100)
+        events = [self.write_report, self.play_football]
+        self.assertEqual(self.view_properties.filter_events(events), events)
+        self.view_properties.hide_events_done = True
+        self.assertEqual(self.view_properties.filter_events(events), [self.play_football])
+
 
 class describe_highlight(Base):
 
@@ -185,3 +202,51 @@ class describe_highlight(Base):
         self.event1.set_id(self.new_id())
         self.event2 = an_event_with(text="2")
         self.event2.set_id(self.new_id())
+
+
+class describe_selection(Base):
+
+    def test_selected_event_ids_keep_selection_order(self):
+        self.view_properties.set_selected(self.event2)
+        self.view_properties.set_selected(self.event1)
+        self.view_properties.set_selected(self.event2)
+        self.assertEqual(
+            self.view_properties.get_selected_event_ids(),
+            [self.event2.get_id(), self.event1.get_id()]
+        )
+
+    def test_can_select_and_deselect_many_events_with_one_notification(self):
+        self.view_properties.set_events_selected([self.event1, self.event2])
+        self.view_properties.set_events_selected([self.event1], False)
+        self.assertFalse(self.view_properties.is_selected(self.event1))
+        self.assertTrue(self.view_properties.is_selected(self.event2))
+        self.assertEqual(self.listener.call_count, 2)
+
+    def test_does_not_notify_when_selection_is_unchanged(self):
+        self.view_properties.set_events_selected([self.event1])
+        self.view_properties.set_events_selected([self.event1])
+        self.view_properties.set_events_selected([self.event2], False)
+        self.view_properties.set_only_selected(self.event1, True)
+        self.assertEqual(self.listener.call_count, 1)
+
+    def test_gives_count_and_first_of_selected_events(self):
+        self.assertRaises(IndexError, self.view_properties.get_first_selected_event_id)
+        self.view_properties.set_all_selected([self.event2, self.event1])
+        self.assertEqual(self.view_properties.get_selected_event_count(), 2)
+        self.assertEqual(self.view_properties.get_first_selected_event_id(), self.event2.get_id())
+
+    def test_clear_db_specific_clears_selection_and_sticky_balloons(self):
+        self.view_properties.set_selected(self.event1)
+        self.view_properties.set_event_has_sticky_balloon(self.event1)
+        self.view_properties.clear_db_specific()
+        self.assertEqual(self.view_properties.get_selected_event_ids(), [])
+        self.assertFalse(self.view_properties.event_has_sticky_balloon(self.event1))
+
+    def setUp(self):
+        Base.setUp(self)
+        self.event1 = an_event_with(text="1")
+        self.event1.set_id(self.new_id())
+        self.event2 = an_event_with(text="2")
+        self.event2.set_id(self.new_id())
+        self.listener = Mock()
+        self.view_properties.listen_for_any(self.listener)
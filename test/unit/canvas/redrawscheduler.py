@@ -0,0 +1,86 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from unittest.mock import Mock
+
+from timelinelib.canvas.redrawscheduler import RedrawScheduler
+from timelinelib.monitoring import Monitoring
+from timelinelib.test.cases.unit import UnitTestCase
+
+
+class describe_redraw_scheduler(UnitTestCase):
+
+    def test_redraws_at_once_without_call_after(self):
+        self.scheduler.request()
+        self.scheduler.request(fast_draw=True)
+        self.assertEqual(self.redraws, [False, True])
+        self.assertEqual(self.monitoring.collapsed_redraw_count, 0)
+
+    def test_collapses_requests_until_scheduled_redraw(self):
+        self.scheduler.set_call_after(self.call_after)
+        self.scheduler.request()
+        self.scheduler.request()
+        self.scheduler.request()
+        self.assertEqual(self.redraws, [])
+        self.run_scheduled()
+        self.assertEqual(self.redraws, [False])
+        self.assertEqual(self.monitoring.collapsed_redraw_count, 2)
+
+    def test_flush_redraws_at_once(self):
+        self.scheduler.set_call_after(self.call_after)
+        self.scheduler.request()
+        self.scheduler.flush()
+        self.run_scheduled()
+        self.assertEqual(self.redraws, [False])
+
+    def test_flush_does_nothing_when_no_redraw_is_scheduled(self):
+        self.scheduler.flush()
+        self.assertEqual(self.redraws, [])
+
+    def test_cancel_drops_scheduled_redraw(self):
+        self.scheduler.set_call_after(self.call_after)
+        self.scheduler.request()
+        self.scheduler.cancel()
+        self.run_scheduled()
+        self.scheduler.flush()
+        self.assertEqual(self.redraws, [])
+
+    def test_draws_fast_only_if_all_requests_are_fast(self):
+        self.scheduler.set_call_after(self.call_after)
+        self.scheduler.request(fast_draw=True)
+        self.scheduler.request(fast_draw=True)
+        self.run_scheduled()
+        self.scheduler.request(fast_draw=True)
+        self.scheduler.request(fast_draw=False)
+        self.run_scheduled()
+        self.assertEqual(self.redraws, [True, False])
+
+    def setUp(self):
+        self.redraws = []
+        self.scheduled = []
+        self.monitoring = Monitoring(Mock())
+        self.scheduler = RedrawScheduler(self.redraws.append, self.monitoring)
+
+    def call_after(self, fn):
+        self.scheduled.append(fn)
+
+    def run_scheduled(self):
+        scheduled = self.scheduled
+        self.scheduled = []
+        for fn in scheduled:
+            fn()
@@ -64,20 +64,16 @@ class describe_svg_drawing_algorithm(UnitTestCase):
         self.assertSvgEqual(group.getXML(), '<g  >\n<line y1="106" x2="200" style="stroke:black; stroke-width:1; " x1="200" y2="200"  />\n<circle cy="200" cx="200" r="2" style="stroke:black; stroke-width:1; fill:none; "  />\n</g>\n')
 
     def test_can_draw_minor_strip_label(self):
-        strip = Mock()
-        strip.label.return_value = "Label"
         strip_period = Mock()
         self.scene.x_pos_for_time.return_value = 100
-        self.scene.minor_strip = strip
+        self.scene.get_minor_strip_label.return_value = "Label"
         text = self.svg._draw_minor_strip_label(strip_period)
         self.assertSvgEqual(text.getXML(), '<text style="font-size:9px; font-family:Verdana; stroke-dasharray:(2, 2); text-anchor:left; " y="195" x="91"  >\nLabel</text>\n')
 
     def test_can_draw_major_strip_label(self):
-        strip = Mock()
-        strip.label.return_value = "2016"
         strip_period = Mock()
         self.scene.x_pos_for_time.return_value = 100
-        self.scene.major_strip = strip
+        self.scene.get_major_strip_label.return_value = "2016"
         text = self.svg._draw_major_strip_label(strip_period)
         self.assertSvgEqual(text.getXML(), '<text style="font-size:14px; font-family:Verdana; text-anchor:left; " y="19" x="100"  >\n2016</text>\n')
 
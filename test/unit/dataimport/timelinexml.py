@@ -16,16 +16,25 @@
 # along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import base64
 import os
 
 import wx
 
+from timelinelib.calendar.gregorian.timetype import GregorianTimeType
+from timelinelib.canvas.data.exceptions import TimelineIOError
+from timelinelib.canvas.data.memorydb.db import MemoryDB
 from timelinelib.test.cases.tmpdir import TmpDirTestCase
 from timelinelib.test.cases.wxapp import WxAppTestCase
 from timelinelib.dataimport.timelinexml import import_db_from_timeline_xml, parse_icon
+from timelinelib.dataimport.timelinexml import Parser
 from timelinelib.dataexport.timelinexml import icon_string
 
 
+ICON_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "icons", "16.png")
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
 class describe_import_timeline_xml(TmpDirTestCase):
 
     def test_can_import_empty_file(self):
@@ -63,6 +72,35 @@ class describe_import_timeline_xml(TmpDirTestCase):
         subevents = [e.text for e in all_events if e.is_subevent()]
         self.assertEqual((containers, subevents), (["con"], ["sub1"]))
 
+    def test_icons_keep_their_text_and_share_bitmap(self):
+        self.addCleanup(self.destroy_wxapp, self.get_wxapp())
+        with open(ICON_PATH, "rb") as f:
+            icon_text = base64.b64encode(f.read()).decode()
+        db = self.import_file_with_content("""
+        <timeline>
+            <version>0.0.0</version>
+            <categories />
+            <events>
+                <event>
+                    <start>2017-01-01 00:00:00</start>
+                    <end>2017-01-01 00:00:00</end>
+                    <text>first</text>
+                    <icon>%s</icon>
+                </event>
+                <event>
+                    <start>2017-01-01 00:00:00</start>
+                    <end>2017-01-01 00:00:00</end>
+                    <text>second</text>
+                    <icon>%s</icon>
+                </event>
+            </events>
+            <view />
+        </timeline>
+        """.strip() % (icon_text, icon_text))
+        (first, second) = db.get_all_events()
+        self.assertEqual(first.get_icon_text(), icon_text)
+        self.assertIs(first.get_icon(), second.get_icon())
+
     def test_can_import_categories(self):
         db = self.import_file_with_content("""
         <timeline>
@@ -173,8 +211,55 @@ class describe_import_timeline_xml(TmpDirTestCase):
         self.assertEqual('cat-2', event.get_category().name)
         self.assertEqual(['cat-1'], [c.name for c in event.get_categories()])
 
+    def test_creates_db_described_in_fixture(self):
+        db = self.parse(os.path.join(FIXTURES_DIR, "all_features.timeline"))
+        with open(os.path.join(FIXTURES_DIR, "all_features.expected"), encoding="utf-8") as f:
+            self.assertEqual(describe_db(db), f.read())
+        self.assertEqual(db.transactions_status()[0], 1)
+
+    def test_fails_on_unknown_tags(self):
+        path = self.write_file_with_content("""
+        <timeline>
+            <version>2.9.0</version>
+            <categories />
+            <events>
+                <milestone />
+            </events>
+            <view />
+        </timeline>
+        """.strip())
+        self.assertRaises(TimelineIOError, self.parse, path)
+
+    def test_fails_if_version_is_missing(self):
+        path = self.write_file_with_content("""
+        <timeline>
+            <categories />
+            <events />
+            <view />
+        </timeline>
+        """.strip())
+        self.assertRaises(TimelineIOError, self.parse, path)
+
+    def parse(self, path):
+        db = MemoryDB()
+        db.set_time_type(GregorianTimeType())
+        Parser(db, path).parse()
+        return db
+
     def import_file_with_content(self, content):
+        return import_db_from_timeline_xml(self.write_file_with_content(content))
+
+    def write_file_with_content(self, content):
         path = self.get_tmp_path("tmp.timeline")
         with open(path, "w") as f:
             f.write(content)
-        return import_db_from_timeline_xml(path)
+        return path
+
+
+def describe_db(db):
+    return "\n".join([
+        repr(db._transactions.value),
+        "hidden categories: %r" % [category.name for category in db.get_hidden_categories()],
+        "displayed period: %r" % db.get_displayed_period(),
+        "saved now: %r" % db.get_saved_now(),
+    ]) + "\n"
@@ -0,0 +1,120 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import threading
+
+from timelinelib.canvas.data.memorydb.db import MemoryDB
+from timelinelib.dataexport.timelinexml import export_db_to_timeline_xml
+from timelinelib.db import db_open_newtype_timeline
+from timelinelib.db.backgroundwriter import BackgroundWriter
+from timelinelib.features.experimental.experimentalfeatures import BACKGROUND_SAVE
+from timelinelib.test.cases.tmpdir import TmpDirTestCase
+from timelinelib.test.cases.unit import UnitTestCase
+from timelinelib.test.utils import an_event_with
+
+
+class describe_background_writer(UnitTestCase):
+
+    def test_writes_snapshot(self):
+        self.writer.write("first")
+        self.writer.flush()
+        self.assertEqual(self.written, ["first"])
+
+    def test_writes_only_latest_of_snapshots_given_while_writing(self):
+        self.block_writing()
+        self.writer.write("first")
+        self.writing.wait()
+        self.writer.write("second")
+        self.writer.write("third")
+        self.can_write.set()
+        self.writer.flush()
+        self.assertEqual(self.written, ["first", "third"])
+
+    def test_calls_when_written_functions_after_writing(self):
+        self.block_writing()
+        self.writer.write("first")
+        self.writer.when_written(lambda: self.calls.append("written"))
+        self.assertEqual(self.calls, [])
+        self.can_write.set()
+        self.writer.flush()
+        self.assertEqual(self.calls, ["written"])
+
+    def test_calls_when_written_function_directly_if_nothing_is_written(self):
+        self.writer.when_written(lambda: self.calls.append("written"))
+        self.assertEqual(self.calls, ["written"])
+
+    def test_reports_errors_after_writing(self):
+        def fail(snapshot):
+            raise IOError("disk full")
+        self.writer = BackgroundWriter(fail, self.call_after, self.errors.append)
+        self.writer.write("first")
+        self.writer.close()
+        for (fn, args) in self.after_calls:
+            fn(*args)
+        self.assertEqual([str(error) for error in self.errors], ["disk full"])
+
+    def setUp(self):
+        self.written = []
+        self.calls = []
+        self.errors = []
+        self.after_calls = []
+        self.writing = threading.Event()
+        self.can_write = threading.Event()
+        self.can_write.set()
+        self.writer = BackgroundWriter(self.write, self.call_after, self.errors.append)
+
+    def tearDown(self):
+        self.can_write.set()
+        self.writer.close()
+
+    def block_writing(self):
+        self.can_write.clear()
+
+    def write(self, snapshot):
+        self.writing.set()
+        self.can_write.wait()
+        self.written.append(snapshot)
+
+    def call_after(self, fn, *args):
+        self.after_calls.append((fn, args))
+
+
+class describe_background_save(TmpDirTestCase):
+
+    def test_writes_timeline_in_background(self):
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        db.save_event(an_event_with(text="second"))
+        db.wait_until_saved()
+        self.assertEqual(
+            sorted(event.get_text() for event in self.open().get_all_events()),
+            ["first", "second"]
+        )
+
+    def setUp(self):
+        TmpDirTestCase.setUp(self)
+        self.timeline_path = self.get_tmp_path("test.timeline")
+        BACKGROUND_SAVE.set_active(True)
+        export_db_to_timeline_xml(MemoryDB(), self.timeline_path)
+
+    def tearDown(self):
+        BACKGROUND_SAVE.set_active(False)
+        TmpDirTestCase.tearDown(self)
+
+    def open(self):
+        return db_open_newtype_timeline(self.timeline_path)
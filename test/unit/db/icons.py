@@ -0,0 +1,64 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from unittest.mock import Mock
+import base64
+
+from timelinelib.canvas.data.immutable import ImmutableEvent
+from timelinelib.db.icons import icon_string
+from timelinelib.db.icons import image_to_icon
+from timelinelib.db.icons import record_icon_string
+from timelinelib.test.cases.unit import UnitTestCase
+
+
+class describe_icon_string(UnitTestCase):
+
+    def test_encodes_bitmap_as_base64_png(self):
+        bitmap = a_bitmap(b"png")
+        self.assertEqual(icon_string(bitmap), base64.b64encode(b"png").decode())
+
+
+class describe_image_to_icon(UnitTestCase):
+
+    def test_gives_bitmap_and_icon_string(self):
+        image = a_bitmap(b"png").ConvertToImage()
+        self.assertEqual(
+            image_to_icon(image),
+            (image.ConvertToBitmap(), base64.b64encode(b"png").decode())
+        )
+
+
+class describe_record_icon_string(UnitTestCase):
+
+    def test_returns_text_icon_was_read_from(self):
+        bitmap = a_bitmap(b"png")
+        record = ImmutableEvent(icon=bitmap, icon_text="text")
+        self.assertEqual(record_icon_string(record), "text")
+        self.assertFalse(bitmap.ConvertToImage.called)
+
+    def test_encodes_icon_without_text(self):
+        record = ImmutableEvent(icon=a_bitmap(b"png"))
+        self.assertEqual(record_icon_string(record), base64.b64encode(b"png").decode())
+
+
+def a_bitmap(png):
+    image = Mock()
+    image.SaveFile.side_effect = lambda stream, mime_type: stream.write(png)
+    bitmap = Mock()
+    bitmap.ConvertToImage.return_value = image
+    return bitmap
@@ -0,0 +1,207 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from unittest.mock import patch
+import os
+
+from timelinelib.canvas.data import TimePeriod
+from timelinelib.canvas.data.memorydb.db import MemoryDB
+from timelinelib.dataexport.timelinexml import export_db_to_timeline_xml
+from timelinelib.canvas.drawing.viewproperties import ViewProperties
+from timelinelib.db import db_open_newtype_timeline
+from timelinelib.db import db_read_timeline
+from timelinelib.db.journal import get_journal_path
+from timelinelib.features.experimental.experimentalfeatures import JOURNAL_SAVE
+from timelinelib.test.cases.tmpdir import TmpDirTestCase
+from timelinelib.test.utils import a_category_with
+from timelinelib.test.utils import a_container
+from timelinelib.test.utils import an_event_with
+from timelinelib.test.utils import human_time_to_gregorian
+
+
+class describe_journal(TmpDirTestCase):
+
+    def test_changes_are_appended_to_journal(self):
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        timeline_content = self.read("test.timeline")
+        db.save_event(an_event_with(text="second"))
+        self.assertEqual(self.read("test.timeline"), timeline_content)
+        self.assertEqual(len(self.read_journal_lines()), 2)
+
+    def test_journal_is_replayed_when_opened(self):
+        db = self.open()
+        category = a_category_with(name="work")
+        db.save_category(category)
+        event = an_event_with(text="meeting", category=category)
+        db.save_event(event)
+        event.text = "long meeting"
+        db.save_event(event)
+        db.save_event(an_event_with(text="lunch"))
+        db.delete_event(event)
+        view_properties = ViewProperties()
+        view_properties.displayed_period = self.period("1 Jan 2010", "1 Jan 2011")
+        view_properties.set_category_visible(category, False)
+        db.save_view_properties(view_properties)
+        self.assertSameContent(self.open(), db)
+
+    def test_containers_are_replayed(self):
+        db = self.open()
+        db.save_events(a_container(name="project", category=None, sub_events=[
+            ("design", None),
+            ("build", None),
+        ]))
+        self.assertSameContent(self.open(), db)
+
+    def test_new_ids_do_not_clash_with_replayed_ids(self):
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        db = self.open()
+        db.save_event(an_event_with(text="second"))
+        self.assertSameContent(self.open(), db)
+
+    def test_compact_writes_timeline_and_removes_journal(self):
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        db.close()
+        self.assertFalse(os.path.exists(self.journal_path))
+        self.assertSameContent(self.open(), db)
+
+    def test_changes_after_compact_are_replayed(self):
+        db = self.open()
+        work = a_category_with(name="work")
+        home = a_category_with(name="home")
+        db.save_category(work)
+        db.save_category(home)
+        first = an_event_with(text="first", category=home)
+        db.save_event(first)
+        db.save_event(an_event_with(text="second", category=work))
+        db.delete_category(work)
+        db.close()
+        first.text = "first changed"
+        db.save_event(first)
+        db.save_event(an_event_with(text="third", category=home))
+        db.save_category(a_category_with(name="play"))
+        self.assertSameContent(self.open(), db)
+
+    def test_journal_is_ignored_if_timeline_was_written_without_it(self):
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        db.save_event(an_event_with(text="second"))
+        JOURNAL_SAVE.set_active(False)
+        db = self.open()
+        db.save_event(an_event_with(text="third"))
+        os.rename(self.timeline_path, self.timeline_path + ".new")
+        db.save_event(an_event_with(text="fourth"))
+        os.rename(self.timeline_path + ".new", self.timeline_path)
+        self.assertEqual(self.get_texts(self.open()), ["first", "second", "third"])
+
+    def test_journal_that_does_not_belong_to_timeline_is_kept(self):
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        journal_content = self.read(self.journal_path)
+        os.utime(self.timeline_path, ns=(0, 0))
+        db = self.open()
+        db.save_event(an_event_with(text="second"))
+        self.assertEqual(self.read(self.journal_path + ".orphan1"), journal_content)
+
+    def test_journal_that_does_not_belong_to_timeline_is_left_in_read_only_directory(self):
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        journal_content = self.read(self.journal_path)
+        os.utime(self.timeline_path, ns=(0, 0))
+        with patch("timelinelib.db.dir_is_read_only", return_value=True):
+            db = self.open()
+        self.assertTrue(db.is_read_only())
+        self.assertEqual(self.read(self.journal_path), journal_content)
+        self.assertFalse(os.path.exists(self.journal_path + ".orphan1"))
+
+    def test_reading_timeline_applies_journal_without_changing_files(self):
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        journal_content = self.read(self.journal_path)
+        self.assertEqual(self.get_texts(db_read_timeline(self.timeline_path)), ["first"])
+        os.utime(self.timeline_path, ns=(0, 0))
+        self.assertEqual(self.get_texts(db_read_timeline(self.timeline_path)), [])
+        self.assertEqual(self.read(self.journal_path), journal_content)
+
+    def test_incomplete_last_entry_is_ignored(self):
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        with open(self.journal_path, "a") as f:
+            f.write('{"put": {"ev')
+        db = self.open()
+        self.assertEqual(self.get_texts(db), ["first"])
+        db.save_event(an_event_with(text="second"))
+        self.assertFalse(os.path.exists(self.journal_path))
+        self.assertEqual(self.get_texts(self.open()), ["first", "second"])
+
+    def test_saves_whole_timeline_when_feature_is_disabled(self):
+        JOURNAL_SAVE.set_active(False)
+        db = self.open()
+        db.save_event(an_event_with(text="first"))
+        self.assertFalse(os.path.exists(self.journal_path))
+        self.assertEqual(self.get_texts(self.open()), ["first"])
+
+    def setUp(self):
+        TmpDirTestCase.setUp(self)
+        self.timeline_path = self.get_tmp_path("test.timeline")
+        self.journal_path = get_journal_path(self.timeline_path)
+        JOURNAL_SAVE.set_active(True)
+        export_db_to_timeline_xml(MemoryDB(), self.timeline_path)
+
+    def tearDown(self):
+        JOURNAL_SAVE.set_active(False)
+        TmpDirTestCase.tearDown(self)
+
+    def open(self):
+        return db_open_newtype_timeline(self.timeline_path)
+
+    def read_journal_lines(self):
+        with open(self.journal_path, encoding="utf-8") as f:
+            return f.read().splitlines()[1:]
+
+    def period(self, start, end):
+        return TimePeriod(human_time_to_gregorian(start), human_time_to_gregorian(end))
+
+    def get_texts(self, db):
+        return sorted(event.get_text() for event in db.get_all_events())
+
+    def assertSameContent(self, db1, db2):
+        def content(db):
+            return (
+                sorted(
+                    (
+                        event.get_text(),
+                        event.get_time_period(),
+                        event.get_category().get_name() if event.get_category() else None,
+                        event.container.get_text() if event.is_subevent() else None,
+                    )
+                    for event in db.get_all_events()
+                ),
+                sorted(
+                    (
+                        category.get_name(),
+                        category.parent.get_name() if category.parent else None,
+                    )
+                    for category in db.get_categories()
+                ),
+                db.get_displayed_period(),
+                sorted(category.get_name() for category in db.get_hidden_categories()),
+            )
+        self.assertEqual(content(db1), content(db2))
@@ -19,6 +19,7 @@
 from unittest.mock import Mock
 
 from timelinelib.calendar.gregorian.timetype import GregorianTimeType
+from timelinelib.canvas.data import TimePeriod
 from timelinelib.canvas.data.container import Container
 from timelinelib.canvas.data.event import Event
 from timelinelib.canvas.data.subevent import Subevent
@@ -156,6 +157,67 @@ class describe_default_container_strategy(ContainerStrategiesTestCase):
     def test_the_timeperiod_is_updated_when_the_subevent_time_period_changes(self):
         self._the_timeperiod_is_updated_when_the_subevent_time_period_changes(self.default_strategy)
 
+    def test_subevents_are_kept_sorted_on_sort_order(self):
+        subevents = []
+        for (day, sort_order) in enumerate([None, 3, 1, None, 3, 2]):
+            subevent = self.a_subevent(time_period=gregorian_period(
+                "%d Jan 2014" % (2 * day + 1),
+                "%d Jan 2014" % (2 * day + 1)
+            ))
+            subevent.sort_order = sort_order
+            subevents.append(subevent)
+            self.default_strategy.register_subevent(subevent)
+        self.assertEqual(
+            [subevents.index(x) for x in self.default_strategy.container.subevents],
+            [2, 5, 1, 4, 0, 3]
+        )
+        subevents[1].sort_order = 0
+        self.default_strategy.unregister_subevent(subevents[1])
+        self.assertEqual(
+            [subevents.index(x) for x in self.default_strategy.container.subevents],
+            [2, 5, 4, 0, 3]
+        )
+
+    def test_subevents_are_sorted_again_when_sort_order_has_changed(self):
+        subevents = []
+        for (day, sort_order) in enumerate([1, 2, 3]):
+            subevent = self.a_subevent(time_period=gregorian_period(
+                "%d Jan 2014" % (2 * day + 1),
+                "%d Jan 2014" % (2 * day + 1)
+            ))
+            subevent.sort_order = sort_order
+            subevents.append(subevent)
+            self.default_strategy.register_subevent(subevent)
+        subevents[2].sort_order = 0
+        subevent = self.a_subevent(time_period=gregorian_period("20 Jan 2014", "20 Jan 2014"))
+        subevent.sort_order = 2
+        subevents.append(subevent)
+        self.default_strategy.register_subevent(subevent)
+        self.assertEqual(
+            [subevents.index(x) for x in self.default_strategy.container.subevents],
+            [2, 0, 1, 3]
+        )
+
+    def test_finds_overlapping_subevents_among_many(self):
+        for day in range(1, 29):
+            self.default_strategy.register_subevent(self.a_subevent(
+                time_period=gregorian_period("%d Feb 2014" % day, "%d Feb 2014" % day)
+            ))
+        self.default_strategy.register_subevent(self.a_subevent(
+            time_period=gregorian_period("10 Feb 2014", "12 Feb 2014")
+        ))
+        self.assertEqual(
+            gregorian_period("1 Feb 2014", "1 Mar 2014"),
+            self.default_strategy.container.get_time_period()
+        )
+
+    def test_handles_replaced_subevent_list(self):
+        self.default_strategy.register_subevent(self.a_subevent())
+        self.default_strategy.container.subevents = []
+        subevent = self.a_subevent()
+        self.default_strategy.register_subevent(subevent)
+        self.assertEqual([subevent], self.default_strategy.container.subevents)
+
 
 class describe_extended_container_strategy(ContainerStrategiesTestCase):
 
@@ -273,6 +335,33 @@ class describe_default_container_startegy_(UnitTestCase):
         self.given_event_overlapping_point_event2()
         self.assert_start_equals_end(self.subevent1, self.subevent2)
 
+    def test_assigning_overlapping_subevent_moves_overlapped_event_as_before(self):
+        # Container event:     +---------+
+        # New sub-event:     +-----+
+        #
+        # The overlapped event is moved once by the strategy and once more
+        # when the container updates it, so it ends two days after the new
+        # sub-event. This has always been so.
+        self.given_strategy_with_container()
+        self.subevent1 = Subevent().update(
+            self.time("2000-01-02 00:00:00"),
+            self.time("2000-01-07 00:00:00"),
+            "Container1"
+        )
+        self.subevent1.set_id(self.new_id())
+        self.subevent1.container = self.container
+        self.subevent2 = Subevent().update(
+            self.time("2000-01-01 00:00:00"),
+            self.time("2000-01-04 00:00:00"),
+            "Container1"
+        )
+        self.subevent2.set_id(self.new_id())
+        self.subevent2.container = self.container
+        self.assertEqual(
+            self.subevent1.get_time_period(),
+            TimePeriod(self.time("2000-01-06 00:00:00"), self.time("2000-01-11 00:00:00"))
+        )
+
     def given_container_with_two_events_with_nonoverlapping_periods(self):
         self.given_strategy_with_container()
         self.given_two_events_with_nonoverlapping_periods()
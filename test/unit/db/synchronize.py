@@ -0,0 +1,179 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+
+from timelinelib.canvas.data.memorydb.db import MemoryDB
+from timelinelib.canvas.drawing.viewproperties import ViewProperties
+from timelinelib.dataexport.timelinexml import export_db_to_timeline_xml
+from timelinelib.db import db_open_newtype_timeline
+from timelinelib.db.journal import get_journal_path
+from timelinelib.db.synchronize import synchronize
+from timelinelib.features.experimental.experimentalfeatures import JOURNAL_SAVE
+from timelinelib.test.cases.tmpdir import TmpDirTestCase
+from timelinelib.test.utils import a_category_with
+from timelinelib.test.utils import a_container
+from timelinelib.test.utils import an_event_with
+
+
+class describe_synchronize(TmpDirTestCase):
+
+    def test_gets_content_of_saved_timeline(self):
+        db = self.open()
+        other = self.open()
+        work = a_category_with(name="work")
+        other.save_category(work)
+        other.save_category(a_category_with(name="home", parent=work))
+        other.save_event(an_event_with(text="meeting", category=work))
+        other.save_events(a_container(name="project", category=work, sub_events=[
+            ("design", work),
+            ("build", None),
+        ]))
+        other.delete_event(self.get_event(other, "first"))
+        synchronize(db, self.open())
+        self.assertSameContent(db, other)
+
+    def test_unchanged_and_edited_events_keep_their_ids(self):
+        db = self.open()
+        ids = self.get_ids(db)
+        other = self.open()
+        event = self.get_event(other, "second")
+        event.text = "second edited"
+        other.save_event(event)
+        other.save_event(an_event_with(text="fourth"))
+        synchronize(db, self.open())
+        self.assertEqual(
+            [event.id for event in db.get_all_events() if event.get_text() != "fourth"],
+            ids
+        )
+        self.assertSameContent(db, other)
+
+    def test_does_not_change_db_if_saved_timeline_is_the_same(self):
+        db = self.open()
+        immutable_db = db.get_immutable_db()
+        synchronize(db, self.open())
+        self.assertIs(db.get_immutable_db(), immutable_db)
+
+    def test_can_be_undone_without_writing_timeline(self):
+        db = self.open()
+        content = self.get_content(db)
+        other = self.open()
+        other.save_event(an_event_with(text="fourth"))
+        timeline_content = self.read("test.timeline")
+        synchronize(db, self.open())
+        self.assertEqual(self.read("test.timeline"), timeline_content)
+        db.undo()
+        self.assertEqual(self.get_content(db), content)
+
+    def test_deleted_categories_are_no_longer_hidden(self):
+        db = self.open()
+        category = a_category_with(name="work")
+        db.save_category(category)
+        view_properties = ViewProperties()
+        view_properties.set_category_visible(category, False)
+        db.save_view_properties(view_properties)
+        other = self.open()
+        other.delete_category(other.get_category_by_name("work"))
+        synchronize(db, self.open())
+        self.assertEqual(db.get_hidden_categories(), [])
+
+    def test_deleted_categories_are_hidden_again_when_undone(self):
+        db = self.open()
+        category = a_category_with(name="work")
+        db.save_category(category)
+        view_properties = ViewProperties()
+        view_properties.set_category_visible(category, False)
+        db.save_view_properties(view_properties)
+        other = self.open()
+        other.delete_category(other.get_category_by_name("work"))
+        synchronize(db, self.open())
+        db.undo()
+        self.assertEqual(
+            [category.get_name() for category in db.get_hidden_categories()],
+            ["work"]
+        )
+
+    def test_journal_is_compacted_after_timeline_was_written_by_someone_else(self):
+        JOURNAL_SAVE.set_active(True)
+        db = self.open()
+        db.save_event(an_event_with(text="fourth"))
+        other = self.open()
+        other.save_event(an_event_with(text="fifth"))
+        other.close()
+        synchronize(db, self.open())
+        db.save_event(an_event_with(text="sixth"))
+        self.assertFalse(os.path.exists(get_journal_path(self.timeline_path)))
+        self.assertSameContent(self.open(), db)
+
+    def test_journal_is_compacted_after_someone_else_appended_to_it(self):
+        JOURNAL_SAVE.set_active(True)
+        db = self.open()
+        db.save_event(an_event_with(text="fourth"))
+        other = self.open()
+        other.save_event(an_event_with(text="fifth"))
+        synchronize(db, self.open())
+        db.save_event(an_event_with(text="sixth"))
+        self.assertFalse(os.path.exists(get_journal_path(self.timeline_path)))
+        self.assertSameContent(self.open(), db)
+
+    def setUp(self):
+        TmpDirTestCase.setUp(self)
+        self.timeline_path = self.get_tmp_path("test.timeline")
+        JOURNAL_SAVE.set_active(False)
+        db = MemoryDB()
+        for text in ["first", "second", "third"]:
+            db.save_event(an_event_with(text=text))
+        export_db_to_timeline_xml(db, self.timeline_path)
+
+    def tearDown(self):
+        JOURNAL_SAVE.set_active(False)
+        TmpDirTestCase.tearDown(self)
+
+    def open(self):
+        return db_open_newtype_timeline(self.timeline_path)
+
+    def get_event(self, db, text):
+        for event in db.get_all_events():
+            if event.get_text() == text:
+                return event
+
+    def get_ids(self, db):
+        return [event.id for event in db.get_all_events()]
+
+    def get_content(self, db):
+        return (
+            sorted(
+                (
+                    event.get_text(),
+                    event.get_time_period(),
+                    event.get_category().get_name() if event.get_category() else None,
+                    event.container.get_text() if event.is_subevent() else None,
+                )
+                for event in db.get_all_events()
+            ),
+            sorted(
+                (
+                    category.get_name(),
+                    category.parent.get_name() if category.parent else None,
+                )
+                for category in db.get_categories()
+            ),
+        )
+
+    def assertSameContent(self, db1, db2):
+        self.assertEqual(self.get_content(db1), self.get_content(db2))
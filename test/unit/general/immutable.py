@@ -67,6 +67,18 @@ class describe_immutable_dict(UnitTestCase):
     def test_len(self):
         self.assertEqual(len(ImmutableDict(item=5, foo=9)), 2)
 
+    def test_iterates_in_insertion_order(self):
+        d = ImmutableDict(b=1).update(a=2).update(c=3).update(b=4)
+        self.assertEqual(list(d), [("b", 4), ("a", 2), ("c", 3)])
+
+    def test_update_shares_structure_with_original(self):
+        d1 = ImmutableDict({key: key for key in range(1000)})
+        d2 = d1.update({1000: 1000})
+        self.assertEqual(len(d1), 1000)
+        self.assertEqual(len(d2), 1001)
+        self.assertTrue(1000 not in d1)
+        self.assertTrue(d1.get(500) is d2.get(500))
+
 
 class describe_immutable_record(UnitTestCase):
 
@@ -0,0 +1,44 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from timelinelib.general.orderedset import OrderedSet
+from timelinelib.test.cases.unit import UnitTestCase
+
+
+class describe_ordered_set(UnitTestCase):
+
+    def test_iterates_in_insertion_order(self):
+        s = OrderedSet([3, 1, 2, 1])
+        s.add(0)
+        s.add(3)
+        self.assertEqual(s.to_list(), [3, 1, 2, 0])
+        self.assertEqual(len(s), 4)
+        self.assertTrue(2 in s)
+
+    def test_changing_methods_tell_if_something_changed(self):
+        s = OrderedSet()
+        self.assertTrue(s.add(1))
+        self.assertFalse(s.add(1))
+        self.assertTrue(s.update([1, 2]))
+        self.assertFalse(s.update([2]))
+        self.assertFalse(s.discard(3))
+        self.assertTrue(s.discard(2))
+        self.assertFalse(s.difference_update([2, 3]))
+        self.assertTrue(s.difference_update([1, 3]))
+        self.assertFalse(s.clear())
+
@@ -0,0 +1,136 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import random
+
+from timelinelib.general.persistentmap import PersistentMap
+from timelinelib.test.cases.unit import UnitTestCase
+
+
+class describe_persistent_map(UnitTestCase):
+
+    def test_can_be_created_from_dict(self):
+        m = PersistentMap({"a": 1, "b": 2})
+        self.assertEqual(len(m), 2)
+        self.assertEqual(m["a"], 1)
+        self.assertEqual(m.get("b"), 2)
+        self.assertEqual(m.get("c", 3), 3)
+
+    def test_set_maintains_immutability(self):
+        m1 = PersistentMap({"a": 1})
+        m2 = m1.set("a", 2).set("b", 3)
+        self.assertEqual(list(m1.items()), [("a", 1)])
+        self.assertEqual(list(m2.items()), [("a", 2), ("b", 3)])
+
+    def test_delete_maintains_immutability(self):
+        m1 = PersistentMap({"a": 1, "b": 2})
+        m2 = m1.delete("a")
+        self.assertEqual(list(m1.items()), [("a", 1), ("b", 2)])
+        self.assertEqual(list(m2.items()), [("b", 2)])
+        self.assertTrue("a" not in m2)
+
+    def test_delete_of_missing_key_fails(self):
+        with self.assertRaises(KeyError):
+            PersistentMap().delete("a")
+
+    def test_iterates_in_insertion_order(self):
+        m = PersistentMap()
+        for key in [5, 3, 100, 1]:
+            m = m.set(key, str(key))
+        m = m.set(3, "three")
+        self.assertEqual(list(m.keys()), [5, 3, 100, 1])
+        m = m.delete(3).set(3, "3")
+        self.assertEqual(list(m.items()), [(5, "5"), (100, "100"), (1, "1"), (3, "3")])
+
+    def test_handles_hash_collisions(self):
+        keys = [CollidingKey(value) for value in range(10)]
+        m = PersistentMap()
+        for key in keys:
+            m = m.set(key, key.value)
+        for key in keys[::2]:
+            m = m.delete(key)
+        self.assertEqual(list(m.values()), [1, 3, 5, 7, 9])
+        self.assertEqual(m[CollidingKey(3)], 3)
+        self.assertTrue(CollidingKey(4) not in m)
+
+    def test_equality_ignores_order(self):
+        self.assertEqual(PersistentMap([(1, 1), (2, 2)]), PersistentMap([(2, 2), (1, 1)]))
+        self.assertNotEqual(PersistentMap([(1, 1)]), PersistentMap([(1, 2)]))
+        self.assertNotEqual(PersistentMap([(1, 1)]), PersistentMap([(1, 1), (2, 2)]))
+
+    def test_behaves_like_a_dict(self):
+        rnd = random.Random(0)
+        expected = {}
+        m = PersistentMap()
+        snapshots = []
+        for index in range(3000):
+            key = rnd.randint(0, 500)
+            if rnd.random() < 0.7:
+                expected[key] = index
+                m = m.set(key, index)
+            elif key in expected:
+                del expected[key]
+                m = m.delete(key)
+            if index % 300 == 0:
+                snapshots.append((m, dict(expected)))
+        for (snapshot, snapshot_expected) in snapshots:
+            self.assertEqual(list(snapshot.items()), list(snapshot_expected.items()))
+            for key in range(501):
+                self.assertEqual(key in snapshot, key in snapshot_expected)
+                self.assertEqual(snapshot.get(key), snapshot_expected.get(key))
+
+    def test_gives_changed_keys(self):
+        rnd = random.Random(0)
+        m = PersistentMap((key, object()) for key in range(100))
+        for _ in range(200):
+            new = m
+            for _ in range(rnd.randint(0, 5)):
+                key = rnd.randint(0, 120)
+                if rnd.random() < 0.7:
+                    new = new.set(key, object())
+                elif key in new:
+                    new = new.delete(key)
+            expected = {
+                key
+                for key in set(m.keys()) | set(new.keys())
+                if m.get(key) is not new.get(key)
+            }
+            self.assertEqual(set(m.changed_keys(new)), expected)
+            self.assertEqual(set(new.changed_keys(m)), expected)
+            m = new
+
+    def test_changed_keys_skips_shared_entries(self):
+        m = PersistentMap((key, key) for key in range(10000))
+        new = m.set(5000, "changed").set(10000, "added")
+        self.assertEqual(
+            list(new._entries.changed_indices(m._entries)),
+            [5000, 10000]
+        )
+        self.assertEqual(set(m.changed_keys(new)), {5000, 10000})
+
+
+class CollidingKey:
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return 7
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and self.value == other.value
@@ -44,6 +44,12 @@ class desribe_monitoring(UnitTestCase):
         self.assertEqual(0, self.monitoring._timeline_redraw_count)
         self.assertEqual(1, self.monitoring._category_redraw_count)
 
+    def test_collapsed_redraw_counter_increments(self):
+        """ """
+        self.monitoring.count_collapsed_redraw()
+        self.assertEqual(1, self.monitoring.collapsed_redraw_count)
+        self.assertEqual(0, self.monitoring.timeline_redraw_count)
+
     def test_returns_elapsed_time(self):
         """ """
         self.monitoring.timer_start()
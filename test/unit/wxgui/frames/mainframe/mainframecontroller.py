@@ -19,8 +19,11 @@
 from unittest.mock import Mock
 
 from timelinelib.calendar.num.timetype.timetype import NumTimeType
+from timelinelib.canvas.data.exceptions import TimelineIOError
+from timelinelib.canvas.data.memorydb.db import MemoryDB
 from timelinelib.config.dotfile import Config
 from timelinelib.test.cases.unit import UnitTestCase
+from timelinelib.test.utils import an_event_with
 from timelinelib.wxgui.frames.mainframe.mainframecontroller import MainFrameController
 from timelinelib.wxgui.frames.mainframe.mainframe import MainFrame
 
@@ -49,8 +52,28 @@ class describe_mainframe_controller(UnitTestCase):
     def test_does_not_save_current_timeline_data_when_reloading_from_disk(self):
         self.controller._open_or_create_timeline("foo.timeline")
         self.main_frame.reset_mock()
+        self.db_read.side_effect = TimelineIOError("file corrupt")
         self.controller._reload_from_disk()
         self.assertFalse(self.main_frame.save_current_timeline_data.called)
+        self.db_open.assert_called_with("foo.timeline", timetype=None)
+
+    def test_does_not_reopen_timeline_on_unexpected_error_when_reloading_from_disk(self):
+        self.controller._open_or_create_timeline("foo.timeline")
+        self.db_read.side_effect = KeyError("bug")
+        self.assertRaises(KeyError, self.controller._reload_from_disk)
+
+    def test_synchronizes_current_timeline_when_reloading_from_disk(self):
+        timeline = MemoryDB()
+        self.db_open.return_value = timeline
+        self.controller._open_or_create_timeline("foo.timeline")
+        saved_timeline = MemoryDB()
+        saved_timeline.save_event(an_event_with(text="new"))
+        self.db_read.return_value = saved_timeline
+        self.main_frame.reset_mock()
+        self.controller._reload_from_disk()
+        self.db_read.assert_called_with("foo.timeline")
+        self.assertEqual([event.get_text() for event in timeline.get_all_events()], ["new"])
+        self.assertFalse(self.main_frame.display_timeline.called)
 
     def test_adds_opened_timeline_to_recently_opened_list(self):
         self.controller._open_or_create_timeline("foo.timeline")
@@ -73,7 +96,8 @@ class describe_mainframe_controller(UnitTestCase):
         self.main_frame.main_panel.timeline_panel = Mock()
         self.main_frame.main_panel.timeline_panel.timeline_canvas = Mock()
         self.db_open = Mock()
+        self.db_read = Mock()
         self.config = Mock(Config)
         self.config.get_date_format.return_value = "yyyy-mm-dd"
         self.controller = MainFrameController(self.main_frame, self.db_open,
-                                              self.config)
+                                              self.config, self.db_read)
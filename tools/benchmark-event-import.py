@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+
+"""
+Measure the time it takes to import all events from one timeline into
+another. Every imported event is saved on its own and gets the next sort
+order, so the time per event should not grow with the number of events.
+"""
+
+
+import argparse
+import random
+
+from timelinetools.benchmark import format_ms
+from timelinetools.benchmark import print_table
+from timelinetools.benchmark import setup_timelinelib
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+    setup_timelinelib()
+    rows = []
+    for size in arguments.sizes:
+        source_db = create_db_with_events(size, random.Random(arguments.seed))
+        import_ms, db = time_import(source_db)
+        rows.append([
+            size,
+            format_ms(import_ms),
+            format_ms(import_ms * 1000 / size),
+            db.get_max_sort_order() == size - 1,
+        ])
+    print_table(["events", "import", "per 1000 events", "sort orders ok"], rows)
+
+
+def create_db_with_events(size, rnd):
+    from timelinelib.calendar.gregorian.time import GregorianDelta
+    from timelinelib.calendar.gregorian.time import GregorianTime
+    from timelinelib.canvas.data.event import Event
+    db = create_db()
+    events = []
+    for index in range(size):
+        start = GregorianTime(2451545 + rnd.randint(0, 3650), 0)
+        end = start + GregorianDelta.from_days(rnd.choice([0, 0, 1, 7, 30]))
+        events.append(Event().update(start, end, "event {0}".format(index)))
+    db.bulk_load(events=events)
+    return db
+
+
+def create_db():
+    from timelinelib.calendar.gregorian.timetype import GregorianTimeType
+    from timelinelib.canvas.data.memorydb.db import MemoryDB
+    db = MemoryDB()
+    db.set_time_type(GregorianTimeType())
+    return db
+
+
+def time_import(source_db):
+    from timelinelib.timer import Timer
+    db = create_db()
+    timer = Timer()
+    timer.start()
+    db.import_db(source_db)
+    timer.end()
+    return timer.elapsed_ms, db
+
+
+if __name__ == "__main__":
+    main()
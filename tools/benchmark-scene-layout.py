@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Compare the time it takes to lay out a scene with the pairwise and the
+sweep-line layout for timelines with synthetic events.
+"""
+
+
+import argparse
+import random
+
+from timelinetools.benchmark import format_ms
+from timelinetools.benchmark import print_table
+from timelinetools.benchmark import setup_timelinelib
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 50000])
+    parser.add_argument("--layouts", nargs="*", default=["pairwise", "sweep-line"])
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+    setup_timelinelib()
+    rows = []
+    for size in arguments.sizes:
+        db, view_properties = create_db(size, random.Random(arguments.seed))
+        row = [size]
+        event_data = {}
+        for layout in arguments.layouts:
+            elapsed_ms, event_data[layout] = time_layout(db, view_properties, layout)
+            row.append(format_ms(elapsed_ms))
+        row.append(len(set(repr(data) for data in event_data.values())) <= 1)
+        rows.append(row)
+    print_table(["events"] + arguments.layouts + ["same rects"], rows)
+
+
+def create_db(size, rnd):
+    from timelinelib.calendar.gregorian.time import GregorianDelta
+    from timelinelib.canvas.data.memorydb.db import MemoryDB
+    from timelinelib.canvas.drawing.viewproperties import ViewProperties
+    from timelinelib.test.utils import gregorian_period
+    from timelinelib.test.utils import human_time_to_gregorian
+    db = MemoryDB()
+    start = human_time_to_gregorian("1 Jan 2000")
+    with db.transaction("Create events"):
+        for index in range(size):
+            event_start = start + GregorianDelta.from_days(rnd.randint(0, 3650))
+            event_end = event_start + GregorianDelta.from_days(rnd.choice([0, 0, 1, 7, 30, 365]))
+            event = db.new_event(text="event %d" % index)
+            event.update_period(event_start, event_end)
+            event.sort_order = index
+            event.save()
+    view_properties = ViewProperties()
+    view_properties.displayed_period = gregorian_period("1 Jan 2000", "1 Jan 2010")
+    return db, view_properties
+
+
+def time_layout(db, view_properties, layout):
+    from timelinelib.canvas.appearance import Appearance
+    from timelinelib.canvas.drawing.scene import TimelineScene
+    from timelinelib.timer import Timer
+    scene = TimelineScene(
+        (1600, 1000),
+        db,
+        view_properties,
+        lambda text: (7 * len(text), 12),
+        Appearance()
+    )
+    timer = Timer()
+    timer.start()
+    scene.create(layout)
+    timer.end()
+    return timer.elapsed_ms, [
+        (rect.X, rect.Y, rect.Width, rect.Height)
+        for (_, rect) in scene.event_data
+    ]
+
+
+if __name__ == "__main__":
+    main()
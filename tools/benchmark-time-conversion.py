@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+
+"""
+Measure the throughput of converting gregorian times to and from strings
+with GregorianTimeType.time_string and GregorianTimeType.parse_time.
+
+The timestamps are spread over a number of days so that the julian day
+conversion cache gets both hits and misses.
+"""
+
+
+import argparse
+import random
+
+from timelinetools.benchmark import format_ms
+from timelinetools.benchmark import print_table
+from timelinetools.benchmark import setup_timelinelib
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--days", type=int, nargs="*", default=[365, 36500])
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+    setup_timelinelib()
+    from timelinelib.calendar.gregorian.time import GregorianTime
+    from timelinelib.calendar.gregorian.timetype import GregorianTimeType
+    time_type = GregorianTimeType()
+    rows = []
+    for days in arguments.days:
+        rnd = random.Random(arguments.seed)
+        times = [
+            GregorianTime(2451545 + rnd.randint(0, days - 1), rnd.randint(0, 86399))
+            for _ in range(arguments.count)
+        ]
+        elapsed_ms, strings = time_operation(time_type.time_string, times)
+        rows.append(["time_string", days, format_ms(elapsed_ms), format_rate(arguments.count, elapsed_ms)])
+        elapsed_ms, parsed_times = time_operation(time_type.parse_time, strings)
+        rows.append(["parse_time", days, format_ms(elapsed_ms), format_rate(arguments.count, elapsed_ms)])
+        if parsed_times != times:
+            print("parse_time did not give back the original times")
+    print_table(["operation", "days", "time", "per second"], rows)
+
+
+def time_operation(operation, values):
+    from timelinelib.timer import Timer
+    timer = Timer()
+    timer.start()
+    results = [operation(value) for value in values]
+    timer.end()
+    return timer.elapsed_ms, results
+
+
+def format_rate(count, elapsed_ms):
+    return "{0:10.0f}".format(count / (elapsed_ms / 1000.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Measure the memory used by the time periods of a timeline with synthetic
+events, and the time of common time period operations.
+
+The slot based value classes are compared with subclasses that get an
+instance __dict__, which is how the classes were laid out before.
+"""
+
+
+import argparse
+import random
+import tracemalloc
+
+from timelinetools.benchmark import format_ms
+from timelinetools.benchmark import print_table
+from timelinetools.benchmark import setup_timelinelib
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10000, 100000])
+    parser.add_argument("--operations", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+    setup_timelinelib()
+    from timelinelib.calendar.gregorian.time import GregorianTime
+    from timelinelib.canvas.data.timeperiod import TimePeriod
+
+    class DictGregorianTime(GregorianTime):
+        pass
+
+    class DictTimePeriod(TimePeriod):
+        pass
+
+    variants = [
+        ("slots", GregorianTime, TimePeriod),
+        ("dict", DictGregorianTime, DictTimePeriod),
+    ]
+    rows = []
+    for size in arguments.sizes:
+        for (name, time_class, period_class) in variants:
+            rows.append([size, name] + measure_periods(
+                size, time_class, period_class, random.Random(arguments.seed)
+            ))
+    print_table(["events", "layout", "memory", "bytes/event"], rows)
+    print("")
+    rows = []
+    for (name, time_class, period_class) in variants:
+        period = period_class(time_class(2451545, 0), time_class(2455197, 0))
+        for (operation_name, operation) in [
+            ("move_delta", lambda period: period.move_delta(period.delta() * 0.1)),
+            ("zoom", lambda period: period.zoom(1)),
+            ("compare", lambda period: period.start_time < period.end_time),
+        ]:
+            elapsed_ms = time_operation(period, operation, arguments.operations)
+            rows.append([operation_name, name, format_ms(elapsed_ms)])
+    print_table(["operation", "layout", "time"], rows)
+
+
+def measure_periods(size, time_class, period_class, rnd):
+    tracemalloc.start()
+    periods = []
+    for _ in range(size):
+        start = time_class(2451545 + rnd.randint(0, 3650), rnd.randint(0, 86399))
+        end = time_class(start.julian_day + rnd.choice([0, 0, 1, 7, 30, 365]), start.seconds)
+        periods.append(period_class(start, end))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return [format_kb(current), current // size]
+
+
+def time_operation(period, operation, count):
+    from timelinelib.timer import Timer
+    timer = Timer()
+    timer.start()
+    for _ in range(count):
+        operation(period)
+    timer.end()
+    return timer.elapsed_ms
+
+
+def format_kb(size):
+    return "{0:10.1f} kB".format(size / 1024.0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Measure the time it takes to read .timeline files with synthetic events.
+"""
+
+
+from datetime import date
+from datetime import timedelta
+import argparse
+import os
+import random
+import tempfile
+
+from timelinetools.benchmark import format_ms
+from timelinetools.benchmark import print_table
+from timelinetools.benchmark import setup_timelinelib
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 5000])
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+    setup_timelinelib()
+    from timelinelib.dataimport.timelinexml import Parser
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in arguments.sizes:
+            path = os.path.join(directory, "{0}.timeline".format(size))
+            write_timeline(path, size, random.Random(arguments.seed))
+            rows.append([size, format_ms(time_parser(Parser, path))])
+    print_table(["events", "load"], rows)
+
+
+def write_timeline(path, size, rnd):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        f.write("<timeline>\n<version>2.9.0</version>\n<timetype>gregoriantime</timetype>\n")
+        f.write("<eras>\n")
+        f.write("<era><name>Era</name><start>2000-01-01 00:00:00</start>"
+                "<end>2001-01-01 00:00:00</end><color>200,200,200</color></era>\n")
+        f.write("</eras>\n<categories>\n")
+        for index in range(10):
+            f.write("<category><name>cat-{0}</name><color>{1},{2},{3}</color>{4}</category>\n".format(
+                index,
+                rnd.randint(0, 255),
+                rnd.randint(0, 255),
+                rnd.randint(0, 255),
+                "<parent>cat-0</parent>" if index > 5 else ""
+            ))
+        f.write("</categories>\n<events>\n")
+        container_id = 0
+        for index in range(size):
+            start = rnd.randint(0, 3650)
+            end = start + rnd.choice([0, 0, 1, 7, 30, 365])
+            if index % 100 == 0:
+                container_id += 1
+                text = "[{0}]container {1}".format(container_id, index)
+            elif index % 100 < 5:
+                text = "({0})subevent {1}".format(container_id, index)
+            else:
+                text = "event {0}".format(index)
+            f.write("<event><start>{0}</start><end>{1}</end><text>{2}</text>"
+                    "<progress>{3}</progress><fuzzy>False</fuzzy><locked>False</locked>"
+                    "<ends_today>False</ends_today><category>cat-{4}</category>"
+                    "<description>Description of {2}</description>"
+                    "<default_color>200,200,200</default_color>{5}</event>\n".format(
+                        format_day(start),
+                        format_day(end),
+                        text,
+                        rnd.randint(0, 100),
+                        rnd.randint(0, 9),
+                        "<milestone>True</milestone>" if index % 100 == 50 else ""
+                    ))
+        f.write("</events>\n<view>\n<displayed_period><start>2000-01-01 00:00:00</start>"
+                "<end>2010-01-01 00:00:00</end></displayed_period>\n"
+                "<hidden_categories><name>cat-1</name></hidden_categories>\n</view>\n</timeline>\n")
+
+
+def format_day(day):
+    return (date(2000, 1, 1) + timedelta(days=day)).strftime("%Y-%m-%d 00:00:00")
+
+
+def time_parser(parser_class, path):
+    from timelinelib.calendar.gregorian.timetype import GregorianTimeType
+    from timelinelib.canvas.data.memorydb.db import MemoryDB
+    from timelinelib.timer import Timer
+    db = MemoryDB()
+    db.set_time_type(GregorianTimeType())
+    timer = Timer()
+    timer.start()
+    parser_class(db, path).parse()
+    timer.end()
+    return timer.elapsed_ms
+
+
+if __name__ == "__main__":
+    main()
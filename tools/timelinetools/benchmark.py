@@ -0,0 +1,46 @@
+# Copyright (C) 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018  Rickard Lindberg, Roger Lindberg
+#
+# This file is part of Timeline.
+#
+# Timeline is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Timeline is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Timeline.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import builtins
+import os
+import sys
+
+from timelinetools.paths import SOURCE_DIR
+
+
+def setup_timelinelib():
+    """
+    Make timelinelib importable from the benchmark scripts in the same way
+    as when running the specs.
+    """
+    sys.path.insert(0, SOURCE_DIR)
+    builtins.__dict__["_"] = lambda message: message
+
+
+def format_ms(milliseconds):
+    return "{0:10.1f} ms".format(milliseconds)
+
+
+def print_table(header, rows):
+    widths = [
+        max(len(str(row[index])) for row in [header] + rows)
+        for index in range(len(header))
+    ]
+    for row in [header] + rows:
+        print("  ".join(str(cell).rjust(width) for (cell, width) in zip(row, widths)))
+    sys.stdout.flush()